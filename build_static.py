@@ -0,0 +1,104 @@
+# 정적 자산 빌드: 파일명에 내용 해시를 붙여 static/dist 에 복사하고 .br/.gz 를 미리 만들어 둠
+# 사용법: python build_static.py  (배포 시 실행, 결과는 static/dist/manifest.json)
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+from common.staticfiles import STATIC_DIR, DIST_DIR
+
+try:
+    import brotli
+except ImportError:  # brotli 미설치 시 .gz 만 생성
+    brotli = None
+
+
+# 회원 사진/슬로건/스프라이트처럼 실행 중 바뀌는 폴더와 빌드 결과는 제외
+SKIP_DIRS = {DIST_DIR, "img/members", "img/slogans", "img/sprites", "img/store"}
+ASSET_EXTS = {".css", ".js", ".map", ".svg", ".png", ".jpg", ".gif", ".ico", ".webp",
+              ".woff", ".woff2", ".ttf", ".eot", ".otf", ".json"}
+COMPRESS_EXTS = {".css", ".js", ".map", ".svg", ".json", ".ttf", ".eot", ".otf", ".ico"}
+HASH_LENGTH = 10
+_CSS_URL_RE = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+
+def _collect(root: str):
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        dirnames[:] = [d for d in dirnames if posixpath.normpath(posixpath.join(rel_dir, d)) not in SKIP_DIRS]
+        for name in filenames:
+            if os.path.splitext(name)[1].lower() in ASSET_EXTS:
+                yield posixpath.normpath(posixpath.join(rel_dir, name))
+
+
+def _hashed_name(rel_path: str, data: bytes) -> str:
+    base, ext = posixpath.splitext(rel_path)
+    return f"{base}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}"
+
+
+def _rewrite_css(rel_path: str, text: str, manifest: dict) -> str:
+    # CSS 안의 상대 경로(폰트/이미지)를 해시 파일명으로 변경
+    css_dir = posixpath.dirname(rel_path)
+
+    def replace(m):
+        quote, url = m.group(1), m.group(2)
+        if url.startswith(("data:", "http:", "https:", "//", "#", "/")):
+            return m.group(0)
+        # 폰트의 ?v=4.7.0, #iefix 같은 뒷부분은 그대로 유지
+        path, suffix = re.match(r"([^?#]*)(.*)", url).groups()
+        hashed = manifest.get(posixpath.normpath(posixpath.join(css_dir, path)))
+        if not hashed:
+            return m.group(0)
+        new_url = posixpath.relpath(hashed, css_dir) + suffix
+        return f"url({quote}{new_url}{quote})"
+    return _CSS_URL_RE.sub(replace, text)
+
+
+def _write(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _precompress(path: str, data: bytes, ext: str) -> int:
+    if ext not in COMPRESS_EXTS or len(data) < 1024:
+        return 0
+    count = 0
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gz) < len(data):
+        _write(path + ".gz", gz)
+        count += 1
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        if len(br) < len(data):
+            _write(path + ".br", br)
+            count += 1
+    return count
+
+
+def build(static_dir: str = STATIC_DIR):
+    # 이전 빌드 파일은 지우지 않음 (배포 중 이미 열린 화면이 이전 해시 주소를 요청할 수 있음)
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    assets = sorted(_collect(static_dir))
+    manifest = {}
+    compressed = 0
+    # CSS 는 참조하는 파일의 해시가 정해진 뒤에 처리
+    for rel_path in sorted(assets, key=lambda p: p.endswith(".css")):
+        with open(os.path.join(static_dir, rel_path), "rb") as f:
+            data = f.read()
+        ext = posixpath.splitext(rel_path)[1].lower()
+        if ext == ".css":
+            data = _rewrite_css(rel_path, data.decode("utf-8"), manifest).encode("utf-8")
+        hashed = _hashed_name(rel_path, data)
+        manifest[rel_path] = hashed
+        out_path = os.path.join(dist_dir, hashed)
+        _write(out_path, data)
+        compressed += _precompress(out_path, data, ext)
+    _write(os.path.join(dist_dir, "manifest.json"), json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8"))
+    print(f"정적 자산 빌드 완료: {len(manifest)}개, 압축 파일 {compressed}개 ({dist_dir})")
+    return manifest
+
+
+if __name__ == "__main__":
+    build()
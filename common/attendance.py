@@ -0,0 +1,60 @@
+from fastapi import HTTPException
+from sqlalchemy import text
+
+
+# 행사 참석 응답 UPSERT 에 필요한 (eventNo, memberNo) UNIQUE 키
+ATTEND_TABLES = ("clubEventMember", "circleEventMember")
+ATTEND_KEY = "uk_event_member"
+
+KEY_EXISTS_SQL = text(
+    "SELECT COUNT(*) FROM information_schema.STATISTICS "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND INDEX_NAME = :key")
+# 같은 회원의 중복 응답 중 남길 행: 삭제(XXX)되지 않은 응답 우선, 그중 마지막(joinNo 가 가장 큰) 것
+# t1 보다 우선하는 t2 가 있으면 t1 이 정리 대상 (삭제 여부, joinNo 순으로 비교하므로 항상 한 건만 남음)
+DUP_JOIN = """
+    FROM {table} t1
+             JOIN {table} t2 ON t1.eventNo = t2.eventNo AND t1.memberNo = t2.memberNo
+                 AND ((COALESCE(t2.attrib, '') NOT LIKE '%XXX%' AND COALESCE(t1.attrib, '') LIKE '%XXX%')
+                      OR ((COALESCE(t2.attrib, '') LIKE '%XXX%') = (COALESCE(t1.attrib, '') LIKE '%XXX%')
+                          AND t1.joinNo < t2.joinNo))
+"""
+DUP_COUNT_SQL = "SELECT COUNT(DISTINCT t1.joinNo) " + DUP_JOIN
+DEDUP_SQL = "DELETE t1 " + DUP_JOIN
+ADD_KEY_SQL = "ALTER TABLE {table} ADD UNIQUE KEY {key} (eventNo, memberNo)"
+
+
+class AttendanceKeys:
+    def __init__(self):
+        self._ready = set()
+
+    async def _has_key(self, db, table: str) -> bool:
+        return (await db.execute(KEY_EXISTS_SQL, {"table": table, "key": ATTEND_KEY})).scalar() > 0
+
+    async def migrate(self, db, apply: bool):
+        # 일회성 마이그레이션(migrate_keys.py)에서만 호출 - 웹 서버 기동 시에는 정리하지 않음
+        # apply 가 아니면 정리 대상 건수만 출력
+        for table in ATTEND_TABLES:
+            if await self._has_key(db, table):
+                print(f"{table}: UNIQUE 키가 이미 있습니다")
+                continue
+            count = (await db.execute(text(DUP_COUNT_SQL.format(table=table)))).scalar()
+            if not apply:
+                print(f"{table}: 중복 참석 응답 {count}건 정리 예정")
+                continue
+            deleted = (await db.execute(text(DEDUP_SQL.format(table=table)))).rowcount
+            # ALTER TABLE 이 앞의 DELETE 를 함께 확정함
+            await db.execute(text(ADD_KEY_SQL.format(table=table, key=ATTEND_KEY)))
+            print(f"{table}: 중복 참석 응답 {deleted}건 정리 후 UNIQUE 키 추가")
+        await db.commit()
+
+    async def require(self, db, table: str):
+        # 키가 없으면 UPSERT 가 중복 행을 만들므로 저장하지 않음 (migrate_keys.py 실행 전)
+        if table in self._ready:
+            return
+        if await self._has_key(db, table):
+            self._ready.add(table)
+            return
+        raise HTTPException(status_code=503, detail="참석 정보 저장 준비 중입니다. 잠시 후 다시 시도해 주세요.")
+
+
+attendance_keys = AttendanceKeys()
@@ -1,25 +1,25 @@
 from fastapi import HTTPException, status
 from passlib.context import CryptContext
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
-async def authenticate_user(username: str, password: str, connection):
-    async with connection.cursor() as cursor:
-        await cursor.execute("SELECT userName, userPassword FROM lionsUser WHERE userName = %s", (username,))
-        user = await cursor.fetchone()
-        print(f"SQL 실행 결과: {user}")  # SQL 결과 로그
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid username or password"
-            )
-        if not verify_password(password, user[1]):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid username or password"
-            )
-        print("사용자 ",user[0])
-        return {"username": user[0]}
+async def authenticate_user(username: str, password: str, db: AsyncSession):
+    # main.py 와 같은 연결 풀의 세션(get_db)으로 조회
+    query = text("SELECT userName, userPassword FROM lionsUser WHERE userName = :username")
+    user = (await db.execute(query, {"username": username})).fetchone()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid username or password"
+        )
+    if not verify_password(password, user[1]):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid username or password"
+        )
+    return {"username": user[0]}
@@ -0,0 +1,125 @@
+import asyncio
+import gzip
+from collections import OrderedDict
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # brotli 미설치 시 gzip 만 사용
+    brotli = None
+
+
+# 압축 대상 형식 (이미지/PDF 등 이미 압축된 형식은 제외)
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/x-msgpack",
+                      "application/xml", "image/svg+xml")
+MINIMUM_SIZE = 1024
+# 이보다 큰 본문은 이벤트 루프를 막지 않도록 별도 스레드에서 압축
+THREAD_SIZE = 256 * 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def accepted_encodings(header: str) -> dict:
+    encodings = {}
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[name.strip().lower()] = q
+    return encodings
+
+
+def choose_encoding(header: str):
+    encodings = accepted_encodings(header)
+    if brotli is not None and encodings.get("br", 0) > 0:
+        return "br"
+    if encodings.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+# ETag 가 있는 응답의 압축 결과 보관 (같은 내용은 한 번만 압축)
+class CompressedCache:
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self._items = OrderedDict()
+        self._size = 0
+        self._max_bytes = max_bytes
+
+    def get(self, key):
+        body = self._items.get(key)
+        if body is not None:
+            self._items.move_to_end(key)
+        return body
+
+    def put(self, key, body: bytes):
+        if len(body) > self._max_bytes // 4:
+            return
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        self._items[key] = body
+        self._size += len(body)
+        while self._size > self._max_bytes:
+            _, dropped = self._items.popitem(last=False)
+            self._size -= len(dropped)
+
+
+compressed_cache = CompressedCache()
+
+
+class CompressionMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, minimum_size: int = MINIMUM_SIZE):
+        super().__init__(app)
+        self.minimum_size = minimum_size
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+        content_type = response.headers.get("content-type", "")
+        if (encoding is None or request.method == "HEAD" or response.status_code != 200
+                or "content-encoding" in response.headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)):
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        if len(body) < self.minimum_size:
+            return self._rebuild(response, body)
+
+        etag = response.headers.get("etag")
+        key = (request.url.path, request.url.query, etag, encoding) if etag else None
+        compressed = compressed_cache.get(key) if key else None
+        if compressed is None:
+            if len(body) > THREAD_SIZE:
+                compressed = await asyncio.to_thread(compress, body, encoding)
+            else:
+                compressed = compress(body, encoding)
+            if key:
+                compressed_cache.put(key, compressed)
+
+        new_response = self._rebuild(response, compressed)
+        new_response.headers["Content-Encoding"] = encoding
+        vary = new_response.headers.get("vary")
+        new_response.headers["Vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+        return new_response
+
+    @staticmethod
+    def _rebuild(response, body: bytes) -> Response:
+        # Set-Cookie 처럼 여러 번 오는 헤더를 유지하기 위해 raw_headers 를 그대로 복사
+        new_response = Response(content=body, status_code=response.status_code)
+        new_response.raw_headers = [(k, v) for k, v in response.raw_headers if k.lower() != b"content-length"]
+        new_response.raw_headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        return new_response
@@ -1,5 +1,11 @@
-import asyncmy
-from fastapi import Depends
+import hashlib
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import URL
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import dotenv, os
 
 
@@ -12,21 +18,164 @@ DATABASE_CONFIG = {
     "database": os.getenv("database"),
 }
 
-async def get_connection():
-    connection = None  # connection 초기화
-    try:
-        print("MariaDB 연결 시도 중...")  # 연결 시도 로그
-        connection = await asyncmy.connect(**DATABASE_CONFIG)
-        print("MariaDB 연결 성공")  # 연결 성공 로그
-        yield connection
-    except Exception as e:
-        print(f"MariaDB 연결 실패: {e}")  # 연결 실패 로그
-        raise e
-    finally:
-        if connection:
-            try:
-                print("MariaDB 연결 닫기 시도 중...")  # 연결 닫기 로그
-        #        await connection.close()
-                print("MariaDB 연결 닫힘")  # 연결 닫힘 로그
-            except Exception as close_error:
-                print(f"MariaDB 연결 닫기 중 에러 발생: {close_error}")  # 연결 닫기 에러 로그
+# dburl 이 없으면 개별 접속 정보로 asyncmy URL 구성
+DATABASE_URL = os.getenv("dburl") or URL.create(
+    "mysql+asyncmy", username=DATABASE_CONFIG["user"], password=DATABASE_CONFIG["password"],
+    host=DATABASE_CONFIG["host"], database=DATABASE_CONFIG["database"])
+
+# 커넥션 풀 설정 (환경변수로 조정)
+POOL_CONFIG = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+}
+
+
+# 풀 사용 현황 누적 카운터
+class PoolMetrics:
+    def __init__(self):
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+
+    def snapshot(self, pool) -> dict:
+        return {
+            "poolSize": pool.size(),
+            "checkedOut": pool.checkedout(),
+            "checkedIn": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "maxOverflow": POOL_CONFIG["max_overflow"],
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "invalidations": self.invalidations,
+            "waits": self.waits,
+            "waitSecondsTotal": round(self.wait_seconds, 3),
+            "waitSecondsMax": round(self.max_wait_seconds, 3),
+            "timeouts": self.timeouts,
+        }
+
+
+# 모든 연결이 사용 중일 때의 대기 시간과 타임아웃을 기록하는 풀
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    metrics = None
+
+    def _do_get(self):
+        saturated = self.checkedout() >= self.size() + max(self._max_overflow, 0)
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics:
+                self.metrics.timeouts += 1
+            raise
+        finally:
+            if saturated and self.metrics:
+                elapsed = time.perf_counter() - start
+                self.metrics.waits += 1
+                self.metrics.wait_seconds += elapsed
+                self.metrics.max_wait_seconds = max(self.metrics.max_wait_seconds, elapsed)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def create_engine_with_metrics(url):
+    engine = create_async_engine(url, poolclass=InstrumentedPool, pool_pre_ping=True, **POOL_CONFIG)
+    metrics = PoolMetrics()
+    engine.sync_engine.pool.metrics = metrics
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_conn, record):
+        metrics.connects += 1
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def on_checkout(dbapi_conn, record, proxy):
+        metrics.checkouts += 1
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def on_checkin(dbapi_conn, record):
+        metrics.checkins += 1
+
+    @event.listens_for(engine.sync_engine, "invalidate")
+    def on_invalidate(dbapi_conn, record, exception):
+        metrics.invalidations += 1
+
+    return engine, metrics
+
+
+engine, pool_metrics = create_engine_with_metrics(DATABASE_URL)
+async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+# 읽기 전용 복제본 (dbreadurl 미설정 시 기본 엔진을 그대로 사용)
+READ_DATABASE_URL = os.getenv("dbreadurl")
+if READ_DATABASE_URL:
+    read_engine, read_pool_metrics = create_engine_with_metrics(READ_DATABASE_URL)
+else:
+    read_engine, read_pool_metrics = engine, pool_metrics
+async_read_session = sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
+# 복제본으로 보낼 요청 경로 (모바일 앱 GET 조회)
+READ_ROUTE_PREFIX = "/phapp"
+# 본인이 쓰기 요청을 한 직후에는 복제 지연을 피하도록 이 시간(초) 동안 기본 DB 에서 조회
+READ_AFTER_WRITE_SECONDS = float(os.getenv("DB_READ_AFTER_WRITE_SECONDS", "5"))
+
+
+# 토큰별 마지막 쓰기 시각 (토큰 원문 대신 해시로 보관)
+class WriteTracker:
+    def __init__(self, window: float):
+        self._window = window
+        self._last_write = {}
+
+    @staticmethod
+    def key_of(authorization: str):
+        if not authorization:
+            return None
+        return hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+
+    def mark(self, authorization: str):
+        key = self.key_of(authorization)
+        if key is None:
+            return
+        now = time.monotonic()
+        self._last_write[key] = now
+        if len(self._last_write) > 10000:
+            self._last_write = {k: t for k, t in self._last_write.items() if now - t < self._window}
+
+    def is_recent(self, authorization: str) -> bool:
+        key = self.key_of(authorization)
+        if key is None:
+            return False
+        last = self._last_write.get(key)
+        return last is not None and time.monotonic() - last < self._window
+
+
+write_tracker = WriteTracker(READ_AFTER_WRITE_SECONDS)
+
+
+def is_read_route(method: str, path: str) -> bool:
+    return method in ("GET", "HEAD") and path.startswith(READ_ROUTE_PREFIX)
+
+
+def session_factory_for(method: str, path: str, authorization: str = None):
+    # 복제본이 없거나, 쓰기 요청이거나, 방금 쓰기를 한 사용자면 기본 DB
+    if read_engine is engine or not is_read_route(method, path):
+        return async_session
+    if write_tracker.is_recent(authorization):
+        return async_session
+    return async_read_session
+
+
+def get_pool_status() -> dict:
+    status = {"primary": pool_metrics.snapshot(engine.sync_engine.pool)}
+    if read_engine is not engine:
+        status["replica"] = read_pool_metrics.snapshot(read_engine.sync_engine.pool)
+    return status
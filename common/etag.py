@@ -0,0 +1,77 @@
+import hashlib
+from fastapi import Request, Response
+from sqlalchemy import text, bindparam
+
+
+# 테이블별 변경 버전 (DB 에 보관해 여러 워커/재기동 사이에서도 같은 ETag 를 사용)
+TABLE_VERSION_DDL = """
+    CREATE TABLE IF NOT EXISTS tableVersion (
+        tableName varchar(64) NOT NULL PRIMARY KEY,
+        version bigint NOT NULL DEFAULT 0,
+        modDate timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )"""
+BUMP_SQL = text(
+    "INSERT INTO tableVersion (tableName, version) VALUES (:tableName, 1) "
+    "ON DUPLICATE KEY UPDATE version = version + 1")
+VERSIONS_SQL = text("SELECT tableName, version FROM tableVersion WHERE tableName IN :names").bindparams(
+    bindparam("names", expanding=True))
+
+# 목록은 캐시에 두되 매번 ETag 로 재검증
+CACHE_CONTROL = "private, no-cache"
+
+
+class TableVersions:
+    async def ensure_table(self, db):
+        await db.execute(text(TABLE_VERSION_DDL))
+        await db.commit()
+
+    async def bump(self, db, *tables):
+        # 쓰기와 같은 트랜잭션에서 증가시켜 커밋될 때 함께 반영
+        try:
+            for table in tables:
+                await db.execute(BUMP_SQL, {"tableName": table})
+        except Exception as e:
+            # 버전이 그대로면 클라이언트가 이전 목록을 304 로 계속 쓰게 되므로 반드시 남김
+            print(f"테이블 버전 갱신 실패({', '.join(tables)}), 해당 목록 ETag 가 갱신되지 않음: {e}")
+
+    async def versions(self, db, *tables) -> dict:
+        # 한 번도 변경되지 않은 테이블은 0
+        result = await db.execute(VERSIONS_SQL, {"names": list(tables)})
+        found = {row[0]: row[1] for row in result.fetchall()}
+        return {t: found.get(t, 0) for t in tables}
+
+    async def etag(self, db, *tables, scope: str = "") -> str:
+        versions = await self.versions(db, *tables)
+        raw = scope + "|" + ",".join(f"{t}:{versions[t]}" for t in tables)
+        return 'W/"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20] + '"'
+
+    async def try_etag(self, db, *tables, scope: str = ""):
+        # 버전 조회가 실패해도 목록은 ETag 없이 정상 응답 (None 이면 304/ETag 헤더 생략)
+        try:
+            return await self.etag(db, *tables, scope=scope)
+        except Exception as e:
+            print(f"ETag 계산 실패({', '.join(tables)}): {e}")
+            await db.rollback()
+            return None
+
+
+def etag_matches(request: Request, etag) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header or not etag:
+        return False
+    if header.strip() == "*":
+        return True
+    # 약한 비교: W/ 접두어 유무와 관계없이 같은 태그면 일치
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept"})
+
+
+def etag_headers(etag) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL} if etag else {}
+
+
+table_versions = TableVersions()
@@ -0,0 +1,103 @@
+import io
+import math
+import os
+from PIL import Image, ImageOps
+
+
+# 용량 제한 이미지 인코딩 기본 형식 (JPEG 또는 WEBP)
+ENCODE_FORMAT = os.getenv("IMAGE_ENCODE_FORMAT", "JPEG").upper()
+# 품질 검색 범위와 첫 시도 품질
+QUALITY_MIN = 35
+QUALITY_MAX = 90
+QUALITY_START = 80
+# 첫 시도 품질에서 화소당 예상 바이트 (사진 기준 경험값)
+BYTES_PER_PIXEL = {"JPEG": 0.14, "WEBP": 0.09}
+# 이 비율 이상 넘치면 품질 대신 크기를 줄임
+RESCALE_RATIO = 1.2
+# 초과 비율 1.0 당 낮출 품질 (품질 80 부근에서 용량 감소 경험값)
+QUALITY_PER_RATIO = 120
+# 용량 안에 드는 품질을 찾은 뒤 남은 검색 범위가 이 값보다 좁으면 멈춤
+QUALITY_TOLERANCE = 3
+# 최대 인코딩 횟수
+MAX_PASSES = 8
+# 그대로 저장해도 되는 입력 형식
+PASSTHROUGH_FORMATS = ("JPEG", "PNG", "WEBP")
+
+
+def _encode(image: Image.Image, fmt: str, quality: int) -> bytes:
+    buf = io.BytesIO()
+    if fmt == "WEBP":
+        image.save(buf, format="WEBP", quality=quality, method=4)
+    else:
+        image.save(buf, format="JPEG", quality=quality, optimize=True, progressive=True)
+    return buf.getvalue()
+
+
+def _prepare(image: Image.Image) -> Image.Image:
+    # 휴대폰 사진의 회전 정보를 반영하고 투명 배경은 흰색으로 채움
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def _scaled(image: Image.Image, scale: float) -> Image.Image:
+    w, h = image.size
+    return image.resize((max(1, int(w * scale)), max(1, int(h * scale))), Image.LANCZOS)
+
+
+def encode_to_budget(image: Image.Image, max_bytes: int, fmt: str = ENCODE_FORMAT):
+    # 화소 수와 용량 제한으로 크기를 먼저 맞추고, 넘치면 초과 비율로 크기를 다시 맞추거나
+    # 이분 탐색으로 용량 안에 드는 가장 높은 품질을 찾음 (QUALITY_TOLERANCE 이내로 좁혀지면 멈춤)
+    # 반환: (바이트, 형식, 인코딩 횟수)
+    fmt = fmt.upper() if fmt.upper() in BYTES_PER_PIXEL else "JPEG"
+    image = _prepare(image)
+    w, h = image.size
+    max_pixels = max_bytes / BYTES_PER_PIXEL[fmt]
+    if w * h > max_pixels:
+        image = _scaled(image, math.sqrt(max_pixels / (w * h)))
+
+    passes = 0
+    while passes < MAX_PASSES:
+        data = _encode(image, fmt, QUALITY_START)
+        passes += 1
+        if len(data) <= max_bytes:
+            return data, fmt, passes
+        ratio = len(data) / max_bytes
+        if ratio > RESCALE_RATIO:
+            # 크게 넘치면 용량이 화소 수에 비례한다고 보고 크기를 다시 맞춤
+            image = _scaled(image, math.sqrt(1 / ratio) * 0.95)
+            continue
+
+        # 첫 시도는 초과 비율로 품질을 추정하고, 이후 남은 범위의 중간 품질로 이분 탐색
+        # 들어오면 더 높은 쪽, 넘치면 더 낮은 쪽을 찾으며 들어온 결과 중 가장 높은 품질을 남김
+        lo, hi = QUALITY_MIN, QUALITY_START - 1
+        quality = max(QUALITY_MIN, int(QUALITY_START - (ratio - 1) * QUALITY_PER_RATIO))
+        best = None
+        while lo <= hi and passes < MAX_PASSES:
+            data = _encode(image, fmt, quality)
+            passes += 1
+            if len(data) <= max_bytes:
+                best = data
+                lo = quality + 1
+            else:
+                hi = quality - 1
+            if best is not None and hi - lo < QUALITY_TOLERANCE:
+                break
+            quality = (lo + hi) // 2
+        if best is not None:
+            return best, fmt, passes
+        # 최저 품질로도 넘치면 한 단계 줄여서 다시 시도
+        image = _scaled(image, 0.8)
+    return data, fmt, passes
+
+
+def fit_to_budget(contents: bytes, max_bytes: int, fmt: str = ENCODE_FORMAT):
+    # 업로드 원본이 제한 이내이고 브라우저가 읽을 수 있는 형식이면 그대로 사용
+    image = Image.open(io.BytesIO(contents))
+    if len(contents) <= max_bytes and image.format in PASSTHROUGH_FORMATS:
+        return contents, image.format, 0
+    return encode_to_budget(image, max_bytes, fmt)
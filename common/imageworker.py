@@ -0,0 +1,66 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException
+
+
+# 이미지 처리(PIL) 전용 프로세스 수
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+# 처리 중 + 대기 중 작업 상한 (넘으면 잠시 기다렸다가 503)
+IMAGE_QUEUE_SIZE = int(os.getenv("IMAGE_QUEUE_SIZE", "16"))
+# 대기열 자리가 날 때까지 기다리는 최대 시간(초)
+IMAGE_QUEUE_WAIT = float(os.getenv("IMAGE_QUEUE_WAIT", "3"))
+
+
+# 사진 업로드/슬로건 이미지 생성을 별도 프로세스에서 처리해 이벤트 루프(GIL)를 막지 않도록 함
+# - 작업 함수와 인자는 프로세스 간에 전달되므로 모듈 최상위 함수/기본 자료형만 사용
+class ImageWorker:
+    def __init__(self, workers: int = IMAGE_WORKERS, queue_size: int = IMAGE_QUEUE_SIZE,
+                 queue_wait: float = IMAGE_QUEUE_WAIT):
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.queue_wait = queue_wait
+        self._executor = None
+        self._slots = None
+        self._in_use = 0
+
+    def start(self):
+        if self._executor is None:
+            # fork 는 이벤트 루프/DB 연결까지 복제하므로 spawn 으로 깨끗한 프로세스를 만듦
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    async def run(self, fn, *args):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.queue_size)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_wait)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail="이미지 처리 요청이 많습니다. 잠시 후 다시 시도해주세요.",
+                                headers={"Retry-After": "5"})
+        self._in_use += 1
+        try:
+            executor = self.start()
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            # 작업 프로세스가 비정상 종료(메모리 부족 등)되면 다음 요청을 위해 풀을 새로 만듦
+            print(f"이미지 작업 프로세스 비정상 종료: {getattr(fn, '__name__', fn)}")
+            self._executor = None
+            raise
+        finally:
+            self._in_use -= 1
+            self._slots.release()
+
+    def status(self) -> dict:
+        return {"workers": self.workers, "queue_size": self.queue_size, "in_use": self._in_use}
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+image_worker = ImageWorker()
@@ -0,0 +1,90 @@
+import datetime
+import decimal
+import json
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # orjson 미설치 시 표준 json 사용
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack 미설치 시 항상 JSON 응답
+    msgpack = None
+
+MSGPACK_TYPES = ("application/x-msgpack", "application/msgpack", "application/vnd.msgpack")
+
+
+def encode_default(obj):
+    # SQLAlchemy Row 는 컬럼명 기준 dict 로, 나머지는 FastAPI 기본 인코더와 같은 형태로 변환
+    if hasattr(obj, "_mapping"):
+        return dict(obj._mapping)
+    if isinstance(obj, decimal.Decimal):
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, datetime.timedelta):
+        return obj.total_seconds()
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"JSON 으로 변환할 수 없는 형식: {type(obj).__name__}")
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=encode_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=encode_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# jsonable_encoder 를 거치지 않고 바로 bytes 로 직렬화하는 응답
+# (핸들러가 dict 를 반환하면 FastAPI 가 먼저 jsonable_encoder 를 돌리므로, 큰 목록은 이 응답을 직접 반환)
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def columnar(content):
+    # 같은 키를 가진 dict 목록을 {"columns": [...], "values": [[컬럼1 값들], [컬럼2 값들], ...]} 로 변환
+    if isinstance(content, dict):
+        return {k: columnar(v) for k, v in content.items()}
+    if isinstance(content, (list, tuple)) and content:
+        rows = [dict(r._mapping) if hasattr(r, "_mapping") else r for r in content]
+        if all(isinstance(r, dict) for r in rows):
+            columns = list(rows[0].keys())
+            if all(len(r) == len(columns) and all(c in r for c in columns) for r in rows):
+                return {"columns": columns, "values": [[r[c] for r in rows] for c in columns]}
+        return [columnar(r) for r in rows]
+    return content
+
+
+class MsgpackResponse(Response):
+    media_type = MSGPACK_TYPES[0]
+
+    def render(self, content) -> bytes:
+        return msgpack.packb(columnar(content), default=encode_default, use_bin_type=True)
+
+
+def wants_msgpack(request: Request) -> bool:
+    if msgpack is None:
+        return False
+    accept = request.headers.get("accept", "")
+    return any(t in accept for t in MSGPACK_TYPES)
+
+
+def response_format(request: Request) -> str:
+    # ETag 범위에 포함해 표현 형식별로 다른 ETag 사용
+    return "msgpack" if wants_msgpack(request) else "json"
+
+
+def list_response(request: Request, content, headers: dict = None) -> Response:
+    # 기본은 JSON, Accept 에 MessagePack 이 있으면 컬럼 단위 MessagePack (구버전 앱은 그대로 JSON)
+    headers = dict(headers or {}, Vary="Accept")
+    if wants_msgpack(request):
+        return MsgpackResponse(content, headers=headers)
+    return FastJSONResponse(content, headers=headers)
@@ -0,0 +1,35 @@
+MASKED = "비공개"
+
+# 회원 공개 설정(maskYN)별 비공개 항목 (회원 상세/동기화 공통)
+# - N: 전체 공개, S: 주소/생일 비공개, T: 가족/개인 정보 비공개, 그 밖의 값: 완전 비공개
+MASK_FIELDS = {
+    "N": {},
+    "S": {"memberAddress": MASKED, "memberBirth": MASKED},
+    "T": {
+        "memberAddress": MASKED, "memberEmail": MASKED, "memberJoindate": MASKED,
+        "memberBirth": MASKED, "spouseName": MASKED, "spousePhone": MASKED,
+        "spouseBirth": MASKED, "spousePhoto": "",
+    },
+}
+FULL_MASK_FIELDS = {
+    "memberPhone": MASKED, "memberAddress": MASKED, "memberEmail": MASKED,
+    "memberJoindate": MASKED, "addMemo": MASKED, "memberBirth": MASKED,
+    "nameCard": "", "officeAddress": MASKED, "spouseName": MASKED,
+    "spousePhone": MASKED, "spouseBirth": MASKED, "spousePhoto": "",
+    "bisTitle": MASKED, "bisRank": MASKED, "bisType": MASKED,
+    "bistypeTitle": MASKED, "offtel": MASKED, "offAddress": MASKED,
+    "offEmail": MASKED, "offPost": MASKED, "offWeb": MASKED,
+    "offSns": MASKED, "bisMemo": MASKED,
+}
+
+
+def is_fully_masked(mask) -> bool:
+    # 완전 비공개 회원은 사업장 정보도 내보내지 않음
+    return mask not in MASK_FIELDS
+
+
+def mask_member(d: dict, mask) -> dict:
+    # d 에 들어 있는 항목만 비공개로 바꿈 (조회하지 않은 항목은 추가하지 않음)
+    fields = MASK_FIELDS.get(mask, FULL_MASK_FIELDS)
+    d.update({key: value for key, value in fields.items() if key in d})
+    return d
@@ -0,0 +1,87 @@
+import time
+from collections import OrderedDict
+from sqlalchemy import text, bindparam
+from common.synclog import sync_log
+
+
+# 다른 워커에서 바뀐 회원명을 확인하는 주기(초) - 동기화 변경 기록(syncLog)의 회원 변경분을 캐시에서 제거
+CHANGE_CHECK_SECONDS = 10
+
+
+# 회원번호 -> 회원명 조회기: 필요한 번호를 모아 IN (...) 한 번으로 조회하고 작은 LRU 캐시에 보관
+class MemberNameResolver:
+    def __init__(self, maxsize: int = 4096):
+        self._cache = OrderedDict()
+        self._maxsize = maxsize
+        self._log_no = None
+        self._checked = 0.0
+
+    async def resolve(self, db, member_nos) -> dict:
+        await self._drop_changed(db)
+        wanted = set()
+        for no in member_nos:
+            try:
+                if no is not None and str(no).strip() != "":
+                    wanted.add(int(no))
+            except (TypeError, ValueError):
+                continue
+        names = {}
+        missing = []
+        for no in wanted:
+            if no in self._cache:
+                self._cache.move_to_end(no)
+                names[no] = self._cache[no]
+            else:
+                missing.append(no)
+        if missing:
+            query = text("SELECT memberNo, memberName FROM lionsMember WHERE memberNo IN :nos")
+            query = query.bindparams(bindparam("nos", expanding=True))
+            result = await db.execute(query, {"nos": missing})
+            found = {row[0]: row[1] for row in result.fetchall()}
+            for no in missing:
+                # 없는 회원번호도 None 으로 캐시해 같은 번호를 반복 조회하지 않음
+                names[no] = found.get(no)
+                self._put(no, names[no])
+        return names
+
+    def name_of(self, names: dict, member_no, default=None):
+        try:
+            name = names.get(int(member_no)) if member_no is not None else None
+        except (TypeError, ValueError):
+            name = None
+        return name if name is not None else default
+
+    def invalidate(self, *member_nos):
+        if not member_nos:
+            self._cache.clear()
+            return
+        for no in member_nos:
+            self._cache.pop(int(no), None)
+
+    async def _drop_changed(self, db):
+        now = time.monotonic()
+        if now - self._checked < CHANGE_CHECK_SECONDS:
+            return
+        self._checked = now
+        try:
+            if self._log_no is None:
+                # 처음에는 위치만 기억 (그 전에 캐시된 이름이 없음)
+                self._log_no = await sync_log.settled_max(db)
+                return
+            changed, log_no, has_more = await sync_log.changes_since(db, self._log_no)
+            if has_more:
+                self._cache.clear()
+            elif changed.get("member"):
+                self.invalidate(*changed["member"])
+            self._log_no = log_no
+        except Exception as e:
+            print(f"회원명 캐시 변경 확인 실패: {e}")
+
+    def _put(self, no, name):
+        self._cache[no] = name
+        self._cache.move_to_end(no)
+        while len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+
+
+member_names = MemberNameResolver()
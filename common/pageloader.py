@@ -0,0 +1,19 @@
+import asyncio
+
+
+# 화면 하나에 필요한 조회들을 이름별로 선언하고, 서로 독립적인 조회는 각자 세션(풀 연결)을 받아 동시에 실행
+# 사용 예) data = await page_loader.load(memberdtl=lambda db: get_memberdetail(memberno, db),
+#                                        clublist=get_clublist)
+class PageLoader:
+    def __init__(self, session_factory):
+        self._session_factory = session_factory
+
+    async def _run(self, fetcher):
+        # AsyncSession 은 동시 실행을 지원하지 않으므로 조회마다 별도 세션 사용
+        async with self._session_factory() as session:
+            return await fetcher(session)
+
+    async def load(self, **fetchers):
+        names = list(fetchers.keys())
+        results = await asyncio.gather(*(self._run(fetcher) for fetcher in fetchers.values()))
+        return dict(zip(names, results))
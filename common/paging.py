@@ -0,0 +1,63 @@
+import base64
+import datetime
+import json
+from fastapi import HTTPException
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# 키셋 정렬에서 NULL 을 가장 앞에 두기 위한 대체값 (MariaDB ASC 정렬 시 NULL 이 먼저 나옴)
+# 날짜는 문자열이 아닌 date 로 바인딩해 COALESCE 결과가 날짜 비교가 되도록 함
+NULL_DATE = datetime.date(1000, 1, 1)
+NULL_ORDER = -1
+# 커서 안의 날짜 값 표시 (디코드할 때 date/datetime 으로 되돌려 바인딩)
+DATE_TYPES = {"$datetime": datetime.datetime, "$date": datetime.date}
+
+
+def clamp_limit(limit) -> int:
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(int(limit), MAX_PAGE_SIZE)
+
+
+def encode_cursor(values) -> str:
+    # 마지막 행의 정렬 키 값을 그대로 담아 다음 페이지의 시작점으로 사용
+    plain = [_plain(v) for v in values]
+    raw = json.dumps(plain, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _plain(value):
+    for tag, kind in DATE_TYPES.items():
+        if isinstance(value, kind):
+            return {tag: value.isoformat()}
+    return value
+
+
+def _typed(value):
+    if isinstance(value, dict):
+        (tag, iso), = value.items()
+        return DATE_TYPES[tag].fromisoformat(iso)
+    return value
+
+
+def decode_cursor(cursor: str, size: int):
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError(cursor)
+        return [_typed(v) for v in values]
+    except Exception:
+        raise HTTPException(status_code=400, detail="잘못된 페이지 커서입니다.")
+
+
+def keyset_page(rows, limit: int, key_of):
+    # limit + 1 개를 조회한 결과에서 다음 페이지 존재 여부와 커서를 계산
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(key_of(rows[-1]))
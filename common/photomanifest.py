@@ -0,0 +1,185 @@
+import asyncio
+import os
+import re
+import threading
+import time
+
+
+PHOTO_DIR = "./static/img/members"
+PHOTO_URL = "/static/img/members"
+PHOTO_KINDS = ("mphoto", "ncard", "sphoto")
+# 원본 사진 확장자 (저장한 형식과 같은 확장자, 같은 회원에 여러 개면 앞의 것 우선)
+PHOTO_EXTS = ("png", "jpg", "webp")
+# 목록/카드용 축소본 (가로 폭 기준, WebP) - {kind}_{회원번호}_{폭}.webp
+VARIANT_KINDS = ("mphoto",)
+VARIANT_SIZES = (64, 128, 256)
+VARIANT_EXT = "webp"
+# 다른 워커의 업로드를 반영하기 위한 전체 재조회 주기(초)
+REFRESH_SECONDS = 30
+
+_NAME_RE = re.compile(r"^(mphoto|ncard|sphoto)_(\d+)\.(png|jpg|webp)$")
+_VARIANT_RE = re.compile(r"^(mphoto)_(\d+)_(\d+)\.webp$")
+
+
+def variant_name(kind: str, member_no: int, size: int) -> str:
+    return f"{kind}_{member_no}_{size}.{VARIANT_EXT}"
+
+
+# 회원 사진(mphoto_/ncard_/sphoto_) 파일 목록을 메모리에 보관해 요청마다 파일시스템을 조회하지 않도록 함
+class PhotoManifest:
+    def __init__(self, directory: str = PHOTO_DIR, url_prefix: str = PHOTO_URL):
+        self._dir = directory
+        self._url = url_prefix
+        self._files = {}
+        self._variants = {}
+        self._scanned_at = 0.0
+        self._updated = {}
+        self._refreshing = None
+        self._lock = threading.Lock()
+
+    def scan(self, log: bool = True):
+        started = time.monotonic()
+        files = {}
+        variants = {}
+        try:
+            with os.scandir(self._dir) as it:
+                for entry in it:
+                    m = _NAME_RE.match(entry.name)
+                    if m and entry.is_file():
+                        st = entry.stat()
+                        files[(m.group(1), int(m.group(2)), m.group(3))] = (st.st_mtime, st.st_size)
+                        continue
+                    v = _VARIANT_RE.match(entry.name)
+                    if v and entry.is_file():
+                        st = entry.stat()
+                        variants.setdefault((v.group(1), int(v.group(2))), {})[int(v.group(3))] = (st.st_mtime, st.st_size)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            # 조회 중에 update() 로 반영된 회원은 방금 읽은 값보다 최신이므로 그대로 둠
+            for (kind, member_no), at in list(self._updated.items()):
+                if at < started:
+                    del self._updated[(kind, member_no)]
+                    continue
+                for key in [k for k in files if k[:2] == (kind, member_no)]:
+                    del files[key]
+                files.update({k: v for k, v in self._files.items() if k[:2] == (kind, member_no)})
+                if (kind, member_no) in self._variants:
+                    variants[(kind, member_no)] = self._variants[(kind, member_no)]
+            self._files = files
+            self._variants = variants
+            self._scanned_at = time.monotonic()
+        if log:
+            print(f"회원 사진 목록 적재 완료: {len(files)}개")
+        return len(files)
+
+    def _ensure_fresh(self):
+        # 재조회는 백그라운드 스레드에서 하고, 끝날 때까지는 현재 목록으로 응답
+        if time.monotonic() - self._scanned_at <= REFRESH_SECONDS or self._refreshing is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 이벤트 루프 밖(작업 스레드/명령행)에서는 바로 조회
+            self.scan(log=False)
+            return
+        self._refreshing = loop.create_task(asyncio.to_thread(self.scan, False))
+        self._refreshing.add_done_callback(self._refreshed)
+
+    def _refreshed(self, task):
+        self._refreshing = None
+        if not task.cancelled() and task.exception():
+            print(f"회원 사진 목록 갱신 실패: {task.exception()}")
+            # 실패해도 매 요청마다 다시 시도하지 않도록 다음 주기까지 대기
+            self._scanned_at = time.monotonic()
+
+    def update(self, kind: str, member_no: int, exts=PHOTO_EXTS):
+        # 업로드/삭제 직후 해당 회원의 파일만 다시 확인
+        with self._lock:
+            self._updated[(kind, int(member_no))] = time.monotonic()
+        for ext in exts:
+            path = os.path.join(self._dir, f"{kind}_{member_no}.{ext}")
+            key = (kind, int(member_no), ext)
+            try:
+                st = os.stat(path)
+                with self._lock:
+                    self._files[key] = (st.st_mtime, st.st_size)
+            except FileNotFoundError:
+                with self._lock:
+                    self._files.pop(key, None)
+        if kind in VARIANT_KINDS:
+            found = {}
+            for size in VARIANT_SIZES:
+                try:
+                    st = os.stat(os.path.join(self._dir, variant_name(kind, member_no, size)))
+                    found[size] = (st.st_mtime, st.st_size)
+                except FileNotFoundError:
+                    pass
+            with self._lock:
+                self._variants[(kind, int(member_no))] = found
+
+    def entry(self, kind: str, member_no: int, exts=PHOTO_EXTS):
+        self._ensure_fresh()
+        for ext in exts:
+            info = self._files.get((kind, int(member_no), ext))
+            if info:
+                return f"{kind}_{member_no}.{ext}", info
+        return None
+
+    def url(self, kind: str, member_no: int, exts=PHOTO_EXTS):
+        # 파일 수정시각/크기로 버전 쿼리를 붙여 사진 교체 시 캐시 무효화
+        found = self.entry(kind, member_no, exts)
+        if not found:
+            return None
+        name, (mtime, size) = found
+        return f"{self._url}/{name}?v={int(mtime * 1000):x}{size:x}"
+
+    def path(self, kind: str, member_no: int, exts=PHOTO_EXTS):
+        found = self.entry(kind, member_no, exts)
+        return os.path.join(self._dir, found[0]) if found else None
+
+    def mtime(self, kind: str, member_no: int, exts=PHOTO_EXTS):
+        found = self.entry(kind, member_no, exts)
+        return found[1][0] if found else None
+
+    def _variant(self, kind: str, member_no: int, size: int):
+        # 표시 크기 이상인 것 중 가장 작은 축소본, 없으면 가장 큰 축소본
+        self._ensure_fresh()
+        found = self._variants.get((kind, int(member_no)))
+        if not found:
+            return None
+        sizes = sorted(found)
+        chosen = next((s for s in sizes if s >= size), sizes[-1])
+        return chosen, found[chosen]
+
+    def _variant_url(self, kind: str, member_no: int, size: int, info) -> str:
+        mtime, fsize = info
+        return f"{self._url}/{variant_name(kind, member_no, size)}?v={int(mtime * 1000):x}{fsize:x}"
+
+    def variant_url(self, kind: str, member_no: int, size: int, exts=PHOTO_EXTS):
+        # 축소본이 아직 없으면 원본 주소
+        found = self._variant(kind, member_no, size)
+        if not found:
+            return self.url(kind, member_no, exts)
+        return self._variant_url(kind, member_no, found[0], found[1])
+
+    def srcset(self, kind: str, member_no: int) -> str:
+        self._ensure_fresh()
+        found = self._variants.get((kind, int(member_no))) or {}
+        return ", ".join(f"{self._variant_url(kind, member_no, size, found[size])} {size}w" for size in sorted(found))
+
+    def missing_variants(self):
+        # 원본은 있는데 축소본이 빠졌거나 원본보다 오래된 회원 (기존 사진 일괄 생성용)
+        self._ensure_fresh()
+        missing = []
+        members = {(kind, member_no) for kind, member_no, _ in list(self._files) if kind in VARIANT_KINDS}
+        for kind, member_no in sorted(members):
+            # 확장자가 여러 개면 실제로 쓰이는(우선순위가 높은) 원본 기준
+            mtime = self.mtime(kind, member_no)
+            found = self._variants.get((kind, member_no)) or {}
+            if len(found) < len(VARIANT_SIZES) or min(v[0] for v in found.values()) < mtime:
+                missing.append((kind, member_no))
+        return missing
+
+
+photo_manifest = PhotoManifest()
@@ -0,0 +1,91 @@
+import hashlib
+import os
+import shutil
+import threading
+import time
+
+
+STORE_DIR = "./static/img/store"
+# 게시된 이름이 없어진 실제 파일을 지우기 전 대기 시간(초) - 막 저장하고 아직 연결하지 않은 파일 보호
+GC_GRACE_SECONDS = 600
+
+
+def _tmp_path(path: str) -> str:
+    # 같은 프로세스의 여러 스레드(asyncio.to_thread)가 같은 파일을 써도 겹치지 않도록 스레드 번호 포함
+    return f"{path}.tmp{os.getpid()}_{threading.get_ident()}"
+
+
+# 내용 해시로 저장하는 사진 저장소 (로컬 파일시스템)
+# - 실제 파일: {root}/{해시 앞 2자리}/{다음 2자리}/{해시}.{확장자}, 같은 내용은 한 번만 저장
+# - 모든 쓰기는 임시 파일에 쓴 뒤 이름 변경(os.replace)으로 교체
+# - 기존 파일명(mphoto_N.png, clubImageN.jpg 등)은 실제 파일에 대한 하드링크로 게시
+# 역할 범위: 중복 제거와 원자적 교체만 담당하고, 조회 경로는 바꾸지 않음
+#   화면/앱/정적 경로는 계속 기존 파일명(평면 폴더)으로 조회하며, 폴더 조회 비용은
+#   사진 목록(photo_manifest)의 메모리 목록으로 줄임. 샤딩은 저장소 폴더 자체가 커지지 않게 하는 용도
+# - 교체되어 게시된 이름이 없어진(링크 수 1) 실제 파일은 collect_garbage 로 정리
+class LocalPhotoStore:
+    def __init__(self, root: str = STORE_DIR):
+        self.root = root
+
+    @staticmethod
+    def key_for(data: bytes, ext: str) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        return f"{digest[:2]}/{digest[2:4]}/{digest}.{ext.lstrip('.').lower() or 'bin'}"
+
+    def blob_path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def put(self, data: bytes, ext: str) -> str:
+        key = self.key_for(data, ext)
+        path = self.blob_path(key)
+        if os.path.exists(path):
+            return key
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = _tmp_path(path)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return key
+
+    def publish(self, key: str, dest_path: str):
+        # 기존 경로에 연결 (하드링크가 안 되는 파일시스템이면 복사)
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+        tmp_path = _tmp_path(dest_path)
+        try:
+            os.link(self.blob_path(key), tmp_path)
+        except OSError:
+            shutil.copyfile(self.blob_path(key), tmp_path)
+        os.replace(tmp_path, dest_path)
+        # 수정시각은 건드리지 않음: 하드링크는 실제 파일과 같은 inode 라 같은 내용을 쓰는 모든 이름이 함께 바뀜
+        # 같은 내용이면 수정시각(=사진 주소 버전)이 같은 것이 맞고, 업로드 시 축소본은 항상 다시 만듦
+
+    def save(self, data: bytes, dest_path: str) -> str:
+        key = self.put(data, os.path.splitext(dest_path)[1])
+        try:
+            self.publish(key, dest_path)
+        except FileNotFoundError:
+            # 연결하기 직전에 정리 작업이 같은 내용의 실제 파일을 지운 경우 다시 저장
+            key = self.put(data, os.path.splitext(dest_path)[1])
+            self.publish(key, dest_path)
+        return key
+
+    def collect_garbage(self, grace_seconds: int = GC_GRACE_SECONDS) -> int:
+        # 게시된 이름이 하나도 없는(링크 수 1) 실제 파일과 남은 임시 파일 삭제
+        # 링크 수가 바뀌면 ctime 이 갱신되므로, 최근에 교체/저장된 파일은 다음 정리 때 삭제
+        # (하드링크가 안 되는 파일시스템에서는 게시된 이름이 복사본이므로 실제 파일을 지워도 됨)
+        cutoff = time.time() - grace_seconds
+        removed = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                    if st.st_nlink <= 1 and st.st_ctime < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    continue
+        return removed
+
+
+photo_store = LocalPhotoStore()
@@ -0,0 +1,82 @@
+import asyncio
+import time
+from common.etag import table_versions
+
+
+# 다른 워커에서 바뀐 기준정보를 확인하는 주기(초) - tableVersion 의 테이블 버전과 비교
+VERSION_CHECK_SECONDS = 10
+
+
+# 직책/클럽/써클/지역처럼 거의 바뀌지 않는 기준정보를 메모리에 올려두고 재사용하는 저장소
+class RefDataStore:
+    def __init__(self):
+        self._loaders = {}
+        self._tables = {}
+        self._data = {}
+        self._versions = {}
+        self._checked = 0.0
+        self._lock = asyncio.Lock()
+
+    def register(self, name: str, loader, *tables: str):
+        # loader 는 async def loader(db) 형태의 조회 함수, tables 는 내용이 의존하는 테이블
+        self._loaders[name] = loader
+        self._tables[name] = tables
+
+    async def get(self, name: str, db):
+        await self._check_versions(db)
+        if name in self._data:
+            return self._data[name]
+        async with self._lock:
+            if name not in self._data:
+                await self._load(name, db)
+            return self._data[name]
+
+    async def load_all(self, db):
+        async with self._lock:
+            for name in self._loaders:
+                await self._load(name, db)
+        self._checked = time.monotonic()
+        print(f"기준정보 적재 완료: {', '.join(self._data.keys())}")
+
+    async def refresh(self, db, *names: str):
+        # 쓰기 직후 호출: 해당 데이터만 다시 읽어 교체 (조회 실패 시 다음 요청에서 다시 적재)
+        async with self._lock:
+            for name in names:
+                self._data.pop(name, None)
+                try:
+                    await self._load(name, db)
+                except Exception as e:
+                    print(f"기준정보 갱신 실패({name}): {e}")
+
+    def invalidate(self, *names: str):
+        for name in names or list(self._data.keys()):
+            self._data.pop(name, None)
+
+    async def _load(self, name: str, db):
+        # 버전을 먼저 읽어 두어 조회 중 바뀐 내용은 다음 확인 때 다시 적재
+        tables = self._tables[name]
+        versions = await table_versions.versions(db, *tables) if tables else {}
+        self._data[name] = await self._loaders[name](db)
+        self._versions[name] = versions
+
+    async def _check_versions(self, db):
+        # 다른 워커에서 변경(테이블 버전 증가)된 데이터는 버리고 다음 조회 때 다시 적재
+        now = time.monotonic()
+        if now - self._checked < VERSION_CHECK_SECONDS:
+            return
+        self._checked = now
+        tables = sorted({t for name in self._data for t in self._tables.get(name, ())})
+        if not tables:
+            return
+        try:
+            current = await table_versions.versions(db, *tables)
+        except Exception as e:
+            print(f"기준정보 버전 확인 실패: {e}")
+            return
+        for name in list(self._data):
+            seen = self._versions.get(name, {})
+            if any(current[t] != seen.get(t) for t in self._tables.get(name, ())):
+                self._data.pop(name, None)
+
+
+refdata = RefDataStore()
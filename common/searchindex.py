@@ -0,0 +1,165 @@
+import asyncio
+import time
+from sqlalchemy import text, bindparam
+from common.synclog import sync_log
+
+
+MEMBER_QUERY = (
+    "SELECT lm.memberNo, lm.memberName, lm.memberPhone, lm.memberAddress, lm.memberEmail, lm.addMemo, "
+    "lm.officeAddress, lm.memberJoindate, lm.maskYN, lm.clubRank, lm.clubNo, lc.regionNo, lc.clubName, lr.rankTitlekor "
+    "FROM lionsMember lm left join lionsRank lr on lm.rankNo = lr.rankNo left join lionsClub lc on lm.clubNo = lc.clubNo")
+BUSINESS_QUERY = (
+    "SELECT memberNo, bisTitle, bisType, bistypeTitle, bisMemo FROM memberBusiness where attrib not like '%XXX%'")
+
+# 검색 대상 컬럼 (기존 LIKE 검색과 동일한 10개 컬럼)
+MEMBER_FIELDS = ("memberName", "memberPhone", "memberAddress", "memberEmail", "addMemo", "officeAddress")
+BUSINESS_FIELDS = ("bisTitle", "bisType", "bistypeTitle", "bisMemo")
+
+# 다른 워커에서 바뀐 회원을 확인하는 주기(초) - 동기화 변경 기록(syncLog)의 회원/사업장 변경분만 다시 읽음
+CHANGE_CHECK_SECONDS = 10
+
+
+def _normalize(value) -> str:
+    return str(value).strip().lower() if value is not None else ""
+
+
+def _ngrams(value: str):
+    # 한글은 음절 단위로 1-gram/2-gram 을 만들면 '김철', '철수' 처럼 부분 이름 검색이 가능
+    grams = set(value)
+    grams.update(value[i:i + 2] for i in range(len(value) - 1))
+    return grams
+
+
+# 회원/사업장 정보를 n-gram 역색인으로 메모리에 보관하는 검색기
+class MemberSearchIndex:
+    def __init__(self):
+        self._docs = {}
+        self._fields = {}
+        self._grams = {}
+        self._postings = {}
+        self._business = {}
+        self._loaded = False
+        self._log_no = 0
+        self._checked = 0.0
+        self._lock = asyncio.Lock()
+
+    async def ensure_loaded(self, db):
+        if self._loaded:
+            await self._apply_changes(db)
+        if self._loaded:
+            return
+        async with self._lock:
+            if not self._loaded:
+                await self.load(db)
+
+    async def load(self, db):
+        # 변경 기록 위치를 먼저 읽어 두어 적재 중 바뀐 회원은 다음 확인 때 다시 읽음
+        log_no = await sync_log.settled_max(db)
+        members = (await db.execute(text(MEMBER_QUERY))).fetchall()
+        business = (await db.execute(text(BUSINESS_QUERY))).fetchall()
+        self._docs, self._fields, self._grams, self._postings, self._business = {}, {}, {}, {}, {}
+        for row in business:
+            self._business.setdefault(row.memberNo, []).append(row)
+        for row in members:
+            self._put(row)
+        self._log_no = log_no
+        self._checked = time.monotonic()
+        self._loaded = True
+        print(f"회원 검색 색인 적재 완료: {len(self._docs)}명")
+
+    def invalidate(self):
+        # 클럽명/직책명 변경 등 전체에 영향을 주는 경우 다음 검색 시 재적재
+        self._loaded = False
+
+    async def refresh_member(self, db, memberno: int):
+        if not self._loaded:
+            return
+        try:
+            await self._refresh_members(db, [memberno])
+        except Exception as e:
+            print(f"회원 검색 색인 갱신 실패({memberno}): {e}")
+            self.invalidate()
+
+    async def _apply_changes(self, db):
+        now = time.monotonic()
+        if now - self._checked < CHANGE_CHECK_SECONDS:
+            return
+        self._checked = now
+        try:
+            changed, log_no, has_more = await sync_log.changes_since(db, self._log_no)
+            if has_more:
+                # 변경이 너무 많으면 전체 재적재
+                self.invalidate()
+                return
+            nos = changed.get("member", set()) | changed.get("business", set())
+            if nos:
+                await self._refresh_members(db, sorted(nos))
+            self._log_no = log_no
+        except Exception as e:
+            print(f"회원 검색 색인 변경 확인 실패: {e}")
+
+    async def _refresh_members(self, db, nos):
+        query = text(MEMBER_QUERY + " where lm.memberNo IN :nos").bindparams(bindparam("nos", expanding=True))
+        rows = (await db.execute(query, {"nos": list(nos)})).fetchall()
+        query = text(BUSINESS_QUERY + " and memberNo IN :nos").bindparams(bindparam("nos", expanding=True))
+        business = (await db.execute(query, {"nos": list(nos)})).fetchall()
+        for memberno in nos:
+            self._remove(memberno)
+        for bis in business:
+            self._business.setdefault(bis.memberNo, []).append(bis)
+        for row in rows:
+            self._put(row)
+
+    def search(self, keyword: str, region_no: int = None, club_no: int = None):
+        query = _normalize(keyword)
+        if not query:
+            return []
+        if len(query) == 1:
+            candidates = self._postings.get(query, set())
+        else:
+            keys = [query[i:i + 2] for i in range(len(query) - 1)]
+            sets = sorted((self._postings.get(k, set()) for k in keys), key=len)
+            candidates = set.intersection(*sets) if sets[0] else set()
+        found = []
+        for memberno in candidates:
+            doc = self._docs[memberno]
+            if region_no is not None and doc["regionNo"] != region_no:
+                continue
+            if club_no is not None and doc["clubNo"] != club_no:
+                continue
+            # n-gram 교집합은 후보일 뿐이므로 실제 포함 여부로 LIKE '%kw%' 와 같은 결과 보장
+            if any(query in field for field in self._fields[memberno]):
+                found.append(doc)
+        # 기존 쿼리의 order by lm.memberJoindate 정렬 유지 (NULL 이 먼저)
+        found.sort(key=lambda d: (d["memberJoindate"] is not None, str(d["memberJoindate"] or ""), d["memberNo"]))
+        return found
+
+    def _put(self, row):
+        memberno = row.memberNo
+        doc = dict(row._mapping)
+        fields = [_normalize(doc[f]) for f in MEMBER_FIELDS]
+        for bis in self._business.get(memberno, []):
+            fields.extend(_normalize(getattr(bis, f)) for f in BUSINESS_FIELDS)
+        fields = [f for f in fields if f]
+        grams = set()
+        for field in fields:
+            grams.update(_ngrams(field))
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(memberno)
+        self._docs[memberno] = doc
+        self._fields[memberno] = fields
+        self._grams[memberno] = grams
+
+    def _remove(self, memberno: int):
+        for gram in self._grams.pop(memberno, ()):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(memberno)
+                if not posting:
+                    del self._postings[gram]
+        self._docs.pop(memberno, None)
+        self._fields.pop(memberno, None)
+        self._business.pop(memberno, None)
+
+
+member_index = MemberSearchIndex()
@@ -0,0 +1,91 @@
+import asyncio
+import glob
+import hashlib
+import os
+from common.photomanifest import photo_manifest
+
+
+SLOGAN_CACHE_DIR = "./static/img/slogans"
+# 그리는 방식(레이아웃/폰트)이 바뀌면 올려서 기존 캐시를 무효화
+RENDER_VERSION = "1"
+# 같은 주소에서 내용이 바뀌므로 매번 ETag 로 재검증
+CACHE_CONTROL = "public, no-cache"
+
+
+# 슬로건 카드 렌더링 결과를 입력값(슬로건/임원 번호/이름/사진 수정시각) 해시로 보관
+# - 파일명: {kind}{번호}_{해시}.png, 새로 그리면 같은 카드의 이전 파일은 삭제
+class SloganCache:
+    def __init__(self, directory: str = SLOGAN_CACHE_DIR):
+        self._dir = directory
+        self._inflight = {}
+
+    def key(self, slogan: str, member_no, name: str, sub_members, width: int, height: int) -> str:
+        parts = [RENDER_VERSION, f"{width}x{height}", slogan or ""]
+        for m_no, m_name in [(member_no, name)] + list(sub_members):
+            mtime = photo_manifest.mtime("mphoto", m_no) if m_no else None
+            parts.append(f"{m_no}:{m_name}:{mtime or 0}")
+        return hashlib.sha1("\x1f".join(map(str, parts)).encode("utf-8")).hexdigest()
+
+    def path(self, kind: str, no: int, key: str) -> str:
+        return os.path.join(self._dir, f"{kind}{no}_{key[:20]}.png")
+
+    @staticmethod
+    def etag(key: str) -> str:
+        return f'"{key[:20]}"'
+
+    def cached(self, kind: str, no: int, key: str):
+        path = self.path(kind, no, key)
+        return path if os.path.exists(path) else None
+
+    def prune(self, kind: str, no: int, keep: str):
+        for old in glob.glob(os.path.join(self._dir, f"{kind}{no}_*.png")):
+            if old != keep:
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
+
+    async def get_or_render(self, kind: str, no: int, key: str, render):
+        # 캐시 파일이 있으면 경로만 반환, 없으면 render() 로 그린 PNG 바이트 반환
+        # 같은 카드를 동시에 요청하면 한 번만 그림
+        path = self.cached(kind, no, key)
+        if path:
+            return path, None
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(render(self.path(kind, no, key)))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        png = await asyncio.shield(task)
+        self.prune(kind, no, self.path(kind, no, key))
+        return None, png
+
+
+# 임원 변경 후 슬로건 카드를 미리 그려두는 대기열 (같은 카드는 한 번만 대기)
+class SloganQueue:
+    def __init__(self):
+        self._queue = None
+        self._pending = set()
+
+    def put(self, kind: str, no):
+        if self._queue is None or no is None:
+            return
+        item = (kind, int(no))
+        if item in self._pending:
+            return
+        self._pending.add(item)
+        self._queue.put_nowait(item)
+
+    async def run(self, render):
+        self._queue = asyncio.Queue()
+        while True:
+            kind, no = await self._queue.get()
+            self._pending.discard((kind, no))
+            try:
+                await render(kind, no)
+            except Exception as e:
+                print(f"슬로건 카드 미리 그리기 실패({kind} {no}): {e}")
+
+
+slogan_cache = SloganCache()
+slogan_queue = SloganQueue()
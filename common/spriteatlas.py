@@ -0,0 +1,148 @@
+import asyncio
+import glob
+import hashlib
+import io
+import json
+import math
+import os
+import threading
+from PIL import Image, ImageOps
+from common.imageworker import image_worker
+from common.photomanifest import photo_manifest
+
+
+SPRITE_DIR = "./static/img/sprites"
+SPRITE_URL = "/static/img/sprites"
+# 칸 크기(원본 픽셀)와 한 줄의 칸 수 - 카드에서는 80px 로 축소해 표시
+SPRITE_TILE = 128
+SPRITE_COLUMNS = 10
+SPRITE_BG = "#E0E0E0"
+
+
+def _atomic_write(path: str, data: bytes):
+    # 같은 프로세스의 다른 스레드와도 임시 파일이 겹치지 않도록 스레드 번호까지 붙임
+    tmp_path = f"{path}.tmp{os.getpid()}_{threading.get_ident()}"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def sprite_job(clubno: int, entries, directory: str, tile: int, columns: int) -> dict:
+    # 이미지 작업 프로세스에서 실행
+    # entries: [(회원번호, 사진 경로, 사진 수정시각)]
+    # 이전 결과(clubsprite_{clubno}.json)가 있으면 회원별 칸을 유지하고 바뀐 사진만 다시 붙임
+    os.makedirs(directory, exist_ok=True)
+    map_path = os.path.join(directory, f"clubsprite_{clubno}.json")
+    try:
+        with open(map_path, encoding="utf-8") as f:
+            prev = json.load(f)
+    except (FileNotFoundError, ValueError):
+        prev = {}
+    if prev.get("tile") != tile or prev.get("columns") != columns:
+        prev = {}
+    prev_members = prev.get("members", {})
+    prev_file = os.path.join(directory, prev["file"]) if prev.get("file") else None
+
+    wanted = {str(no): (path, mtime) for no, path, mtime in entries}
+    slots = {no: info["slot"] for no, info in prev_members.items() if no in wanted}
+    used = set(slots.values())
+    free = iter(i for i in range(len(wanted) + len(used)) if i not in used)
+    for no in wanted:
+        if no not in slots:
+            slots[no] = next(free)
+    rows = max(1, math.ceil((max(slots.values(), default=0) + 1) / columns))
+    size = (columns * tile, rows * tile)
+
+    atlas = None
+    if prev_file and prev_members and os.path.exists(prev_file):
+        old = Image.open(prev_file).convert("RGB")
+        if old.size == size:
+            atlas = old
+        else:
+            # 칸 수가 바뀌어도 한 줄의 칸 수가 같으므로 기존 칸 위치는 그대로
+            atlas = Image.new("RGB", size, SPRITE_BG)
+            atlas.paste(old.crop((0, 0, size[0], min(old.size[1], size[1]))), (0, 0))
+    reuse = atlas is not None
+    if atlas is None:
+        atlas = Image.new("RGB", size, SPRITE_BG)
+
+    changed = 0
+    failed = set()
+    for no, (path, mtime) in wanted.items():
+        info = prev_members.get(no)
+        if reuse and info and info["slot"] == slots[no] and info["mtime"] == mtime:
+            continue
+        slot = slots[no]
+        try:
+            photo = ImageOps.fit(ImageOps.exif_transpose(Image.open(path)).convert("RGB"), (tile, tile), Image.LANCZOS)
+        except Exception:
+            # 열리지 않는 사진은 칸을 비우고 좌표에서 빼서 화면이 기본 이미지를 쓰도록 함 (다음 갱신 때 다시 시도)
+            failed.add(no)
+            photo = Image.new("RGB", (tile, tile), SPRITE_BG)
+        atlas.paste(photo, ((slot % columns) * tile, (slot // columns) * tile))
+        changed += 1
+
+    members = {no: {"slot": slots[no], "mtime": wanted[no][1]} for no in wanted if no not in failed}
+    version = hashlib.sha1(json.dumps(members, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    filename = f"clubsprite_{clubno}_{version}.webp"
+    atlas_path = os.path.join(directory, filename)
+    if changed or not os.path.exists(atlas_path):
+        buf = io.BytesIO()
+        atlas.save(buf, format="WEBP", quality=80, method=4)
+        _atomic_write(atlas_path, buf.getvalue())
+    _atomic_write(map_path, json.dumps({"tile": tile, "columns": columns, "file": filename,
+                                        "members": members}).encode("utf-8"))
+    # 방금 만든 것과 바로 전 것만 남김 (이미 열린 화면이 이전 주소를 쓰고 있을 수 있음)
+    keep = {filename, prev.get("file")}
+    for old_path in glob.glob(os.path.join(directory, f"clubsprite_{clubno}_*.webp")):
+        if os.path.basename(old_path) not in keep:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+    return {"file": filename, "tile": tile, "columns": columns,
+            "members": {no: info["slot"] for no, info in members.items()}, "changed": changed - len(failed)}
+
+
+# 클럽별 회원 사진 묶음 이미지(스프라이트)와 좌표
+# - 회원 구성/사진 수정시각이 그대로면 메모리의 결과를 그대로 사용
+class ClubSprite:
+    def __init__(self, directory: str = SPRITE_DIR, url_prefix: str = SPRITE_URL,
+                 tile: int = SPRITE_TILE, columns: int = SPRITE_COLUMNS):
+        self._dir = directory
+        self._url = url_prefix
+        self.tile = tile
+        self.columns = columns
+        self._built = {}
+        self._inflight = {}
+
+    def _entries(self, member_nos):
+        entries = []
+        for no in member_nos:
+            path = photo_manifest.path("mphoto", no)
+            if path:
+                entries.append((int(no), path, photo_manifest.mtime("mphoto", no)))
+        return entries
+
+    async def get(self, clubno: int, member_nos) -> dict:
+        entries = self._entries(member_nos)
+        signature = tuple(sorted((no, mtime) for no, _, mtime in entries))
+        built = self._built.get(clubno)
+        if built and built[0] == signature:
+            return built[1]
+        task = self._inflight.get((clubno, signature))
+        if task is None:
+            task = asyncio.ensure_future(
+                image_worker.run(sprite_job, clubno, entries, self._dir, self.tile, self.columns))
+            self._inflight[(clubno, signature)] = task
+            task.add_done_callback(lambda _: self._inflight.pop((clubno, signature), None))
+        result = await asyncio.shield(task)
+        if result["changed"]:
+            print(f"클럽 {clubno} 사진 스프라이트 갱신: {result['changed']}장")
+        sprite = {"url": f"{self._url}/{result['file']}", "tile": result["tile"], "columns": result["columns"],
+                  "members": result["members"]}
+        self._built[clubno] = (signature, sprite)
+        return sprite
+
+
+club_sprite = ClubSprite()
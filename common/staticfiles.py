@@ -0,0 +1,82 @@
+import json
+import mimetypes
+import os
+import re
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from common.compression import accepted_encodings
+
+
+STATIC_DIR = "static"
+STATIC_URL = "/static"
+# build_static.py 결과 (파일명에 내용 해시가 들어간 자산 + .br/.gz)
+DIST_DIR = "dist"
+MANIFEST_PATH = os.path.join(STATIC_DIR, DIST_DIR, "manifest.json")
+IMMUTABLE = "public, max-age=31536000, immutable"
+# 미리 압축한 파일 우선순위 (서버에 brotli 가 없어도 빌드 때 만든 .br 은 전송 가능)
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+_HASHED_RE = re.compile(r"\.[0-9a-f]{10}\.[A-Za-z0-9]+$")
+_VERSION_RE = re.compile(r"(^|&)v=")
+
+
+# 원본 경로(css/sb-admin-2.min.css) -> 해시 파일 경로(dist/css/sb-admin-2.min.1a2b3c4d5e.css)
+class AssetManifest:
+    def __init__(self, path: str = MANIFEST_PATH, url_prefix: str = STATIC_URL):
+        self._path = path
+        self._url = url_prefix
+        self._assets = {}
+
+    def load(self):
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                self._assets = json.load(f)
+            print(f"정적 자산 목록 적재 완료: {len(self._assets)}개")
+        except FileNotFoundError:
+            # 빌드 전에는 원본 경로 그대로 사용
+            self._assets = {}
+
+    def url(self, path: str) -> str:
+        path = path.lstrip("/")
+        if path.startswith("static/"):
+            path = path[len("static/"):]
+        hashed = self._assets.get(path)
+        return f"{self._url}/{DIST_DIR}/{hashed}" if hashed else f"{self._url}/{path}"
+
+
+asset_manifest = AssetManifest()
+asset_url = asset_manifest.url
+
+
+# 해시 파일명(또는 ?v= 버전이 붙은 주소)은 immutable 로 장기 캐시하고,
+# 미리 압축해 둔 .br/.gz 가 있으면 Accept-Encoding 에 맞춰 그 파일을 그대로 전송
+class PrecompressedStaticFiles(StaticFiles):
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        hashed = bool(_HASHED_RE.search(full_path))
+        headers = {}
+        if hashed or _VERSION_RE.search(scope.get("query_string", b"").decode("latin-1")):
+            headers["Cache-Control"] = IMMUTABLE
+
+        path, stat_result_to_send, media_type = full_path, stat_result, None
+        if hashed:
+            headers["Vary"] = "Accept-Encoding"
+            accepted = accepted_encodings(request_headers.get("accept-encoding"))
+            for encoding, suffix in PRECOMPRESSED:
+                if accepted.get(encoding, 0) <= 0:
+                    continue
+                try:
+                    stat_result_to_send = os.stat(full_path + suffix)
+                except OSError:
+                    continue
+                path = full_path + suffix
+                media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+                headers["Content-Encoding"] = encoding
+                break
+
+        response = FileResponse(path, status_code=status_code, stat_result=stat_result_to_send,
+                                media_type=media_type, headers=headers)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,182 @@
+from fastapi import HTTPException
+from sqlalchemy import text, bindparam
+from common.paging import encode_cursor, decode_cursor
+from common.membermask import MASK_FIELDS, mask_member
+
+
+# 모바일 증분 동기화용 변경 기록 (쓰기와 같은 트랜잭션에서 기록)
+SYNC_LOG_DDL = """
+    CREATE TABLE IF NOT EXISTS syncLog (
+        logNo bigint NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        entityType varchar(20) NOT NULL,
+        entityNo bigint NOT NULL,
+        regDate timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        KEY ix_synclog_regdate (regDate)
+    )"""
+RECORD_SQL = text("INSERT INTO syncLog (entityType, entityNo) VALUES (:entityType, :entityNo)")
+RECORD_LAST_INSERT_SQL = text("INSERT INTO syncLog (entityType, entityNo) VALUES (:entityType, LAST_INSERT_ID())")
+
+# 커밋 순서가 logNo 순서와 다를 수 있으므로, 이 시간(초)이 지난 기록까지만 토큰을 전진
+SETTLE_SECONDS = 5
+SYNC_PAGE_SIZE = 2000
+
+CHANGES_SQL = text(
+    "SELECT logNo, entityType, entityNo, regDate < NOW() - INTERVAL :settle SECOND AS settled "
+    "FROM syncLog WHERE logNo > :since ORDER BY logNo LIMIT :limit")
+SETTLED_MAX_SQL = text(
+    "SELECT COALESCE(MAX(logNo), 0) FROM syncLog WHERE regDate < NOW() - INTERVAL :settle SECOND")
+
+MEMBER_SQL = (
+    "SELECT lm.memberNo, lm.memberName, lm.memberPhone, lm.memberEmail, lm.memberAddress, lm.officeAddress, "
+    "lm.memberJoindate, lm.clubNo, lc.clubName, lr.rankTitlekor, lm.clubRank, lm.clubSortNo, lm.maskYN, lm.funcNo "
+    "FROM lionsMember lm left join lionsRank lr on lm.rankNo = lr.rankNo left join lionsClub lc on lm.clubNo = lc.clubNo")
+# 완전 비공개 회원의 사업장 정보는 내보내지 않음
+BUSINESS_SQL = (
+    "SELECT mb.memberNo, mb.bisTitle, mb.bisRank, mb.bisType, mb.bistypeTitle, mb.officeTel, mb.officeAddress, "
+    "mb.officeEmail, mb.officePostNo, mb.officeWeb, mb.officeSns, mb.bisMemo FROM memberBusiness mb "
+    "join lionsMember lm on lm.memberNo = mb.memberNo left join lionsClub lc on lm.clubNo = lc.clubNo "
+    "where mb.attrib not like '%XXX%' and lm.funcNo < 4 and lm.maskYN IN :masks")
+# 요청한 회원이 볼 수 있는 회원: 같은 지역 클럽 회원 + 같은 써클 회원
+MEMBER_SCOPE = (
+    "(lc.regionNo = :regionno or lm.memberNo IN "
+    "(SELECT cm.memberNo FROM circleMember cm where cm.circleNo IN :circlenos and cm.attrib not like '%XXX%'))")
+SCOPE_SQL = text("SELECT lm.clubNo, lc.regionNo from lionsMember lm left join lionsClub lc on lc.clubNo = lm.clubNo where lm.memberNo = :memberno")
+SCOPE_CIRCLES_SQL = text("SELECT circleNo FROM circleMember where memberNo = :memberno and attrib not like '%XXX%'")
+
+NOTICE_COLUMNS = "messageNo, {scope}, messageTitle, MessageConts, MessageType, noticeFrom, noticeTo, attrib"
+EVENT_COLUMNS = ("eventNo, {scope}, eventTitle, eventType, eventDatefrom, eventDateto, eventTimefrom, eventTimeto, "
+                 "eventPlace, eventMemo, regDate, attrib")
+
+# entityType -> (테이블, 키 컬럼, 범위 컬럼, 조회 컬럼) : attrib 에 XXX 가 들어가면 삭제로 전달
+ENTITY_TABLES = {
+    "notice": ("boardMessage", "messageNo", "regionNo", NOTICE_COLUMNS),
+    "clubnotice": ("clubboardMessage", "messageNo", "clubNo", NOTICE_COLUMNS),
+    "circlenotice": ("circleboardMessage", "messageNo", "circleNo", NOTICE_COLUMNS),
+    "clubevent": ("clubEvents", "eventNo", "clubNo", EVENT_COLUMNS),
+    "circleevent": ("circleEvents", "eventNo", "circleNo", EVENT_COLUMNS),
+}
+
+
+def _in(sql: str, *names):
+    return text(sql).bindparams(*[bindparam(name, expanding=True) for name in names])
+
+
+def _member_dict(row) -> dict:
+    # 삭제(funcNo >= 4)된 회원은 조회하지 않으므로 항상 현재 회원
+    d = mask_member(dict(row._mapping), row.maskYN)
+    d["deleted"] = False
+    return d
+
+
+def _attrib_dict(row) -> dict:
+    d = dict(row._mapping)
+    d["deleted"] = "XXX" in (d.pop("attrib", None) or "")
+    return d
+
+
+def _scope_params(scope: dict) -> dict:
+    return {"regionno": scope["regionNo"], "circlenos": scope["circleNos"]}
+
+
+class SyncLog:
+    async def ensure_table(self, db):
+        await db.execute(text(SYNC_LOG_DDL))
+        await db.commit()
+
+    async def record(self, db, entity_type: str, *entity_nos):
+        try:
+            for no in entity_nos:
+                await db.execute(RECORD_SQL, {"entityType": entity_type, "entityNo": no})
+        except Exception as e:
+            print(f"동기화 기록 실패({entity_type} {entity_nos}): {e}")
+
+    async def record_last_insert(self, db, entity_type: str):
+        # 직전 INSERT 의 AUTO_INCREMENT 값을 그대로 기록
+        try:
+            await db.execute(RECORD_LAST_INSERT_SQL, {"entityType": entity_type})
+        except Exception as e:
+            print(f"동기화 기록 실패({entity_type}): {e}")
+
+    async def record_select(self, db, entity_type: str, select_sql: str, params: dict):
+        # 클럽명/직책명 변경처럼 여러 건에 영향을 주는 경우 대상 번호를 한 번에 기록
+        try:
+            query = text(f"INSERT INTO syncLog (entityType, entityNo) SELECT :entityType, n.no FROM ({select_sql}) n")
+            await db.execute(query, dict(params, entityType=entity_type))
+        except Exception as e:
+            print(f"동기화 기록 실패({entity_type}): {e}")
+
+    def encode_token(self, log_no: int) -> str:
+        return encode_cursor([log_no])
+
+    def decode_token(self, token: str) -> int:
+        try:
+            values = decode_cursor(token, 1)
+            return int(values[0])
+        except (HTTPException, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="잘못된 동기화 토큰입니다.")
+
+    async def changes_since(self, db, since: int):
+        result = await db.execute(CHANGES_SQL, {"since": since, "settle": SETTLE_SECONDS, "limit": SYNC_PAGE_SIZE})
+        rows = result.fetchall()
+        changed = {}
+        next_log_no = since
+        for row in rows:
+            changed.setdefault(row.entityType, set()).add(row.entityNo)
+            if row.settled:
+                next_log_no = row.logNo
+        # 아직 확정되지 않은 최근 기록은 다음 동기화 때 다시 전달됨 (기기 쪽은 키 기준으로 덮어쓰기)
+        return changed, next_log_no, len(rows) >= SYNC_PAGE_SIZE
+
+    async def settled_max(self, db) -> int:
+        return (await db.execute(SETTLED_MAX_SQL, {"settle": SETTLE_SECONDS})).scalar() or 0
+
+    async def load_scope(self, db, memberno: int):
+        # 동기화 범위: 요청한 회원의 지역/클럽/소속 써클
+        me = (await db.execute(SCOPE_SQL, {"memberno": memberno})).fetchone()
+        if me is None:
+            raise HTTPException(status_code=404, detail="회원 정보를 찾을 수 없습니다.")
+        circles = (await db.execute(SCOPE_CIRCLES_SQL, {"memberno": memberno})).fetchall()
+        return {"clubNo": me[0], "regionNo": me[1], "circleNos": [row[0] for row in circles]}
+
+    # nos 를 주면 해당 번호만 조회하고, 없거나 범위 밖이면 삭제로 전달 (다른 지역으로 옮긴 회원 등)
+    async def load_members(self, db, scope: dict, nos=None):
+        params = _scope_params(scope)
+        if nos is None:
+            query = _in(MEMBER_SQL + f" where lm.funcNo < 4 and {MEMBER_SCOPE}", "circlenos")
+            rows = (await db.execute(query, params)).fetchall()
+            return [_member_dict(row) for row in rows]
+        # 삭제된 회원은 전체 행 대신 삭제 표시(memberNo, deleted)만 내려보냄
+        query = _in(MEMBER_SQL + f" where lm.memberNo IN :nos and lm.funcNo < 4 and {MEMBER_SCOPE}", "nos", "circlenos")
+        rows = (await db.execute(query, dict(params, nos=list(nos)))).fetchall()
+        found = {row.memberNo: _member_dict(row) for row in rows}
+        return [found.get(no, {"memberNo": no, "deleted": True}) for no in nos]
+
+    async def load_business(self, db, scope: dict, nos=None):
+        params = dict(_scope_params(scope), masks=list(MASK_FIELDS))
+        if nos is None:
+            query = _in(BUSINESS_SQL + f" and {MEMBER_SCOPE}", "masks", "circlenos")
+            rows = (await db.execute(query, params)).fetchall()
+            return [dict(row._mapping, deleted=False) for row in rows]
+        query = _in(BUSINESS_SQL + f" and mb.memberNo IN :nos and {MEMBER_SCOPE}", "masks", "nos", "circlenos")
+        rows = (await db.execute(query, dict(params, nos=list(nos)))).fetchall()
+        found = {row.memberNo: dict(row._mapping, deleted=False) for row in rows}
+        return [found.get(no, {"memberNo": no, "deleted": True}) for no in nos]
+
+    async def load_entities(self, db, entity_type: str, scope: dict, nos=None):
+        table, key, scope_column, columns = ENTITY_TABLES[entity_type]
+        columns = columns.format(scope=scope_column)
+        if scope_column == "circleNo":
+            where, names, params = "circleNo IN :scope", ("scope",), {"scope": scope["circleNos"]}
+        else:
+            where, names, params = f"{scope_column} = :scope", (), {"scope": scope[scope_column]}
+        if nos is None:
+            query = _in(f"SELECT {columns} FROM {table} where {where} and attrib not like '%XXX%'", *names)
+            rows = (await db.execute(query, params)).fetchall()
+            return [_attrib_dict(row) for row in rows]
+        query = _in(f"SELECT {columns} FROM {table} where {key} IN :nos and {where}", "nos", *names)
+        rows = (await db.execute(query, dict(params, nos=list(nos)))).fetchall()
+        found = {row._mapping[key]: _attrib_dict(row) for row in rows}
+        return [found.get(no, {key: no, "deleted": True}) for no in nos]
+
+
+sync_log = SyncLog()
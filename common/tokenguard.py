@@ -0,0 +1,107 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from sqlalchemy import text
+
+
+REVOKED_TOKEN_DDL = """
+    CREATE TABLE IF NOT EXISTS revokedToken (
+        tokenHash char(64) NOT NULL PRIMARY KEY,
+        memberNo bigint NULL,
+        expiresAt bigint NOT NULL,
+        regDate timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )"""
+MEMBER_CUTOFF_DDL = """
+    CREATE TABLE IF NOT EXISTS memberTokenCutoff (
+        memberNo bigint NOT NULL PRIMARY KEY,
+        revokedBefore bigint NOT NULL,
+        regDate timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )"""
+# 다른 워커에서 등록한 폐기 내역을 반영하는 주기(초)
+REFRESH_SECONDS = 30
+
+
+def token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+# 검증된 토큰 캐시(LRU) + 폐기 목록
+# - 캐시: 토큰 해시 -> (회원번호, 만료시각, 발급시각), 만료되면 다시 검증
+# - 폐기: 토큰 단위(분실 기기) / 회원 단위(그 시각 이전에 발급된 토큰 전체)
+class TokenGuard:
+    def __init__(self, maxsize: int = 10000):
+        self._cache = OrderedDict()
+        self._maxsize = maxsize
+        self._revoked = {}
+        self._member_cutoff = {}
+
+    def lookup(self, token_h: str):
+        item = self._cache.get(token_h)
+        if item is None:
+            return None
+        memberno, exp, iat = item
+        if exp is not None and exp <= time.time():
+            self._cache.pop(token_h, None)
+            return None
+        self._cache.move_to_end(token_h)
+        return memberno, iat
+
+    def remember(self, token_h: str, memberno: str, exp, iat):
+        self._cache[token_h] = (memberno, exp, iat)
+        self._cache.move_to_end(token_h)
+        while len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+
+    def is_revoked(self, token_h: str, memberno: str, iat) -> bool:
+        if token_h in self._revoked:
+            return True
+        cutoff = self._member_cutoff.get(str(memberno))
+        # iat 가 없는 예전 토큰은 회원 단위 폐기 시 함께 폐기
+        # iat/폐기 시각 모두 초 단위이므로 폐기한 그 초에 발급된 토큰도 폐기
+        return cutoff is not None and (iat or 0) <= cutoff
+
+    async def ensure_tables(self, db):
+        await db.execute(text(REVOKED_TOKEN_DDL))
+        await db.execute(text(MEMBER_CUTOFF_DDL))
+        await db.commit()
+
+    async def load(self, db):
+        now = int(time.time())
+        rows = (await db.execute(text("SELECT tokenHash, expiresAt FROM revokedToken WHERE expiresAt > :now"),
+                                 {"now": now})).fetchall()
+        cutoffs = (await db.execute(text("SELECT memberNo, revokedBefore FROM memberTokenCutoff"))).fetchall()
+        self._revoked = {row[0]: row[1] for row in rows}
+        self._member_cutoff = {str(row[0]): row[1] for row in cutoffs}
+
+    async def revoke_token(self, db, token: str, memberno, exp):
+        token_h = token_hash(token)
+        expires_at = int(exp) if exp else int(time.time()) + 31 * 86400
+        await db.execute(text(
+            "INSERT INTO revokedToken (tokenHash, memberNo, expiresAt) VALUES (:h, :memberno, :exp) "
+            "ON DUPLICATE KEY UPDATE expiresAt = VALUES(expiresAt)"),
+            {"h": token_h, "memberno": memberno, "exp": expires_at})
+        await db.commit()
+        self._revoked[token_h] = expires_at
+        self._cache.pop(token_h, None)
+
+    async def revoke_member(self, db, memberno):
+        cutoff = int(time.time())
+        await db.execute(text(
+            "INSERT INTO memberTokenCutoff (memberNo, revokedBefore) VALUES (:memberno, :cutoff) "
+            "ON DUPLICATE KEY UPDATE revokedBefore = VALUES(revokedBefore)"),
+            {"memberno": memberno, "cutoff": cutoff})
+        await db.commit()
+        self._member_cutoff[str(memberno)] = cutoff
+
+    async def refresh_loop(self, session_factory):
+        while True:
+            await asyncio.sleep(REFRESH_SECONDS)
+            try:
+                async with session_factory() as db:
+                    await self.load(db)
+            except Exception as e:
+                print(f"토큰 폐기 목록 갱신 실패: {e}")
+
+
+token_guard = TokenGuard()
@@ -0,0 +1,190 @@
+from sqlalchemy import text
+from common.attendance import KEY_EXISTS_SQL
+
+
+# 공지 배지용 카운터
+# - noticeCounter: 지역/클럽/써클별 게시 중인 공지 수
+# - memberNoticeRead: 회원이 해당 지역/클럽/써클에서 읽은 (게시 중인) 공지 수
+# 안 읽은 수 = 게시 수 - 읽은 수
+NOTICE_COUNTER_DDL = """
+    CREATE TABLE IF NOT EXISTS noticeCounter (
+        scopeType varchar(10) NOT NULL,
+        scopeNo bigint NOT NULL,
+        total int NOT NULL DEFAULT 0,
+        PRIMARY KEY (scopeType, scopeNo)
+    )"""
+MEMBER_READ_DDL = """
+    CREATE TABLE IF NOT EXISTS memberNoticeRead (
+        memberNo bigint NOT NULL,
+        scopeType varchar(10) NOT NULL,
+        scopeNo bigint NOT NULL,
+        readCount int NOT NULL DEFAULT 0,
+        PRIMARY KEY (memberNo, scopeType, scopeNo)
+    )"""
+
+# noticeType(noticeAndswer 와 같은 값) -> (공지 테이블, 범위 컬럼)
+NOTICE_SCOPES = {
+    "REGION": ("boardMessage", "regionNo"),
+    "CLUB": ("clubboardMessage", "clubNo"),
+    "CIRCLE": ("circleboardMessage", "circleNo"),
+}
+
+# 읽음 기록은 (회원, 공지, 종류)당 한 건 - 기존 중복은 일회성 마이그레이션(migrate_keys.py)에서 합친 뒤 키 추가
+READ_KEY = "uk_notice_member"
+READ_KEY_SQL = f"ALTER TABLE noticeAndswer ADD UNIQUE KEY {READ_KEY} (memberNo, noticeNo, noticeType)"
+# 중복 그룹별로 합칠 값: 읽음은 하나라도 Y 면 Y, 참석 계획은 비어 있지 않은 값 (서로 다르면 plans > 1)
+DUP_READ_SQL = text("""
+    SELECT memberNo, noticeNo, noticeType, COUNT(*) AS cnt, MAX(readYN) AS readYN,
+           MAX(NULLIF(attendPlan, '')) AS attendPlan, COUNT(DISTINCT NULLIF(attendPlan, '')) AS plans
+    FROM noticeAndswer
+    GROUP BY memberNo, noticeNo, noticeType
+    HAVING COUNT(*) > 1
+""")
+DUP_READ_WHERE = "WHERE memberNo = :memberNo AND noticeNo = :noticeNo AND noticeType = :noticeType"
+# 키 추가 전(마이그레이션 전)에도 중복이 생기지 않도록 NOT EXISTS 조건을 함께 사용
+MARK_READ_SQL = text("""
+    INSERT IGNORE INTO noticeAndswer (memberNo, noticeNo, noticeType, readYN)
+    SELECT :memberNo, :noticeNo, :noticeType, 'Y' FROM DUAL
+    WHERE NOT EXISTS (SELECT 1 FROM noticeAndswer
+                      WHERE memberNo = :memberNo AND noticeNo = :noticeNo AND noticeType = :noticeType)
+""")
+# 여러 워커가 동시에 기동해도 재계산은 한 번만
+COUNTER_LOCK = "lions_notice_counters"
+COUNTER_LOCK_SECONDS = 120
+
+ADD_TOTAL_SQL = text(
+    "INSERT INTO noticeCounter (scopeType, scopeNo, total) VALUES (:scopeType, :scopeNo, :delta) "
+    "ON DUPLICATE KEY UPDATE total = GREATEST(total + :delta, 0)")
+ADD_READ_SQL = text(
+    "INSERT INTO memberNoticeRead (memberNo, scopeType, scopeNo, readCount) VALUES (:memberNo, :scopeType, :scopeNo, 1) "
+    "ON DUPLICATE KEY UPDATE readCount = readCount + 1")
+UNREAD_SQL = text("""
+    SELECT c.scopeType, c.scopeNo, GREATEST(c.total - COALESCE(r.readCount, 0), 0) AS unread
+    FROM noticeCounter c
+             LEFT JOIN memberNoticeRead r
+                       ON r.memberNo = :memberNo AND r.scopeType = c.scopeType AND r.scopeNo = c.scopeNo
+    WHERE (c.scopeType = 'REGION' AND c.scopeNo = :regionNo)
+       OR (c.scopeType = 'CLUB' AND c.scopeNo = :clubNo)
+       OR (c.scopeType = 'CIRCLE' AND c.scopeNo IN (SELECT circleNo FROM circleMember
+                                                     WHERE memberNo = :memberNo AND attrib NOT LIKE '%XXX%'))
+""")
+
+
+class NoticeCounters:
+    async def ensure_tables(self, db):
+        await db.execute(text(NOTICE_COUNTER_DDL))
+        await db.execute(text(MEMBER_READ_DDL))
+        # 잠금은 연결 단위이므로 해제할 때까지 커밋하지 않고 같은 연결에서 처리
+        got = (await db.execute(text("SELECT GET_LOCK(:name, :timeout)"),
+                                {"name": COUNTER_LOCK, "timeout": COUNTER_LOCK_SECONDS})).scalar()
+        if got != 1:
+            print("공지 배지 카운터 준비 잠금 대기 시간 초과 (다른 워커에서 처리 중)")
+            await db.commit()
+            return
+        try:
+            # 다른 워커가 먼저 재계산했으면 비어 있지 않으므로 건너뜀
+            empty = (await db.execute(text("SELECT COUNT(*) FROM noticeCounter"))).scalar() == 0
+            if empty:
+                await self._rebuild(db)
+        finally:
+            await db.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": COUNTER_LOCK})
+            await db.commit()
+
+    async def migrate_read_key(self, db, apply: bool):
+        # 일회성 마이그레이션(migrate_keys.py)에서만 호출 - 중복 읽음 기록을 한 건으로 합친 뒤 키 추가
+        # apply 가 아니면 정리 대상만 출력
+        if (await db.execute(KEY_EXISTS_SQL, {"table": "noticeAndswer", "key": READ_KEY})).scalar():
+            print("noticeAndswer: UNIQUE 키가 이미 있습니다")
+            return
+        groups = (await db.execute(DUP_READ_SQL)).fetchall()
+        for g in groups:
+            if g.plans > 1:
+                # 어느 응답이 나중 것인지 알 수 없으므로 큰 값을 남기고 알림
+                print(f"noticeAndswer: 회원 {g.memberNo} {g.noticeType} {g.noticeNo} 참석 계획이 서로 다름 -> {g.attendPlan}")
+        if not apply:
+            print(f"noticeAndswer: 중복 읽음 기록 {len(groups)}그룹 {sum(g.cnt - 1 for g in groups)}건 정리 예정")
+            return
+        for g in groups:
+            keys = {"memberNo": g.memberNo, "noticeNo": g.noticeNo, "noticeType": g.noticeType}
+            # 그룹의 모든 행을 합친 값으로 맞춘 뒤 한 건만 남김
+            await db.execute(text(f"UPDATE noticeAndswer SET readYN = :readYN, attendPlan = :attendPlan {DUP_READ_WHERE}"),
+                             dict(keys, readYN=g.readYN, attendPlan=g.attendPlan))
+            await db.execute(text(f"DELETE FROM noticeAndswer {DUP_READ_WHERE} LIMIT {int(g.cnt) - 1}"), keys)
+        await db.execute(text(READ_KEY_SQL))
+        await db.commit()
+        print(f"noticeAndswer: 중복 읽음 기록 {sum(g.cnt - 1 for g in groups)}건 정리 후 UNIQUE 키 추가")
+
+    async def rebuild(self, db):
+        await self._rebuild(db)
+        await db.commit()
+
+    async def _rebuild(self, db):
+        # 기존 공지/읽음 기록으로 카운터 전체 재계산
+        await db.execute(text("DELETE FROM noticeCounter"))
+        await db.execute(text("DELETE FROM memberNoticeRead"))
+        for ntype, (table, column) in NOTICE_SCOPES.items():
+            await db.execute(text(
+                f"INSERT INTO noticeCounter (scopeType, scopeNo, total) "
+                f"SELECT :ntype, {column}, COUNT(*) FROM {table} "
+                f"WHERE attrib NOT LIKE '%XXX%' AND {column} IS NOT NULL GROUP BY {column}"), {"ntype": ntype})
+            await db.execute(text(
+                f"INSERT INTO memberNoticeRead (memberNo, scopeType, scopeNo, readCount) "
+                f"SELECT na.memberNo, :ntype, m.{column}, COUNT(DISTINCT m.messageNo) FROM noticeAndswer na "
+                f"JOIN {table} m ON m.messageNo = na.noticeNo "
+                f"WHERE na.noticeType = :ntype AND m.attrib NOT LIKE '%XXX%' AND m.{column} IS NOT NULL "
+                f"GROUP BY na.memberNo, m.{column}"), {"ntype": ntype})
+        print("공지 배지 카운터 재계산 완료")
+
+    async def added(self, db, ntype: str, scope_no: int):
+        try:
+            await db.execute(ADD_TOTAL_SQL, {"scopeType": ntype, "scopeNo": scope_no, "delta": 1})
+        except Exception as e:
+            print(f"공지 카운터 갱신 실패({ntype} {scope_no}): {e}")
+
+    async def removed(self, db, ntype: str, message_no: int):
+        # 게시 상태를 바꾸기 전에 호출 (이미 삭제된 공지는 다시 차감하지 않음)
+        try:
+            table, column = NOTICE_SCOPES[ntype]
+            scope_no = (await db.execute(
+                text(f"SELECT {column} FROM {table} WHERE messageNo = :messageNo AND attrib NOT LIKE '%XXX%'"),
+                {"messageNo": message_no})).scalar()
+            if scope_no is None:
+                return
+            await db.execute(ADD_TOTAL_SQL, {"scopeType": ntype, "scopeNo": scope_no, "delta": -1})
+            await db.execute(text(
+                "UPDATE memberNoticeRead SET readCount = GREATEST(readCount - 1, 0) "
+                "WHERE scopeType = :ntype AND scopeNo = :scopeNo AND memberNo IN "
+                "(SELECT memberNo FROM noticeAndswer WHERE noticeType = :ntype AND noticeNo = :messageNo)"),
+                {"ntype": ntype, "scopeNo": scope_no, "messageNo": message_no})
+        except Exception as e:
+            print(f"공지 카운터 갱신 실패({ntype} {message_no}): {e}")
+
+    async def mark_read(self, db, member_no: int, ntype: str, message_no: int) -> bool:
+        # 읽음 기록을 한 번만 남기고 (동시 요청이어도 UNIQUE 키로 한 건), 새로 들어간 경우에만 카운터 증가
+        result = await db.execute(MARK_READ_SQL, {"memberNo": member_no, "noticeNo": message_no, "noticeType": ntype})
+        if result.rowcount != 1:
+            return False
+        await self.read(db, member_no, ntype, message_no)
+        return True
+
+    async def read(self, db, member_no: int, ntype: str, message_no: int):
+        # 처음 읽음 처리된 경우에만 호출
+        if ntype not in NOTICE_SCOPES:
+            return
+        try:
+            table, column = NOTICE_SCOPES[ntype]
+            scope_no = (await db.execute(
+                text(f"SELECT {column} FROM {table} WHERE messageNo = :messageNo AND attrib NOT LIKE '%XXX%'"),
+                {"messageNo": message_no})).scalar()
+            if scope_no is None:
+                return
+            await db.execute(ADD_READ_SQL, {"memberNo": member_no, "scopeType": ntype, "scopeNo": scope_no})
+        except Exception as e:
+            print(f"공지 카운터 갱신 실패({ntype} {message_no}): {e}")
+
+    async def unread(self, db, member_no: int, club_no, region_no):
+        rows = (await db.execute(UNREAD_SQL, {"memberNo": member_no, "clubNo": club_no, "regionNo": region_no})).fetchall()
+        return rows
+
+
+notice_counters = NoticeCounters()
@@ -1,19 +1,33 @@
 import os
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw, ImageFont, ImageOps
 import os
 import io
 import base64
 import datetime
 import asyncio
+import fcntl
+import functools
+from collections import namedtuple
 from pathlib import Path
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
+from fastapi.responses import FileResponse
 from firebase_admin import messaging
 from passlib.context import CryptContext
 from passlib.exc import UnknownHashError
 import jwt
 import dotenv
+from common.refdata import refdata
+from common.nameresolver import member_names
+from common.photomanifest import photo_manifest, variant_name, PHOTO_DIR, PHOTO_EXTS, VARIANT_KINDS, VARIANT_SIZES
+from common.imageworker import image_worker
+from common.photostore import photo_store
+from common.imageencode import fit_to_budget
+from common.slogancache import slogan_cache, CACHE_CONTROL as SLOGAN_CACHE_CONTROL
+from common.etag import etag_matches
+from common.spriteatlas import club_sprite
+from common.paging import DEFAULT_PAGE_SIZE, NULL_DATE, clamp_limit, decode_cursor, keyset_page
 
 dotenv.load_dotenv()
 
@@ -42,8 +56,10 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 # 토큰 생성 함수
 def create_access_token(data: dict):
     to_encode = data.copy()
-    expire = datetime.datetime.utcnow() + datetime.timedelta(days=30)
-    to_encode.update({"exp": expire})
+    issued = datetime.datetime.utcnow()
+    expire = issued + datetime.timedelta(days=30)
+    # iat: 회원 단위 토큰 폐기(그 시각 이전 발급분 무효화)에 사용
+    to_encode.update({"exp": expire, "iat": issued})
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -79,60 +95,223 @@ async def send_fcm_topic_notice_region(regionno: int, title: str, body: str):
     return response
 
 # 이미지 처리 함수
+# *_job 함수는 이미지 작업 프로세스(image_worker)에서 실행되므로 모듈 최상위에 두고 기본 자료형만 주고받음
+# 인코딩 형식 -> 원본 사진 확장자
+PHOTO_FORMAT_EXTS = {"PNG": "png", "JPEG": "jpg", "WEBP": "webp"}
+
+def _png_bytes(image) -> bytes:
+    buf = io.BytesIO()
+    image.save(buf, format="PNG")
+    return buf.getvalue()
+
+def thumbnail_job(image_data: bytes, save_path: str, size):
+    image = Image.open(io.BytesIO(image_data))
+    image.thumbnail(size)
+    photo_store.save(_png_bytes(image), save_path)
+    return save_path
+
+def resize_job(contents: bytes, max_bytes: int) -> bytes:
+    data, fmt, passes = fit_to_budget(contents, max_bytes)
+    return data
+
+def save_photo_job(contents: bytes, base_path: str, max_bytes: int) -> str:
+    # 용량 제한에 맞춰 인코딩한 결과를 형식에 맞는 확장자로 저장 (mphoto_{n}.jpg 등, image/png 로 잘못 제공되지 않도록)
+    # base_path 는 확장자 없는 경로, 다른 확장자로 남아 있는 이전 사진은 삭제
+    data, fmt, passes = fit_to_budget(contents, max_bytes)
+    ext = PHOTO_FORMAT_EXTS.get(fmt, "png")
+    save_path = f"{base_path}.{ext}"
+    photo_store.save(data, save_path)
+    for old_ext in PHOTO_EXTS:
+        if old_ext != ext:
+            try:
+                os.remove(f"{base_path}.{old_ext}")
+            except FileNotFoundError:
+                pass
+    print(f"사진 저장: {os.path.basename(save_path)} {fmt} {len(contents)} -> {len(data)} bytes, 인코딩 {passes}회")
+    return save_path
+
+def variants_job(source_path: str, kind: str, member_no: int, sizes) -> int:
+    # 목록/카드용 WebP 축소본 생성
+    image = ImageOps.exif_transpose(Image.open(source_path)).convert("RGB")
+    directory = os.path.dirname(source_path)
+    w, h = image.size
+    for size in sizes:
+        resized = image.resize((size, max(1, round(h * size / w))), Image.LANCZOS) if w > size else image
+        buf = io.BytesIO()
+        resized.save(buf, format="WEBP", quality=80, method=4)
+        photo_store.save(buf.getvalue(), os.path.join(directory, variant_name(kind, member_no, size)))
+    return len(sizes)
+
+def slogan_png_job(slogan: str, member_no: int, name: str, sub_members, photo_paths: dict, save_paths,
+                   width: int, height: int) -> bytes:
+    img = make_slogan_image(slogan, member_no, name, width=width, height=height, sub_members=sub_members,
+                            photo_paths=photo_paths)
+    data = _png_bytes(img)
+    # 저장소에 한 번 저장하고 캐시 파일/기존 파일명은 연결만 함
+    key = photo_store.put(data, "png")
+    for save_path in save_paths:
+        photo_store.publish(key, save_path)
+    return data
+
 async def save_thumbnail(image_data: bytes, memberno: int, size=(100, 100)):
-    def process():
-        os.makedirs(THUMBNAIL_DIR, exist_ok=True)
-        image = Image.open(io.BytesIO(image_data))
-        image.thumbnail(size)
-        thumbnail_path = os.path.join(THUMBNAIL_DIR, f"{memberno}.png")
-        image.save(thumbnail_path, format="PNG")
-        return thumbnail_path
-    return await asyncio.to_thread(process)
+    thumbnail_path = os.path.join(THUMBNAIL_DIR, f"{memberno}.png")
+    return await image_worker.run(thumbnail_job, image_data, thumbnail_path, size)
 
 async def save_ncthumbnail(image_data: bytes, memberno: int, size=(80, 100)):
-    def process():
-        os.makedirs(THUMBNAIL_DIR, exist_ok=True)
-        image = Image.open(io.BytesIO(image_data))
-        image.thumbnail(size)
-        thumbnail_path = os.path.join(THUMBNAIL_DIR, f"nc{memberno}.png")
-        image.save(thumbnail_path, format="PNG")
-        return thumbnail_path
-    return await asyncio.to_thread(process)
+    thumbnail_path = os.path.join(THUMBNAIL_DIR, f"nc{memberno}.png")
+    return await image_worker.run(thumbnail_job, image_data, thumbnail_path, size)
 
 async def save_circlelogo(image_data: bytes, circleno: int, size=(200, 200)):
-    def process():
-        os.makedirs(THUMBNAIL_DIR, exist_ok=True)
-        image = Image.open(io.BytesIO(image_data))
-        image.thumbnail(size)
-        thumbnail_path = os.path.join(THUMBNAIL_DIR, f"{circleno}circlelogo.png")
-        image.save(thumbnail_path, format="PNG")
-        return thumbnail_path
-    return await asyncio.to_thread(process)
+    thumbnail_path = os.path.join(THUMBNAIL_DIR, f"{circleno}circlelogo.png")
+    return await image_worker.run(thumbnail_job, image_data, thumbnail_path, size)
 
 async def resize_image_if_needed(contents: bytes, max_bytes: int = 51200) -> bytes:
     if len(contents) <= max_bytes:
         return contents
-    def process():
-        image = Image.open(io.BytesIO(contents))
-        format = image.format if image.format else 'JPEG'
-        quality = 85
-        for trial in range(10):
-            buffer = io.BytesIO()
-            save_kwargs = {'format': format}
-            if format.upper() in ['JPEG', 'JPG']:
-                save_kwargs['quality'] = quality
-                save_kwargs['optimize'] = True
-            image.save(buffer, **save_kwargs)
-            data = buffer.getvalue()
-            if len(data) <= max_bytes:
-                return data
-            if format.upper() in ['JPEG', 'JPG'] and quality > 30:
-                quality -= 10
-            else:
-                w, h = image.size
-                image = image.resize((int(w * 0.9), int(h * 0.9)), Image.LANCZOS)
-        return data
-    return await asyncio.to_thread(process)
+    return await image_worker.run(resize_job, contents, max_bytes)
+
+async def save_member_photo(contents: bytes, kind: str, memberno: int, max_bytes: int):
+    # 회원 사진(mphoto_/ncard_/sphoto_) 업로드 저장 후 사진 목록 갱신
+    base_path = os.path.join(THUMBNAIL_DIR, f"{kind}_{memberno}")
+    save_path = await image_worker.run(save_photo_job, contents, base_path, max_bytes)
+    if kind in VARIANT_KINDS:
+        await image_worker.run(variants_job, save_path, kind, memberno, VARIANT_SIZES)
+    photo_manifest.update(kind, memberno)
+    return save_path
+
+BACKFILL_LOCK_PATH = os.path.join(PHOTO_DIR, ".variant_backfill.lock")
+
+async def backfill_photo_variants():
+    # 축소본이 없는 기존 사진을 하나씩 생성 (업로드 요청이 우선하도록 한 번에 한 건만 처리)
+    # 끝나면 교체된 사진의 저장소 파일 정리
+    # 워커마다 기동 시 호출되므로 파일 잠금을 얻은 워커 하나만 실행하고 나머지는 건너뜀
+    os.makedirs(PHOTO_DIR, exist_ok=True)
+    lock_file = open(BACKFILL_LOCK_PATH, "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return
+    try:
+        # 앞서 실행한 워커가 만든 축소본을 반영한 뒤 빠진 것만 처리
+        await asyncio.to_thread(photo_manifest.scan, False)
+        done = 0
+        for kind, memberno in photo_manifest.missing_variants():
+            source_path = photo_manifest.path(kind, memberno)
+            if not source_path:
+                continue
+            try:
+                await image_worker.run(variants_job, source_path, kind, memberno, VARIANT_SIZES)
+                photo_manifest.update(kind, memberno)
+                done += 1
+            except Exception as e:
+                print(f"사진 축소본 생성 실패({kind}_{memberno}): {e}")
+        if done:
+            print(f"사진 축소본 생성 완료: {done}건")
+        # 교체되어 더 이상 게시되지 않는 사진 저장소 파일 정리 (같은 잠금으로 한 워커에서만)
+        removed = await asyncio.to_thread(photo_store.collect_garbage)
+        if removed:
+            print(f"사진 저장소 정리: {removed}개 삭제")
+    finally:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        lock_file.close()
+
+def photo_variant_url(memberno: int, size: int = 128):
+    # 템플릿/API 용: 표시 크기에 맞는 축소본 주소 (사진이 없으면 기존 경로로 두어 화면의 대체 이미지 처리를 따름)
+    return photo_manifest.variant_url("mphoto", memberno, size) or f"/static/img/members/mphoto_{memberno}.png"
+
+def photo_srcset(memberno: int) -> str:
+    return photo_manifest.srcset("mphoto", memberno)
+
+async def render_slogan_png(slogan: str, member_no: int, name: str, sub_members, save_paths,
+                            width=400, height=520) -> bytes:
+    # 작업 프로세스에는 사진 목록이 없으므로 사진 경로는 여기서 찾아서 넘김
+    photo_paths = {}
+    for m_no in [member_no] + [sub_no for sub_no, _ in sub_members]:
+        path = photo_manifest.path("mphoto", m_no)
+        if path:
+            photo_paths[m_no] = path
+    return await image_worker.run(slogan_png_job, slogan, member_no, name, list(sub_members), photo_paths,
+                                  list(save_paths), width, height)
+
+async def club_slogan_inputs(clubno: int, db: AsyncSession):
+    staff = await get_clubstaffwithname(clubno, db)
+    slogan = staff[1] if staff else "No Slogan"
+    memberno = staff[2] if staff else 0
+    name = staff[3]+"L" if staff else "No Name"
+    sub1 = staff[4] if staff else 0
+    sub1n = staff[5]+"L" if staff else "No Name"
+    sub2 = staff[6] if staff else 0
+    sub2n = staff[7]+"L" if staff else "No Name"
+    return slogan, memberno, name, [(sub1, sub1n), (sub2, sub2n)]
+
+async def circle_slogan_inputs(circleno: int, db: AsyncSession):
+    staff = await get_circlestaffwithname(circleno, db)
+    slogan = staff[1] if staff else "No Slogan"
+    memberno = staff[3] if staff else 0
+    name = str(staff[4]) + "L" if staff and len(staff) > 3 and staff[3] is not None else "No Name"
+    sub1 = staff[5] if staff and len(staff) > 4 else 0
+    sub1n = str(staff[6]) + "L" if staff and len(staff) > 5 and staff[5] is not None else "No Name"
+    sub2 = staff[7] if staff and len(staff) > 6 else 0
+    sub2n = str(staff[8]) + "L" if staff and len(staff) > 7 and staff[7] is not None else "No Name"
+    return slogan, memberno, name, [(sub1, sub1n), (sub2, sub2n)]
+
+# 슬로건 카드 종류별 입력 조회 함수와 기존 저장 파일명 (다른 화면에서 쓰는 파일이라 계속 갱신)
+SLOGAN_KINDS = {
+    "club": (club_slogan_inputs, "{no}logo.png"),
+    "circle": (circle_slogan_inputs, "{no}circlelogo.png"),
+}
+
+async def slogan_card(kind: str, no: int, db: AsyncSession, width=400, height=520):
+    # 반환: (캐시 키, 캐시 파일 경로 또는 None, 새로 그린 PNG 또는 None)
+    load_inputs, legacy_name = SLOGAN_KINDS[kind]
+    slogan, memberno, name, sub_members = await load_inputs(no, db)
+    key = slogan_cache.key(slogan, memberno, name, sub_members, width, height)
+    legacy_path = os.path.join(THUMBNAIL_DIR, legacy_name.format(no=no))
+
+    async def render(cache_path):
+        return await render_slogan_png(slogan, memberno, name, sub_members, (cache_path, legacy_path),
+                                       width=width, height=height)
+    path, png = await slogan_cache.get_or_render(kind, no, key, render)
+    return key, path, png
+
+async def prerender_slogan_card(session_factory, kind: str, no: int) -> bool:
+    # 새로 그렸으면 True, 이미 캐시에 있으면 False
+    async with session_factory() as db:
+        key, path, png = await slogan_card(kind, no, db)
+    return path is None
+
+async def prerender_all_slogans(session_factory, concurrency: int = None):
+    # 배포/폰트 변경 후 전체 클럽/써클 슬로건 카드를 이미지 작업 프로세스 수만큼 병렬로 생성
+    async with session_factory() as db:
+        clubs = (await db.execute(text("SELECT DISTINCT clubNo FROM lionsClubstaff WHERE attrib NOT LIKE :attrxx"),
+                                  {"attrxx": "%XXX%"})).fetchall()
+        circles = (await db.execute(text("SELECT DISTINCT circleNo FROM lionsCirclestaff WHERE attrib NOT LIKE :attrxx"),
+                                    {"attrxx": "%XXX%"})).fetchall()
+    jobs = [("club", row[0]) for row in clubs] + [("circle", row[0]) for row in circles]
+    slots = asyncio.Semaphore(concurrency or image_worker.workers)
+
+    async def one(kind, no):
+        async with slots:
+            try:
+                return await prerender_slogan_card(session_factory, kind, no)
+            except Exception as e:
+                print(f"슬로건 카드 미리 그리기 실패({kind} {no}): {e}")
+                return None
+    results = await asyncio.gather(*(one(kind, no) for kind, no in jobs))
+    summary = {"total": len(jobs), "rendered": sum(1 for r in results if r),
+               "cached": sum(1 for r in results if r is False), "failed": sum(1 for r in results if r is None)}
+    print(f"슬로건 카드 미리 그리기 완료: {summary}")
+    return summary
+
+async def slogan_card_response(request, kind: str, no: int, db: AsyncSession):
+    key, path, png = await slogan_card(kind, no, db)
+    headers = {"ETag": slogan_cache.etag(key), "Cache-Control": SLOGAN_CACHE_CONTROL}
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if path:
+        return FileResponse(path, media_type="image/png", headers=headers)
+    return Response(content=png, media_type="image/png", headers=headers)
 
 def get_default_image_base64(mime_type: str = "image/png") -> str:
     default_image_path = "static/img/defaultphoto.png"
@@ -168,8 +347,30 @@ def split_text_to_multiline(draw, text, font, max_width):
 from PIL import Image, ImageDraw, ImageFont
 
 
+# 📝 폰트 설정 (윈도우 맑은고딕 추가)
+SLOGAN_FONT_PATHS = [
+    "malgunbd.ttf",  # 윈도우 맑은 고딕 볼드
+    "malgun.ttf",  # 윈도우 맑은 고딕
+    "NanumGothicBold.ttf",
+    "NanumGothic.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "AppleGothic.ttf"
+]
+
+
+@functools.lru_cache(maxsize=8)
+def _slogan_fonts(font_size: int):
+    # 폰트 탐색은 이미지 작업 프로세스마다 한 번만
+    for path in SLOGAN_FONT_PATHS:
+        try:
+            return ImageFont.truetype(path, font_size), ImageFont.truetype(path, 16)
+        except IOError:
+            continue
+    return ImageFont.load_default(), ImageFont.load_default()
+
+
 def make_slogan_image(slogan: str, member_no: int, name: str, width=400, height=520, font_size=22,
-                      sub_members=[(2, "서브1"), (3, "서브2")]) -> Image.Image:
+                      sub_members=[(2, "서브1"), (3, "서브2")], photo_paths=None) -> Image.Image:
     # 🎨 라이온스클럽 상징 컬러
     LIONS_BLUE = "#00338D"
     LIONS_GOLD = "#F2A900"
@@ -178,29 +379,7 @@ def make_slogan_image(slogan: str, member_no: int, name: str, width=400, height=
     img = Image.new("RGB", (width, height), color=BG_COLOR)
     draw = ImageDraw.Draw(img)
 
-    # 📝 폰트 설정 (윈도우 맑은고딕 추가)
-    font_paths = [
-        "malgunbd.ttf",  # 윈도우 맑은 고딕 볼드
-        "malgun.ttf",  # 윈도우 맑은 고딕
-        "NanumGothicBold.ttf",
-        "NanumGothic.ttf",
-        "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
-        "AppleGothic.ttf"
-    ]
-
-    font = None
-    name_font = None
-    for path in font_paths:
-        try:
-            font = ImageFont.truetype(path, font_size)
-            name_font = ImageFont.truetype(path, 16)
-            break
-        except IOError:
-            continue
-
-    if font is None:
-        font = ImageFont.load_default()
-        name_font = ImageFont.load_default()
+    font, name_font = _slogan_fonts(font_size)
 
     # 1. 상단 헤더 영역
     header_height = 110
@@ -249,13 +428,16 @@ def make_slogan_image(slogan: str, member_no: int, name: str, width=400, height=
         photo_y = cy
 
         profile_img = None
-        # mphoto_{m_no}.jpg 또는 png 확인
-        for ext in ["jpg", "png"]:
+        # mphoto_{m_no}.png/jpg/webp 확인 (넘겨받은 경로가 없으면 사진 목록에서 조회)
+        if photo_paths is not None:
+            photo_path = photo_paths.get(m_no)
+        else:
+            photo_path = photo_manifest.path("mphoto", m_no)
+        if photo_path:
             try:
-                profile_img = Image.open(f"./static/img/members/mphoto_{m_no}.{ext}").convert("RGBA")
-                break
+                profile_img = Image.open(photo_path).convert("RGBA")
             except Exception:
-                continue
+                profile_img = None
 
         if profile_img:
             profile_img = profile_img.resize((img_w, img_h))
@@ -316,7 +498,7 @@ def row_to_dict(row):
     return d
 
 # 데이터베이스 조회 함수들
-async def get_clublist(db: AsyncSession):
+async def _load_clublist(db: AsyncSession):
     try:
         query = text("SELECT * FROM lionsClub where attrib not like :attpatt")
         result = await db.execute(query, {"attpatt": "%XXX%"})
@@ -324,7 +506,7 @@ async def get_clublist(db: AsyncSession):
     except Exception:
         raise HTTPException(status_code=500, detail="Database query failed(CLUBLIST)")
 
-async def get_circlelist(db: AsyncSession):
+async def _load_circlelist(db: AsyncSession):
     try:
         query = text("SELECT * FROM lionsCircle where circleType not in (:vtoc) and attrib not like :attpatt")
         result = await db.execute(query, {"attpatt": "%XXX%", "vtoc": 'VOTEC'})
@@ -342,22 +524,13 @@ async def get_clubboards(clubno: int, db: AsyncSession):
 
 
 async def get_photo(memberno: int, db: AsyncSession):
-    path = f"./static/img/members/mphoto_{memberno}.png"
-    if os.path.exists(path):
-        return f"/static/img/members/mphoto_{memberno}.png"
-    return None
+    return photo_manifest.url("mphoto", memberno)
 
 async def get_namecard(memberno: int, db: AsyncSession):
-    path = f"./static/img/members/ncard_{memberno}.png"
-    if os.path.exists(path):
-        return f"/static/img/members/ncard_{memberno}.png"
-    return None
+    return photo_manifest.url("ncard", memberno)
 
 async def get_spphoto(memberno: int, db: AsyncSession):
-    path = f"./static/img/members/sphoto_{memberno}.png"
-    if os.path.exists(path):
-        return f"/static/img/members/sphoto_{memberno}.png"
-    return None
+    return photo_manifest.url("sphoto", memberno)
 
 
 async def get_regionclublist(region: int, db: AsyncSession):
@@ -421,6 +594,26 @@ async def get_memberlist(db: AsyncSession):
     except Exception:
         raise HTTPException(status_code=500, detail="Database query failed(MEMBERLIST)")
 
+async def get_memberlist_page(db: AsyncSession, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    # (memberJoindate, memberNo) 키셋 페이지 조회, (행 목록, 다음 커서) 반환
+    after = decode_cursor(cursor, 2)
+    try:
+        size = clamp_limit(limit)
+        params = {"nulldate": NULL_DATE, "limit": size + 1}
+        where = ""
+        if after:
+            where = "where (COALESCE(lm.memberJoindate, :nulldate), lm.memberNo) > (:k0, :k1) "
+            params.update({"k0": after[0], "k1": after[1]})
+        query = text(
+            "SELECT lm.memberNo, lm.memberName, lcc.clubName, lr.rankTitlekor, COALESCE(lm.memberJoindate, :nulldate) as joinKey "
+            "FROM lionsMember lm left join lionsClub lcc on lm.clubNo = lcc.clubNo "
+            "left join lionsRank lr on lm.rankNo = lr.rankNo " + where +
+            "order by joinKey, lm.memberNo limit :limit")
+        result = await db.execute(query, params)
+        return keyset_page(result.fetchall(), size, lambda row: (row[4], row[0]))
+    except Exception:
+        raise HTTPException(status_code=500, detail="Database query failed(MEMBERLIST)")
+
 async def get_rankmemberlist(rankno: int, db: AsyncSession):
     try:
         query = text("SELECT * FROM lionsMember where rankNo = :rankno")
@@ -467,12 +660,20 @@ async def get_clubmembercard(clubno: int, db: AsyncSession):
                 "memberEmail": row.memberEmail,
                 "memberMF": row.memberMF,
                 "rankTitle": row.rankTitlekor,
+                "photoUrl": photo_variant_url(row.memberNo, 128),
+                "photoSrcset": photo_srcset(row.memberNo),
             }
             for row in member_list
         ]
-        return {"members": member}
     except Exception:
         raise HTTPException(status_code=500, detail="Database query failed(CLUBMemberCards)")
+    # 카드 화면은 클럽 사진 스프라이트 한 장으로 표시 (실패하면 회원별 사진으로 표시)
+    try:
+        sprite = await club_sprite.get(clubno, [m["memberNo"] for m in member])
+    except Exception as e:
+        print(f"클럽 {clubno} 사진 스프라이트 생성 실패: {e}")
+        sprite = None
+    return {"members": member, "sprite": sprite}
 
 async def get_clubmemberlist(clubno: int, db: AsyncSession):
     try:
@@ -501,7 +702,7 @@ async def get_clubdoc(docno: int, db: AsyncSession):
     except Exception:
         raise HTTPException(status_code=500, detail="Database query failed(CLUBDoc)")
 
-async def get_regionlist(db: AsyncSession):
+async def _load_regionlist(db: AsyncSession):
     try:
         query = text(
             "SELECT lr.*, GROUP_CONCAT(lc.clubName SEPARATOR ', ') AS clubNames, lm.memberName FROM lionsaddr.lionsRegion lr "
@@ -521,32 +722,34 @@ async def get_clubstaff(clubno: int, db: AsyncSession):
     except Exception:
         raise HTTPException(status_code=500, detail="Database query failed(CLUBSTAFF)")
 
+# 임원 직책 컬럼 (번호 컬럼, 이름 필드) - 기존 9중 self-join 결과와 같은 순서
+STAFF_POSITIONS = (
+    ("presidentNo", "presidentName"), ("secretNo", "secretName"), ("trNo", "trName"),
+    ("ltNo", "ltName"), ("ttNo", "ttName"), ("prpresidentNo", "prpresidentName"),
+    ("firstViceNo", "firstViceName"), ("secondViceNo", "secondViceName"), ("thirdViceNo", "thirdViceName"),
+)
+STAFF_FIELDS = [field for pair in STAFF_POSITIONS for field in pair]
+ClubStaffRow = namedtuple("ClubStaffRow", ["logPeriod", "slog"] + STAFF_FIELDS)
+CircleStaffRow = namedtuple("CircleStaffRow", ["logPeriod", "slog", "circleName"] + STAFF_FIELDS)
+
+async def _with_staff_names(row, row_type, db: AsyncSession):
+    # 임원 번호를 모아 회원명 조회기로 한 번에 이름을 채움 (없으면 '공석')
+    if row is None:
+        return None
+    d = row._mapping
+    names = await member_names.resolve(db, [d[no_col] for no_col, _ in STAFF_POSITIONS])
+    values = {key: d[key] for key in row_type._fields if key in d}
+    for no_col, name_field in STAFF_POSITIONS:
+        values[name_field] = member_names.name_of(names, d[no_col], "공석")
+    return row_type(**values)
+
 async def get_clubstaffwithname(clubno: int, db: AsyncSession):
     try:
         query = text(
-            "SELECT s.logPeriod, s.slog, "
-            "s.presidentNo, COALESCE(pm.memberName, '공석') AS presidentName, "
-            "s.secretNo, COALESCE(sm.memberName, '공석') AS secretName, "
-            "s.trNo, COALESCE(tm.memberName, '공석') AS trName, "
-            "s.ltNo, COALESCE(ltm.memberName, '공석') AS ltName, "
-            "s.ttNo, COALESCE(ttm.memberName, '공석') AS ttName, "
-            "s.prpresidentNo, COALESCE(prm.memberName, '공석') AS prpresidentName, "
-            "s.firstViceNo, COALESCE(fvm.memberName, '공석') AS firstViceName, "
-            "s.secondViceNo, COALESCE(svm.memberName, '공석') AS secondViceName, "
-            "s.thirdViceNo, COALESCE(tvm.memberName, '공석') AS thirdViceName "
-            "FROM lionsClubstaff s "
-            "LEFT JOIN lionsMember pm ON s.presidentNo = pm.memberNo "
-            "LEFT JOIN lionsMember sm ON s.secretNo = sm.memberNo "
-            "LEFT JOIN lionsMember tm ON s.trNo = tm.memberNo "
-            "LEFT JOIN lionsMember ltm ON s.ltNo = ltm.memberNo "
-            "LEFT JOIN lionsMember ttm ON s.ttNo = ttm.memberNo "
-            "LEFT JOIN lionsMember prm ON s.prpresidentNo = prm.memberNo "
-            "LEFT JOIN lionsMember fvm ON s.firstViceNo = fvm.memberNo "
-            "LEFT JOIN lionsMember svm ON s.secondViceNo = svm.memberNo "
-            "LEFT JOIN lionsMember tvm ON s.thirdViceNo = tvm.memberNo "
-            "WHERE s.clubNo = :clubno and s.attrib not like :attrxx")
+            "SELECT s.logPeriod, s.slog, " + ", ".join(f"s.{no_col}" for no_col, _ in STAFF_POSITIONS) + " "
+            "FROM lionsClubstaff s WHERE s.clubNo = :clubno and s.attrib not like :attrxx")
         result = await db.execute(query, {"clubno": clubno, "attrxx": '%XXX%'})
-        return result.fetchone()
+        return await _with_staff_names(result.fetchone(), ClubStaffRow, db)
     except Exception:
         raise HTTPException(status_code=500, detail="Database query failed(CLUBSTAFFWNAME)")
 
@@ -554,35 +757,15 @@ async def get_clubstaffwithname(clubno: int, db: AsyncSession):
 async def get_circlestaffwithname(circleno: int, db: AsyncSession):
     try:
         query = text(
-            "SELECT s.logPeriod, s.slog, "
-            "c.circleName AS circleName, "
-            "s.presidentNo, COALESCE(pm.memberName, '공석') AS presidentName, "
-            "s.secretNo, COALESCE(sm.memberName, '공석') AS secretName, "
-            "s.trNo, COALESCE(tm.memberName, '공석') AS trName, "
-            "s.ltNo, COALESCE(ltm.memberName, '공석') AS ltName, "
-            "s.ttNo, COALESCE(ttm.memberName, '공석') AS ttName, "
-            "s.prpresidentNo, COALESCE(prm.memberName, '공석') AS prpresidentName, "
-            "s.firstViceNo, COALESCE(fvm.memberName, '공석') AS firstViceName, "
-            "s.secondViceNo, COALESCE(svm.memberName, '공석') AS secondViceName, "
-            "s.thirdViceNo, COALESCE(tvm.memberName, '공석') AS thirdViceName "
-            "FROM lionsCirclestaff s "
-            "LEFT JOIN lionsMember pm ON s.presidentNo = pm.memberNo "
-            "LEFT JOIN lionsMember sm ON s.secretNo = sm.memberNo "
-            "LEFT JOIN lionsMember tm ON s.trNo = tm.memberNo "
-            "LEFT JOIN lionsMember ltm ON s.ltNo = ltm.memberNo "
-            "LEFT JOIN lionsMember ttm ON s.ttNo = ttm.memberNo "
-            "LEFT JOIN lionsMember prm ON s.prpresidentNo = prm.memberNo "
-            "LEFT JOIN lionsMember fvm ON s.firstViceNo = fvm.memberNo "
-            "LEFT JOIN lionsMember svm ON s.secondViceNo = svm.memberNo "
-            "LEFT JOIN lionsMember tvm ON s.thirdViceNo = tvm.memberNo "
-            "LEFT JOIN lionsCircle c ON s.circleNo = c.circleNo "
+            "SELECT s.logPeriod, s.slog, c.circleName AS circleName, " + ", ".join(f"s.{no_col}" for no_col, _ in STAFF_POSITIONS) + " "
+            "FROM lionsCirclestaff s LEFT JOIN lionsCircle c ON s.circleNo = c.circleNo "
             "WHERE s.circleNo = :circleno and s.attrib not like :attrxx")
         result = await db.execute(query, {"circleno": circleno, "attrxx": '%XXX%'})
-        return result.fetchone()
+        return await _with_staff_names(result.fetchone(), CircleStaffRow, db)
     except Exception:
         raise HTTPException(status_code=500, detail="Database query failed(CIRCLESTAFFWNAME)")
 
-async def get_ranklist(db: AsyncSession):
+async def _load_ranklist(db: AsyncSession):
     try:
         query = text("SELECT * FROM lionsRank where attrib not like :attpatt and rankDiv in ('CLUB','DIST') order by orderNo")
         result = await db.execute(query, {"attpatt": "%XXX%"})
@@ -590,7 +773,7 @@ async def get_ranklist(db: AsyncSession):
     except Exception:
         raise HTTPException(status_code=500, detail="Database query failed(RANK)")
 
-async def get_ranklistall(db: AsyncSession):
+async def _load_ranklistall(db: AsyncSession):
     try:
         query = text("SELECT * FROM lionsRank where attrib not like :attpatt order by orderNo")
         result = await db.execute(query, {"attpatt": "%XXX%"})
@@ -598,7 +781,7 @@ async def get_ranklistall(db: AsyncSession):
     except Exception:
         raise HTTPException(status_code=500, detail="Database query failed(RANK)")
 
-async def get_ranklistcircle(db: AsyncSession):
+async def _load_ranklistcircle(db: AsyncSession):
     try:
         query = text("SELECT * FROM lionsRank where attrib not like :attpatt and rankDiv in ('CIRC') order by orderNo")
         result = await db.execute(query, {"attpatt": "%XXX%"})
@@ -637,4 +820,32 @@ async def get_requests(db: AsyncSession):
         result = await db.execute(query, {"attxxx": '%XXX%'})
         return result.fetchall()
     except Exception:
-        raise HTTPException(status_code=500, detail="Database query failed(REQUEST)")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Database query failed(REQUEST)")
+
+
+# 기준정보(직책/클럽/써클/지역)는 메모리 저장소에서 제공, 변경 시 refdata.refresh 로 갱신
+# 다른 워커의 변경은 뒤에 적은 테이블의 버전(table_versions.bump)으로 확인
+refdata.register("clublist", _load_clublist, "lionsClub")
+refdata.register("circlelist", _load_circlelist, "lionsCircle")
+refdata.register("regionlist", _load_regionlist, "lionsRegion", "lionsClub", "lionsMember")
+refdata.register("ranklist", _load_ranklist, "lionsRank")
+refdata.register("ranklistall", _load_ranklistall, "lionsRank")
+refdata.register("ranklistcircle", _load_ranklistcircle, "lionsRank")
+
+async def get_clublist(db: AsyncSession):
+    return await refdata.get("clublist", db)
+
+async def get_circlelist(db: AsyncSession):
+    return await refdata.get("circlelist", db)
+
+async def get_regionlist(db: AsyncSession):
+    return await refdata.get("regionlist", db)
+
+async def get_ranklist(db: AsyncSession):
+    return await refdata.get("ranklist", db)
+
+async def get_ranklistall(db: AsyncSession):
+    return await refdata.get("ranklistall", db)
+
+async def get_ranklistcircle(db: AsyncSession):
+    return await refdata.get("ranklistcircle", db)
@@ -3,30 +3,36 @@ from fastapi import FastAPI, Depends, Request, Form, Response, HTTPException, Fi
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 import firebase_admin
 from firebase_admin import credentials
 from funchub import *
-from PIL import Image
+from common.searchindex import member_index
+from common.pageloader import PageLoader
+import asyncio
 import io
 import os
 
 
 dotenv.load_dotenv()
-DATABASE_URL = os.getenv("dburl")
-engine = create_async_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    pool_timeout=10,
-    pool_recycle=1800)
-
-async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+# 엔진/커넥션 풀은 common.dbconn 에서 단일 구성 (DB_POOL_SIZE 등 환경변수로 조정)
+from common.dbconn import engine, async_session, get_pool_status, session_factory_for, write_tracker
+from common.etag import table_versions
+from common.synclog import sync_log
+from common.jsonresp import FastJSONResponse
+from common.compression import CompressionMiddleware
+from common.photomanifest import photo_manifest
+from common.photostore import photo_store
+from common.tokenguard import token_guard, token_hash
+from common.unreadcounter import notice_counters
+from common.imageworker import image_worker
+from common.slogancache import slogan_queue
+from common.staticfiles import PrecompressedStaticFiles, asset_manifest, asset_url
+page_loader = PageLoader(async_session)
 
 app = FastAPI()
 
@@ -38,9 +44,28 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 큰 JSON/HTML 응답 압축 (brotli 가 있으면 우선, 없으면 gzip)
+app.add_middleware(CompressionMiddleware)
+
+
+# 모바일 앱의 쓰기 요청을 기록해 직후의 조회는 기본 DB 에서 읽도록 함 (read-your-writes)
+@app.middleware("http")
+async def track_mobile_writes(request: Request, call_next):
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and request.url.path.startswith("/phapp"):
+        write_tracker.mark(request.headers.get("authorization"))
+    return response
+
+
 templates = Jinja2Templates(directory="templates")
-app.mount("/static", StaticFiles(directory="static"), name="static")
-app.mount("/thumbnails", StaticFiles(directory="static/img/members/"), name="thumbnails")
+# 회원 사진 축소본 주소/srcset
+templates.env.globals["photo_variant_url"] = photo_variant_url
+templates.env.globals["photo_srcset"] = photo_srcset
+# 해시 파일명/버전 주소는 immutable 캐시, 미리 압축한 .br/.gz 우선 전송 (build_static.py)
+app.mount("/static", PrecompressedStaticFiles(directory="static"), name="static")
+app.mount("/thumbnails", PrecompressedStaticFiles(directory="static/img/members/"), name="thumbnails")
+asset_manifest.load()
+templates.env.globals["asset_url"] = asset_url
 MEMBERPHOTO_DIR = "./static/img/members"
 BASE_DIR = Path(__file__).resolve().parent
 cred = credentials.Certificate(
@@ -56,26 +81,180 @@ security = HTTPBearer()
 
 
 # 토큰 검증 함수 (API 호출 시마다 실행됨)
-async def get_current_mobile_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
+def decode_mobile_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
-        memberno: str = payload.get("sub")
-        if memberno is None:
-            raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다.")
-        return memberno
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="토큰이 만료되었습니다. 다시 로그인해주세요.")
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="잘못된 토큰입니다.")
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다.")
+    return payload
+
+
+async def get_current_mobile_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    token_h = token_hash(token)
+    # 한 번 검증한 토큰은 만료 전까지 캐시에서 바로 확인 (jwt.decode 생략)
+    cached = token_guard.lookup(token_h)
+    if cached is None:
+        payload = decode_mobile_token(token)
+        cached = (payload["sub"], payload.get("iat"))
+        token_guard.remember(token_h, payload["sub"], payload.get("exp"), payload.get("iat"))
+    memberno, iat = cached
+    if token_guard.is_revoked(token_h, memberno, iat):
+        raise HTTPException(status_code=401, detail="사용이 중지된 토큰입니다. 다시 로그인해주세요.")
+    return memberno
 
 
 # 데이터베이스 세션 생성
-async def get_db():
-    async with async_session() as session:
+async def get_db(request: Request):
+    # /phapp GET 조회는 읽기 복제본으로, 그 외 요청은 기본 DB 로 연결
+    factory = session_factory_for(request.method, request.url.path, request.headers.get("authorization"))
+    async with factory() as session:
         yield session
 
 
+# 기동 시 기준정보(직책/클럽/써클/지역) 메모리 적재
+@app.on_event("startup")
+async def preload_refdata():
+    try:
+        async with async_session() as session:
+            await refdata.load_all(session)
+    except Exception as e:
+        print(f"기준정보 적재 실패: {e}")
+
+
+# 기동 시 모바일 회원 검색 색인 적재
+@app.on_event("startup")
+async def preload_search_index():
+    try:
+        async with async_session() as session:
+            await member_index.ensure_loaded(session)
+    except Exception as e:
+        print(f"회원 검색 색인 적재 실패: {e}")
+
+
+# 기동 시 회원 사진 목록 적재
+@app.on_event("startup")
+async def preload_photo_manifest():
+    try:
+        await asyncio.to_thread(photo_manifest.scan)
+        # 축소본이 없는 기존 사진은 백그라운드에서 생성
+        app.state.photo_backfill = asyncio.create_task(backfill_photo_variants())
+    except Exception as e:
+        print(f"회원 사진 목록 적재 실패: {e}")
+
+
+# 기동 시 토큰 폐기 목록 적재 및 주기적 갱신 시작
+@app.on_event("startup")
+async def preload_token_guard():
+    try:
+        async with async_session() as session:
+            await token_guard.ensure_tables(session)
+            await token_guard.load(session)
+    except Exception as e:
+        print(f"토큰 폐기 목록 적재 실패: {e}")
+    app.state.token_refresh = asyncio.create_task(token_guard.refresh_loop(async_session))
+
+
+@app.on_event("shutdown")
+async def stop_token_guard():
+    task = getattr(app.state, "token_refresh", None)
+    if task:
+        task.cancel()
+
+
+# 기동 시 공지 배지 카운터 테이블 준비 (처음 만들 때는 기존 공지로 재계산)
+@app.on_event("startup")
+async def prepare_notice_counters():
+    try:
+        async with async_session() as session:
+            await notice_counters.ensure_tables(session)
+    except Exception as e:
+        print(f"공지 배지 카운터 준비 실패: {e}")
+
+
+# 기동 시 ETag 용 테이블 버전 관리 테이블 준비
+@app.on_event("startup")
+async def prepare_table_versions():
+    try:
+        async with async_session() as session:
+            await table_versions.ensure_table(session)
+    except Exception as e:
+        print(f"테이블 버전 테이블 준비 실패: {e}")
+
+
+# 기동 시 모바일 증분 동기화용 변경 기록 테이블 준비
+@app.on_event("startup")
+async def prepare_sync_log():
+    try:
+        async with async_session() as session:
+            await sync_log.ensure_table(session)
+    except Exception as e:
+        print(f"동기화 기록 테이블 준비 실패: {e}")
+
+
+# 이미지 처리 프로세스 풀 시작/종료
+@app.on_event("startup")
+async def start_image_worker():
+    try:
+        image_worker.start()
+    except Exception as e:
+        print(f"이미지 작업 프로세스 시작 실패: {e}")
+
+
+# 임원 변경 후 슬로건 카드 미리 그리기 대기열 시작
+@app.on_event("startup")
+async def start_slogan_queue():
+    app.state.slogan_queue = asyncio.create_task(
+        slogan_queue.run(lambda kind, no: prerender_slogan_card(async_session, kind, no)))
+
+
+@app.on_event("shutdown")
+async def stop_image_worker():
+    for name in ("photo_backfill", "slogan_queue", "slogan_prerender"):
+        task = getattr(app.state, name, None)
+        if task:
+            task.cancel()
+    image_worker.shutdown()
+
+
+@app.get("/poolstatus", response_class=JSONResponse)
+async def poolstatus(request: Request):
+    if not request.session.get("user_No"):
+        raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
+    if request.session.get("user_Role") != "ADMIN":
+        raise HTTPException(status_code=403, detail="관리자만 조회할 수 있습니다.")
+    return JSONResponse({**get_pool_status(), "image": image_worker.status()})
+
+
+# 분실 기기 등: 해당 회원에게 지금까지 발급된 모바일 토큰을 모두 사용 중지
+@app.post("/revoketokens/{memberno}", response_class=JSONResponse)
+async def revoketokens(request: Request, memberno: int, db: AsyncSession = Depends(get_db)):
+    if not request.session.get("user_No"):
+        raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
+    if request.session.get("user_Role") != "ADMIN":
+        raise HTTPException(status_code=403, detail="관리자만 실행할 수 있습니다.")
+    await token_guard.revoke_member(db, memberno)
+    return JSONResponse({"result": "ok", "memberNo": memberno})
+
+
+# 전체 클럽/써클 슬로건 카드 미리 그리기 (배포/폰트 변경 후 관리자 실행)
+@app.post("/prerenderslogans", response_class=JSONResponse)
+async def prerenderslogans(request: Request):
+    if not request.session.get("user_No"):
+        raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
+    if request.session.get("user_Role") != "ADMIN":
+        raise HTTPException(status_code=403, detail="관리자만 실행할 수 있습니다.")
+    task = getattr(app.state, "slogan_prerender", None)
+    if task and not task.done():
+        return JSONResponse({"result": "running"})
+    app.state.slogan_prerender = asyncio.create_task(prerender_all_slogans(async_session))
+    return JSONResponse({"result": "started"})
+
+
 @app.get("/favicon.ico")
 async def favicon():
     return {"detail": "Favicon is served at /static/favicon.ico"}
@@ -87,6 +266,7 @@ async def upload_doc(request: Request, clubno: int, file: UploadFile = File(...)
         contents = await file.read()
         query = text("INSERT INTO lionsDoc (clubNo,cDocument) VALUES (:memno, :docs)")
         result = await db.execute(query, {"memno": clubno, "docs": contents})
+        await table_versions.bump(db, "lionsDoc")
         await db.commit()
         return RedirectResponse(f"/doclist/{clubno}", status_code=303)
     except Exception as e:
@@ -102,12 +282,10 @@ async def upload_image(request: Request, memberno: int, file: UploadFile = File(
         contents = await file.read()
 
         # 102400(100KB) -> 51200(50KB)로 변경
-        contents = await resize_image_if_needed(contents, max_bytes=51200)
-
-        os.makedirs(MEMBERPHOTO_DIR, exist_ok=True)
-        image = Image.open(io.BytesIO(contents))
-        thumbnail_path = os.path.join(MEMBERPHOTO_DIR, f"mphoto_{memberno}.png")
-        image.save(thumbnail_path, format="PNG")
+        await save_member_photo(contents, "mphoto", memberno, max_bytes=51200)
+        # 모바일 회원 목록의 사진 주소가 바뀌므로 ETag 갱신
+        await table_versions.bump(db, "memberPhoto")
+        await db.commit()
         return RedirectResponse(f"/memberdetail/{memberno}", status_code=303)
     except Exception as e:
         print(f"Error: {e}")
@@ -121,11 +299,7 @@ async def upload_ncimage(request: Request, memberno: int, file: UploadFile = Fil
         if not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail="File type not supported.")
         contents = await file.read()
-        contents = await resize_image_if_needed(contents, max_bytes=102400)
-        os.makedirs(MEMBERPHOTO_DIR, exist_ok=True)
-        image = Image.open(io.BytesIO(contents))
-        thumbnail_path = os.path.join(MEMBERPHOTO_DIR, f"ncard_{memberno}.png")
-        image.save(thumbnail_path, format="PNG")
+        await save_member_photo(contents, "ncard", memberno, max_bytes=102400)
         return RedirectResponse(f"/memberdetail/{memberno}", status_code=303)
     except Exception as e:
         print(f"Error: {e}")
@@ -139,11 +313,7 @@ async def upload_spimage(request: Request, memberno: int, file: UploadFile = Fil
         if not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail="File type not supported.")
         contents = await file.read()
-        contents = await resize_image_if_needed(contents, max_bytes=102400)
-        os.makedirs(MEMBERPHOTO_DIR, exist_ok=True)
-        image = Image.open(io.BytesIO(contents))
-        thumbnail_path = os.path.join(MEMBERPHOTO_DIR, f"sphoto_{memberno}.png")
-        image.save(thumbnail_path, format="PNG")
+        await save_member_photo(contents, "sphoto", memberno, max_bytes=102400)
         return RedirectResponse(f"/memberdetail/{memberno}", status_code=303)
     except Exception as e:
         print(f"Error: {e}")
@@ -251,22 +421,25 @@ async def rmemberList(request: Request, regno: int, db: AsyncSession = Depends(g
 @app.get("/getcirclemembers/{circleno}", response_class=JSONResponse)
 async def getcirclemembers(request: Request, circleno: int, db: AsyncSession = Depends(get_db)):
     rows = await get_circlememberlist(circleno, db)
-    members = [row_to_dict(row) for row in rows]
-    return JSONResponse({"members": members})
+    # Row/날짜는 FastJSONResponse 인코더가 직접 직렬화
+    return FastJSONResponse({"members": rows})
 
 
 @app.get("/circlememberList/{circleno}", response_class=HTMLResponse)
-async def ccmemberList(request: Request, circleno: int, db: AsyncSession = Depends(get_db)):
+async def ccmemberList(request: Request, circleno: int):
     user_No = request.session.get("user_No")
     if not user_No: return RedirectResponse(url="/")
-    allmembers = await get_memberlist(db)
-    cmember = await get_circlememberlist(circleno, db)
-    circledtl = await get_circledtl(circleno, db)
+    data = await page_loader.load(
+        allmembers=get_memberlist_page,
+        cmember=lambda db: get_circlememberlist(circleno, db),
+        circledtl=lambda db: get_circledtl(circleno, db),
+    )
+    allmembers, next_cursor = data["allmembers"]
     return templates.TemplateResponse("member/circlememberList.html", {
         "request": request, "user_No": user_No, "user_Name": request.session.get("user_Name"),
-        "user_Role": request.session.get("user_Role"), "circledtl": circledtl, "cmembers": cmember,
+        "user_Role": request.session.get("user_Role"), "circledtl": data["circledtl"], "cmembers": data["cmember"],
         "user_region": request.session.get("user_Region"), "user_clubno": request.session.get("user_Clubno"),
-        "allmembers": allmembers
+        "allmembers": allmembers, "next_cursor": next_cursor
     })
 
 
@@ -287,14 +460,24 @@ async def editcirclemember(request: Request, circleno: int, memberno: int, db: A
 async def memberList(request: Request, db: AsyncSession = Depends(get_db)):
     user_No = request.session.get("user_No")
     if not user_No: return RedirectResponse(url="/")
-    members = await get_memberlist(db)
+    members, next_cursor = await get_memberlist_page(db)
     return templates.TemplateResponse("admin/memberList.html", {
         "request": request, "user_No": user_No, "user_Name": request.session.get("user_Name"),
-        "user_Role": request.session.get("user_Role"), "members": members,
+        "user_Role": request.session.get("user_Role"), "members": members, "next_cursor": next_cursor,
         "user_region": request.session.get("user_Region"), "user_clubno": request.session.get("user_Clubno")
     })
 
 
+# 전체 회원 목록의 다음 페이지 (memberList / circlememberList 화면에서 이어서 불러옴)
+@app.get("/memberListPage", response_class=JSONResponse)
+async def memberListPage(request: Request, cursor: str = None, limit: int = None, db: AsyncSession = Depends(get_db)):
+    if not request.session.get("user_No"):
+        raise HTTPException(status_code=401, detail="로그인이 필요합니다.")
+    rows, next_cursor = await get_memberlist_page(db, cursor, limit)
+    members = [{"memberNo": row[0], "memberName": row[1], "clubName": row[2], "rankTitlekor": row[3]} for row in rows]
+    return JSONResponse({"members": members, "nextCursor": next_cursor})
+
+
 
 
 @app.api_route("/addmember", response_class=HTMLResponse, methods=["GET", "POST"])
@@ -305,7 +488,11 @@ async def addmember(request: Request, db: AsyncSession = Depends(get_db)):
     id_q = text("SELECT LAST_INSERT_ID()")
     result = await db.execute(id_q)
     new_memberno = result.scalar_one()
+    await table_versions.bump(db, "lionsMember")
+    await sync_log.record(db, "member", new_memberno)
     await db.commit()
+    await member_index.refresh_member(db, new_memberno)
+    member_names.invalidate(new_memberno)
     return RedirectResponse(url=f"/memberdetail/{new_memberno}", status_code=303)
 
 
@@ -314,41 +501,47 @@ async def addcircle(request: Request, db: AsyncSession = Depends(get_db)):
     circleName = "신규추가 써클"
     query = text(f"INSERT into lionsCircle (circleName) values (:circlename)")
     await db.execute(query, {"circlename": circleName})
+    await table_versions.bump(db, "lionsCircle")
     await db.commit()
+    await refdata.refresh(db, "circlelist")
     return RedirectResponse("/circleList", status_code=303)
 
 
 @app.get("/memberdetail/{memberno}", response_class=HTMLResponse)
-async def memberDetail(request: Request, memberno: int, db: AsyncSession = Depends(get_db)):
+async def memberDetail(request: Request, memberno: int):
     user_No = request.session.get("user_No")
     if not user_No: return RedirectResponse(url="/")
-    memberdtl = await get_memberdetail(memberno, db)
-    myphoto = await get_photo(memberno, db)
-    ncphoto = await get_namecard(memberno, db)
-    spphoto = await get_spphoto(memberno, db)
-    clublist = await get_clublist(db)
-    ranklist = await get_ranklist(db)
+    data = await page_loader.load(
+        memberdtl=lambda db: get_memberdetail(memberno, db),
+        myphoto=lambda db: get_photo(memberno, db),
+        ncphoto=lambda db: get_namecard(memberno, db),
+        spphoto=lambda db: get_spphoto(memberno, db),
+        clublist=get_clublist,
+        ranklist=get_ranklist,
+    )
     return templates.TemplateResponse("member/memberDetail.html", {
         "request": request, "user_No": user_No, "user_Name": request.session.get("user_Name"),
-        "user_Role": request.session.get("user_Role"), "memberdtl": memberdtl, "myphoto": myphoto,
-        "clublist": clublist, "ranklist": ranklist, "ncphoto": ncphoto, "spphoto": spphoto,
+        "user_Role": request.session.get("user_Role"), "memberdtl": data["memberdtl"], "myphoto": data["myphoto"],
+        "clublist": data["clublist"], "ranklist": data["ranklist"], "ncphoto": data["ncphoto"], "spphoto": data["spphoto"],
         "user_region": request.session.get("user_Region"), "user_clubno": request.session.get("user_Clubno")
     })
 
 @app.get("/mymemberdetail/{memberno}", response_class=HTMLResponse)
-async def mymemberDetail(request: Request, memberno: int, db: AsyncSession = Depends(get_db)):
+async def mymemberDetail(request: Request, memberno: int):
     user_No = request.session.get("user_No")
     if not user_No: return RedirectResponse(url="/")
-    memberdtl = await get_memberdetail(memberno, db)
-    myphoto = await get_photo(memberno, db)
-    ncphoto = await get_namecard(memberno, db)
-    spphoto = await get_spphoto(memberno, db)
-    clublist = await get_clublist(db)
-    ranklist = await get_ranklist(db)
+    data = await page_loader.load(
+        memberdtl=lambda db: get_memberdetail(memberno, db),
+        myphoto=lambda db: get_photo(memberno, db),
+        ncphoto=lambda db: get_namecard(memberno, db),
+        spphoto=lambda db: get_spphoto(memberno, db),
+        clublist=get_clublist,
+        ranklist=get_ranklist,
+    )
     return templates.TemplateResponse("myclub/mymemberDetail.html", {
         "request": request, "user_No": user_No, "user_Name": request.session.get("user_Name"),
-        "user_Role": request.session.get("user_Role"), "memberdtl": memberdtl, "myphoto": myphoto,
-        "clublist": clublist, "ranklist": ranklist, "ncphoto": ncphoto, "spphoto": spphoto,
+        "user_Role": request.session.get("user_Role"), "memberdtl": data["memberdtl"], "myphoto": data["myphoto"],
+        "clublist": data["clublist"], "ranklist": data["ranklist"], "ncphoto": data["ncphoto"], "spphoto": data["spphoto"],
         "user_region": request.session.get("user_Region"), "user_clubno": request.session.get("user_Clubno")
     })
 
@@ -374,7 +567,12 @@ async def update_memberdtl(request: Request, memberno: int, db: AsyncSession = D
     query = text(f"UPDATE lionsMember SET {set_clause} WHERE memberNo = :memberNo")
     update_fields["memberNo"] = memberno
     await db.execute(query, update_fields)
+    await table_versions.bump(db, "lionsMember")
+    await sync_log.record(db, "member", memberno)
     await db.commit()
+    refdata.invalidate("regionlist")
+    member_names.invalidate(memberno)
+    await member_index.refresh_member(db, memberno)
     return RedirectResponse(f"/memberdetail/{memberno}", status_code=303)
 
 
@@ -399,7 +597,12 @@ async def update_mymemberdtl(request: Request, memberno: int, db: AsyncSession =
     query = text(f"UPDATE lionsMember SET {set_clause} WHERE memberNo = :memberNo")
     update_fields["memberNo"] = memberno
     await db.execute(query, update_fields)
+    await table_versions.bump(db, "lionsMember")
+    await sync_log.record(db, "member", memberno)
     await db.commit()
+    refdata.invalidate("regionlist")
+    member_names.invalidate(memberno)
+    await member_index.refresh_member(db, memberno)
     return RedirectResponse(f"/mymemberdetail/{memberno}", status_code=303)
 
 
@@ -525,6 +728,7 @@ async def updateclubdoc(request: Request, clubno: int, db: AsyncSession = Depend
     query = text(
         "INSERT INTO lionsDoc (clubNo,docType,docTitle,cDocument) values (:clubNo,:docType,:docTitle,:cDocument)")
     await db.execute(query, data4docs)
+    await table_versions.bump(db, "lionsDoc")
     await db.commit()
     return RedirectResponse(f"/editclub/{clubno}", status_code=303)
 
@@ -556,6 +760,7 @@ async def updateclubdocs(request: Request, docno: int, db: AsyncSession = Depend
     query = text(
         "INSERT INTO lionsDoc (clubNo,docType,docTitle,cDocument) values (:clubNo,:docType,:docTitle,:cDocument)")
     await db.execute(query, data4docs)
+    await table_versions.bump(db, "lionsDoc")
     await db.commit()
     return RedirectResponse(f"/editclub/{clubno}", status_code=303)
 
@@ -838,6 +1043,8 @@ async def updatenotice(request: Request, messageno: int, db: AsyncSession = Depe
     update_fields["messageNo"] = messageno
 
     await db.execute(query, update_fields)
+    await table_versions.bump(db, "boardMessage")
+    await sync_log.record(db, "notice", messageno)
     await db.commit()
 
     return RedirectResponse(f"/listnotice/{request.session.get('user_Region')}", status_code=303)
@@ -861,6 +1068,7 @@ async def update_clubnot(request: Request, messageno: int, db: AsyncSession = De
     update_fields["messageNo"] = messageno
 
     await db.execute(query, update_fields)
+    await sync_log.record(db, "clubnotice", messageno)
     await db.commit()
 
     return RedirectResponse(f"/listclubnotice/{request.session.get('user_Clubno')}", status_code=303)
@@ -886,6 +1094,7 @@ async def update_circlenot(request: Request, messageno: int, db: AsyncSession =
     update_fields["messageNo"] = messageno
 
     await db.execute(query, update_fields)
+    await sync_log.record(db, "circlenotice", messageno)
     await db.commit()
 
     query2 = text("SELECT circleNo FROM circleboardMessage where messageNo = :messageNo")
@@ -898,7 +1107,10 @@ async def update_circlenot(request: Request, messageno: int, db: AsyncSession =
 @app.post("/removenotice/{messageno}", response_class=HTMLResponse)
 async def removenotice(request: Request, messageno: int, db: AsyncSession = Depends(get_db)):
     query = text(f"UPDATE boardMessage SET attrib = :XXUP WHERE messageNo = :messageNo")
+    await notice_counters.removed(db, "REGION", messageno)
     await db.execute(query, {"XXUP": "XXXUPXXXUP", "messageNo": messageno})
+    await table_versions.bump(db, "boardMessage")
+    await sync_log.record(db, "notice", messageno)
     await db.commit()
     return RedirectResponse(f"/listnotice/{request.session.get('user_Region')}", status_code=303)
 
@@ -906,7 +1118,9 @@ async def removenotice(request: Request, messageno: int, db: AsyncSession = Depe
 @app.post("/removeclubnotice/{messageno}", response_class=HTMLResponse)
 async def removeclubnotice(request: Request, messageno: int, db: AsyncSession = Depends(get_db)):
     query = text(f"UPDATE clubboardMessage SET attrib = :XXUP WHERE messageNo = :messageNo")
+    await notice_counters.removed(db, "CLUB", messageno)
     await db.execute(query, {"XXUP": "XXXUPXXXUP", "messageNo": messageno})
+    await sync_log.record(db, "clubnotice", messageno)
     await db.commit()
     return RedirectResponse(f"/listclubnotice/{request.session.get('user_Clubno')}", status_code=303)
 
@@ -914,7 +1128,9 @@ async def removeclubnotice(request: Request, messageno: int, db: AsyncSession =
 @app.post("/removecirclenotice/{messageno}/{circleno}", response_class=HTMLResponse)
 async def removecirclenotice(request: Request, messageno: int,circleno:int,db: AsyncSession = Depends(get_db)):
     query = text(f"UPDATE circleboardMessage SET attrib = :XXUP WHERE messageNo = :messageNo")
+    await notice_counters.removed(db, "CIRCLE", messageno)
     await db.execute(query, {"XXUP": "XXXUPXXXUP", "messageNo": messageno})
+    await sync_log.record(db, "circlenotice", messageno)
     await db.commit()
     query2 = text(f"Select circleName from lionsCircle where circleNo = :circleNo")
     result = await db.execute(query2, {"circleNo": circleno})
@@ -942,6 +1158,9 @@ async def insertnotice(request: Request, regionno: int, db: AsyncSession = Depen
 
     query = text(f"INSERT INTO boardMessage ({columns}) VALUES ({values})")
     await db.execute(query, insert_fields)
+    await sync_log.record_last_insert(db, "notice")
+    await table_versions.bump(db, "boardMessage")
+    await notice_counters.added(db, "REGION", regionno)
     await db.commit()
 
     # FCM 알림 전송 시에도 json_data에서 제목을 가져옵니다.
@@ -970,6 +1189,8 @@ async def insertclubnotice(request: Request, clubno: int, db: AsyncSession = Dep
 
     query = text(f"INSERT INTO clubboardMessage ({columns}) VALUES ({values})")
     await db.execute(query, insert_fields)
+    await sync_log.record_last_insert(db, "clubnotice")
+    await notice_counters.added(db, "CLUB", clubno)
     await db.commit()
 
     # FCM 알림 전송 시에도 json_data에서 제목을 가져옵니다.
@@ -998,6 +1219,8 @@ async def insertcirclenotice(request: Request, circleno: int, db: AsyncSession =
 
     query = text(f"INSERT INTO circleboardMessage ({columns}) VALUES ({values})")
     await db.execute(query, insert_fields)
+    await sync_log.record_last_insert(db, "circlenotice")
+    await notice_counters.added(db, "CIRCLE", circleno)
     await db.commit()
 
     query2 = text(f"Select circleName from lionsCircle where circleNo = :circleNo")
@@ -1044,7 +1267,11 @@ async def updateclub(request: Request, clubno: int, db: AsyncSession = Depends(g
     query = text(f"UPDATE lionsClub SET {set_clause} WHERE clubNo = :clubNo")
     update_fields["clubNo"] = clubno
     await db.execute(query, update_fields)
+    await table_versions.bump(db, "lionsClub")
+    await sync_log.record_select(db, "member", "SELECT memberNo AS no FROM lionsMember WHERE clubNo = :clubNo", {"clubNo": clubno})
     await db.commit()
+    await refdata.refresh(db, "clublist", "regionlist")
+    member_index.invalidate()
     return RedirectResponse(f"/editclub/{clubno}", status_code=303)
 
 
@@ -1060,7 +1287,9 @@ async def updatecircle(request: Request, circleno: int, db: AsyncSession = Depen
     query = text(f"UPDATE lionsCircle SET {set_clause} WHERE circleNo = :circleNo")
     update_fields["circleNo"] = circleno
     await db.execute(query, update_fields)
+    await table_versions.bump(db, "lionsCircle")
     await db.commit()
+    await refdata.refresh(db, "circlelist")
     return RedirectResponse(f"/editcircle/{circleno}", status_code=303)
 
 
@@ -1110,7 +1339,11 @@ async def update_rank(request: Request, rankno: int, db: AsyncSession = Depends(
     query = text(
         "UPDATE lionsRank SET rankTitlekor = :rankTitlekor, rankTitleeng = :rankTitleeng, rankDiv = :rankDiv, orderNo = :orderNo, useYN = :useYN WHERE rankNo = :rankNo")
     await db.execute(query, data4update)
+    await table_versions.bump(db, "lionsRank")
+    await sync_log.record_select(db, "member", "SELECT memberNo AS no FROM lionsMember WHERE rankNo = :rankNo", {"rankNo": rankno})
     await db.commit()
+    await refdata.refresh(db, "ranklist", "ranklistall", "ranklistcircle")
+    member_index.invalidate()
     return RedirectResponse(f"/rankDetail/{rankno}", status_code=303)
 
 
@@ -1120,7 +1353,9 @@ async def add_rank(request: Request, db: AsyncSession = Depends(get_db)):
         "INSERT INTO lionsRank (rankTitlekor, rankTitleeng, rankDiv, orderNo) values (:rankTitlekor, :rankTitleeng, :rankDiv, :orderNo)")
     await db.execute(query,
                      {"rankTitlekor": "새로 등록된 직책", "rankTitleeng": "New Rank", "rankDiv": "CLUB", "orderNo": "0"})
+    await table_versions.bump(db, "lionsRank")
     await db.commit()
+    await refdata.refresh(db, "ranklist", "ranklistall", "ranklistcircle")
     return RedirectResponse(f"/rankList", status_code=303)
 
 
@@ -1167,7 +1402,9 @@ async def update_bisdtl(request: Request, memberno: int, db: AsyncSession = Depe
     await db.execute(queryup, {"memberno": memberno, "attr": "XXXUPXXXUP"})
     query = text("INSERT INTO memberBusiness (memberNo,bisTitle, bisRank, bisType,bistypeTitle,officeTel,officeAddress,officeEmail,officePostNo,officeWeb,officeSns,bisMemo) values (:dt1,:dt2,:dt3,:dt4,:dt5,:dt6,:dt7,:dt8,:dt9,:dt10,:dt11,:dt12)")
     await db.execute(query, data4update)
+    await sync_log.record(db, "business", memberno)
     await db.commit()
+    await member_index.refresh_member(db, memberno)
     return RedirectResponse(url=f"/editbis/{memberno}?saved=1", status_code=303)
 
 
@@ -1183,7 +1420,9 @@ async def update_regdtl(request: Request, regno: int, db: AsyncSession = Depends
     await db.execute(queryup, {"regno": regno, "attr": "XXXUPXXXUP", "mdate": mdatenow})
     query = text("INSERT INTO lionsRegion (regionNo,chairmanNo,regionSlog,yearFrom,yearTo) values (:regionNo,:chairmanNo,:regionSlog, :yearFrom, :yearTo)")
     await db.execute(query, data4update)
+    await table_versions.bump(db, "lionsRegion")
     await db.commit()
+    await refdata.refresh(db, "regionlist")
     return RedirectResponse(f"/editregion/{regno}", status_code=303)
 
 
@@ -1281,25 +1520,8 @@ async def membertocircleminus(request: Request, circleno: int, memberno: int, db
 
 
 @app.get("/slimage/{clubno}")
-async def slogan_image(clubno: int, db: AsyncSession = Depends(get_db)):
-    staff = await get_clubstaffwithname(clubno, db)
-    slogan = staff[1] if staff else "No Slogan"
-    memberno = staff[2] if staff else 0
-    name = staff[3]+"L" if staff else "No Name"
-    sub1 = staff[4] if staff else 0
-    sub1n = staff[5]+"L" if staff else "No Name"
-    sub2 = staff[6] if staff else 0
-    sub2n = staff[7]+"L" if staff else "No Name"
-    sub_members = [(sub1, sub1n), (sub2, sub2n)]
-    img = make_slogan_image(slogan, memberno, name, width=400, height=520, sub_members=sub_members)
-    save_dir = "./static/img/members"
-    os.makedirs(save_dir, exist_ok=True)
-    save_path = os.path.join(save_dir, f"{clubno}logo.png")
-    img.save(save_path, format="PNG")
-    buf = BytesIO()
-    img.save(buf, format="PNG")
-    buf.seek(0)
-    return StreamingResponse(buf, media_type="image/png")
+async def slogan_image(request: Request, clubno: int, db: AsyncSession = Depends(get_db)):
+    return await slogan_card_response(request, "club", clubno, db)
 
 
 @app.post("/clubimage/{clubno}")
@@ -1308,10 +1530,8 @@ async def club_image(clubno: int, file: UploadFile = File(...), db: AsyncSession
         if not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail="File type not supported.")
         contents = await file.read()
-        os.makedirs(MEMBERPHOTO_DIR, exist_ok=True)
         thumbnail_path = os.path.join(MEMBERPHOTO_DIR, f"clubImage{clubno}.jpg")
-        with open(thumbnail_path, "wb") as f:
-            f.write(contents)
+        await asyncio.to_thread(photo_store.save, contents, thumbnail_path)
         return JSONResponse(content={"message": "Upload successful"}, status_code=200)
     except Exception as e:
         print(f"Error: {e}")
@@ -1324,10 +1544,8 @@ async def circle_image(circleno: int, file: UploadFile = File(...), db: AsyncSes
         if not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail="File type not supported.")
         contents = await file.read()
-        os.makedirs(MEMBERPHOTO_DIR, exist_ok=True)
         thumbnail_path = os.path.join(MEMBERPHOTO_DIR, f"{circleno}circlelogo.png")
-        with open(thumbnail_path, "wb") as f:
-            f.write(contents)
+        await asyncio.to_thread(photo_store.save, contents, thumbnail_path)
         return JSONResponse(content={"message": "Upload successful"}, status_code=200)
     except Exception as e:
         print(f"Error: {e}")
@@ -1335,25 +1553,8 @@ async def circle_image(circleno: int, file: UploadFile = File(...), db: AsyncSes
 
 
 @app.get("/slimage_circle/{circleno}")
-async def cirslogan_image(circleno: int, db: AsyncSession = Depends(get_db)):
-    staff = await get_circlestaffwithname(circleno, db)
-    slogan = staff[1] if staff else "No Slogan"
-    memberno = staff[3] if staff else 0
-    name = str(staff[4]) + "L" if staff and len(staff) > 3 and staff[3] is not None else "No Name"
-    sub1 = staff[5] if staff and len(staff) > 4 else 0
-    sub1n = str(staff[6]) + "L" if staff and len(staff) > 5 and staff[5] is not None else "No Name"
-    sub2 = staff[7] if staff and len(staff) > 6 else 0
-    sub2n = str(staff[8]) + "L" if staff and len(staff) > 7 and staff[7] is not None else "No Name"
-    sub_members = [(sub1, sub1n), (sub2, sub2n)]
-    img = make_slogan_image(slogan, memberno, name, width=400, height=520, sub_members=sub_members)
-    save_dir = "./static/img/members"
-    os.makedirs(save_dir, exist_ok=True)
-    save_path = os.path.join(save_dir, f"{circleno}circlelogo.png")
-    img.save(save_path, format="PNG")
-    buf = BytesIO()
-    img.save(buf, format="PNG")
-    buf.seek(0)
-    return StreamingResponse(buf, media_type="image/png")
+async def cirslogan_image(request: Request, circleno: int, db: AsyncSession = Depends(get_db)):
+    return await slogan_card_response(request, "circle", circleno, db)
 
 
 @app.api_route("/updateboard/{boardno}/{clubno}/{clubname}", response_class=HTMLResponse, methods=["GET", "POST"])
@@ -1371,6 +1572,8 @@ async def updateboard(request: Request, boardno: int, clubno: int, clubname: str
 async def updatesort(request: Request, memberno: int, sortno: int, db: AsyncSession = Depends(get_db)):
     query = text(f"update lionsMember set clubSortNo=:sortNo where memberNo=:memberNo")
     await db.execute(query, {"sortNo": sortno, "memberNo": memberno})
+    await table_versions.bump(db, "lionsMember")
+    await sync_log.record(db, "member", memberno)
     await db.commit()
     return JSONResponse(content={"result": "ok"})
 
@@ -1447,6 +1650,7 @@ async def update_stff(request: Request, clubno: int, db: AsyncSession = Depends(
         f"INSERT INTO lionsClubstaff (logPeriod,clubNo,presidentNo,secretNo,trNo,ltNo,ttNo,prpresidentNo,firstViceNo,secondViceNo,thirdViceNo,slog) values (:logPeriod,:clubNo,:presidentNo,:secretNo,:trNo,:ltNo,:ttNo,:prpresidentNo,:firstViceNo,:secondViceNo,:thirdViceNo,:slog)")
     await db.execute(query, data4update)
     await db.commit()
+    slogan_queue.put("club", clubno)
     return RedirectResponse(f"/clubStaff/{clubno}/{clubName}", status_code=303)
 
 
@@ -1473,6 +1677,7 @@ async def update_mystff(request: Request, clubno: int, db: AsyncSession = Depend
         f"INSERT INTO lionsClubstaff (logPeriod,clubNo,presidentNo,secretNo,trNo,ltNo,ttNo,prpresidentNo,firstViceNo,secondViceNo,thirdViceNo,slog) values (:logPeriod,:clubNo,:presidentNo,:secretNo,:trNo,:ltNo,:ttNo,:prpresidentNo,:firstViceNo,:secondViceNo,:thirdViceNo,:slog)")
     await db.execute(query, data4update)
     await db.commit()
+    slogan_queue.put("club", clubno)
     return RedirectResponse(f"/myclubStaff/{clubno}", status_code=303)
 
 
@@ -1505,6 +1710,7 @@ async def update_stff(request: Request, circleno: int, db: AsyncSession = Depend
     query = text(insert_query_str)
     await db.execute(query, data4update)
     await db.commit()
+    slogan_queue.put("circle", circleno)
     return RedirectResponse(f"/circleStaff/{circleno}", status_code=303)
 
 
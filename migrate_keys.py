@@ -0,0 +1,23 @@
+# 일회성 DB 마이그레이션: 중복 행을 정리하고 UNIQUE 키 추가 (배포 전 한 번 실행, 웹 서버 기동 시에는 하지 않음)
+# 사용법: python migrate_keys.py          정리 대상 건수만 출력
+#         python migrate_keys.py --apply  중복 정리 후 키 추가
+import asyncio
+import sys
+from common.dbconn import async_session, engine
+from common.attendance import attendance_keys
+from common.unreadcounter import notice_counters
+
+
+async def main(apply):
+    try:
+        async with async_session() as session:
+            await attendance_keys.migrate(session, apply)
+            await notice_counters.migrate_read_key(session, apply)
+    finally:
+        await engine.dispose()
+    if not apply:
+        print("확인 후 --apply 로 다시 실행하면 정리합니다.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main("--apply" in sys.argv[1:]))
@@ -1,17 +1,71 @@
 import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import JSONResponse
+from common.jsonresp import FastJSONResponse, list_response, response_format
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 
 # main.py에서 DB 세션 및 토큰 관련 함수 가져오기
 # (순환 참조를 방지하기 위해 main.py의 하단에서 이 라우터를 등록합니다)
-from main import get_db, get_current_mobile_user, create_access_token
+from main import get_db, get_current_mobile_user, create_access_token, decode_mobile_token, security
+from fastapi.security import HTTPAuthorizationCredentials
+from common.tokenguard import token_guard
+from common.unreadcounter import notice_counters
 from sqlalchemy import text, bindparam
+from common.searchindex import member_index
+from common.nameresolver import member_names
+from common.paging import NULL_DATE, NULL_ORDER, clamp_limit, decode_cursor, keyset_page
+from common.etag import table_versions, etag_matches, etag_headers, not_modified
+from common.synclog import sync_log, ENTITY_TABLES
+from common.membermask import mask_member
+from common.pageloader import PageLoader
+from common.photomanifest import photo_manifest
+from common.dbconn import session_factory_for
+from common.attendance import attendance_keys
+from funchub import STAFF_POSITIONS
+
+phapp_router = APIRouter(prefix="/phapp", tags=["Mobile App"], default_response_class=FastJSONResponse)
+
+# 참석 응답 UPSERT (한 번의 왕복으로 등록/수정, 동시 요청에도 중복 행이 생기지 않음)
+# ※ (eventNo, memberNo) UNIQUE 키는 기동 시 추가 (common/attendance.py), 키가 없으면 저장하지 않음
+# ※ 삭제 처리된 응답을 다시 등록하면 attrib 도 되살림
+ATTEND_UPSERT_SQL = """
+    INSERT INTO {table} (eventNo, memberNo, responseType, delayTime, joinMemo,
+                         responseTimestamp, regDate, attrib)
+    VALUES (:eventNo, :memberNo, :responseType, :delayTime, :joinMemo, NOW(), NOW(), '1000010000')
+    ON DUPLICATE KEY UPDATE responseType      = VALUES(responseType),
+                            delayTime         = VALUES(delayTime),
+                            joinMemo          = VALUES(joinMemo),
+                            responseTimestamp = NOW(),
+                            modDate           = NOW(),
+                            attrib            = VALUES(attrib)
+"""
+CLUB_ATTEND_UPSERT = text(ATTEND_UPSERT_SQL.format(table="clubEventMember"))
+CIRCLE_ATTEND_UPSERT = text(ATTEND_UPSERT_SQL.format(table="circleEventMember"))
+
+# 일괄 등록은 행사를 연 클럽/써클의 현재 임원만 가능
+EVENT_STAFF_SQL = """
+    SELECT 1
+    FROM {events} e
+             JOIN {staff} s ON s.{scope} = e.{scope} AND s.attrib NOT LIKE '%XXX%'
+    WHERE e.eventNo = :eventNo
+      AND :memberNo IN ({positions})
+    LIMIT 1
+"""
+_STAFF_COLUMNS = ", ".join(f"s.{column}" for column, _ in STAFF_POSITIONS)
+CLUB_EVENT_STAFF = text(EVENT_STAFF_SQL.format(events="clubEvents", staff="lionsClubstaff", scope="clubNo",
+                                               positions=_STAFF_COLUMNS))
+CIRCLE_EVENT_STAFF = text(EVENT_STAFF_SQL.format(events="circleEvents", staff="lionsCirclestaff", scope="circleNo",
+                                                 positions=_STAFF_COLUMNS))
+
+
+async def require_event_staff(db, staff_query, event_no: int, current_user: str):
+    found = (await db.execute(staff_query, {"eventNo": event_no, "memberNo": int(current_user)})).scalar()
+    if not found:
+        raise HTTPException(status_code=403, detail="행사 참석 일괄 등록은 해당 클럽/써클 임원만 가능합니다.")
 
-phapp_router = APIRouter(prefix="/phapp", tags=["Mobile App"])
 
 def row_to_dict(row):
     d = dict(row._mapping)
@@ -49,6 +103,16 @@ class ClubEventAttendModel(BaseModel):
     delayTime: int = 0
     joinMemo: str = ""
 
+class AttendanceItem(BaseModel):
+    memberNo: int
+    responseType: str = Field(..., max_length=3)  # 'YES' 또는 'NO'
+    delayTime: Optional[int] = 0
+    joinMemo: Optional[str] = Field("", max_length=1000)
+
+class BulkAttendanceModel(BaseModel):
+    eventNo: int
+    attendances: List[AttendanceItem]
+
 class ClubEventInsertModel(BaseModel):
     clubNo: int
     eventTitle: str
@@ -61,57 +125,76 @@ class ClubEventInsertModel(BaseModel):
     eventMemo: str = ""
 
 
+async def fetch_clubs(db, regionno: int):
+    query = text("SELECT clubNo, clubName, regionNo FROM lionsClub where regionNo = :regionNo ")
+    result = await db.execute(query, {"regionNo": regionno})
+    rows = result.fetchall()
+    return [{"clubNo": row[0], "clubName": row[1], "regionNo": row[2]} for row in rows]
+
+
 @phapp_router.get("/clubList/{regionno}")
-async def phappclublist(regionno: int, db: AsyncSession = Depends(get_db)):
+async def phappclublist(regionno: int, request: Request, db: AsyncSession = Depends(get_db)):
     try:
-        query = text("SELECT clubNo, clubName, regionNo FROM lionsClub where regionNo = :regionNo ")
-        result = await db.execute(query, {"regionNo": regionno})
-        rows = result.fetchall()
-        result_data = [{"clubNo": row[0], "clubName": row[1], "regionNo": row[2]} for row in rows]
-        return {"clubs": result_data}
+        # 변경이 없으면 목록 조회 없이 304 응답
+        etag = await table_versions.try_etag(db, "lionsClub", scope=f"clubList:{regionno}:{response_format(request)}")
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        result_data = await fetch_clubs(db, regionno)
+        return list_response(request, {"clubs": result_data}, headers=etag_headers(etag))
     except Exception as e:
         print("error:", e)
         return {"clubs": []}
 
 
+async def fetch_club_members(db, clubno: int):
+    query = text("SELECT lm.memberNo, lm.memberName, lm.memberPhone, lr.rankTitlekor, lm.maskYN, lm.clubRank FROM lionsMember lm left join lionsRank lr on lm.rankNo = lr.rankNo where lm.clubNo = :clubno and lm.funcNo < 4 order by lm.clubSortNo, lm.memberJoindate")
+    result = await db.execute(query, {"clubno": clubno})
+    rows = result.fetchall()
+    return [{"memberNo": row[0], "memberName": row[1], "memberPhone": "비공개" if row[4] == "Y" else row[2], "rankTitle": row[3], "clubRank":row[5],
+             "photoUrl": photo_manifest.variant_url("mphoto", row[0], 128) or ""} for row in rows]
+
+
 @phapp_router.get("/memberList/{clubno}")
-async def phappmemberlist(clubno: int, db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
+async def phappmemberlist(clubno: int, request: Request, db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
     try:
-        query = text("SELECT lm.memberNo, lm.memberName, lm.memberPhone, lr.rankTitlekor, lm.maskYN, lm.clubRank FROM lionsMember lm left join lionsRank lr on lm.rankNo = lr.rankNo where lm.clubNo = :clubno and lm.funcNo < 4 order by lm.clubSortNo, lm.memberJoindate")
-        result = await db.execute(query, {"clubno": clubno})
-        rows = result.fetchall()
-        result_data = [{"memberNo": row[0], "memberName": row[1], "memberPhone": "비공개" if row[4] == "Y" else row[2], "rankTitle": row[3], "clubRank":row[5]} for row in rows]
-        return {"members": result_data}
+        etag = await table_versions.try_etag(db, "lionsMember", "lionsRank", "memberPhoto", scope=f"memberList:{clubno}:{response_format(request)}")
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        result_data = await fetch_club_members(db, clubno)
+        return list_response(request, {"members": result_data}, headers=etag_headers(etag))
     except Exception as e:
         print("error:", e)
         return {"members": []}
 
 
 @phapp_router.get("/memberListext/{clubno}")
-async def phappmemberlistext(clubno: int, db: AsyncSession = Depends(get_db),
+async def phappmemberlistext(request: Request, clubno: int, db: AsyncSession = Depends(get_db),
                          current_user: str = Depends(get_current_mobile_user)):
     try:
         query = text("SELECT lm.memberNo, lr.chnName as memberName, lm.memberPhone, lr.chnRank as rankTitlekor, lm.maskYN, lm.clubRank FROM lionsMember lm left join lionsExtnames lr on lm.memberNo = lr.memberNo where lm.clubNo = :clubno and lm.funcNo <4 order by lm.clubSortNo, lm.memberJoindate")
         result = await db.execute(query, {"clubno": clubno})
         rows = result.fetchall()
         result_data = [{"memberNo": row[0], "memberName": row[1], "memberPhone": "비공개" if row[4] == "Y" else row[2], "rankTitle": row[3], "clubRank":row[3]} for row in rows]
-        return {"members": result_data}
+        return list_response(request, {"members": result_data})
     except Exception as e:
         print("error:", e)
         return {"members": []}
 
 
 @phapp_router.get("/clubdocs/{clubno}")
-async def phappclubdocs(clubno: int, db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
+async def phappclubdocs(clubno: int, request: Request, db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
     try:
+        etag = await table_versions.try_etag(db, "lionsDoc", scope=f"clubdocs:{clubno}:{response_format(request)}")
+        if etag_matches(request, etag):
+            return not_modified(etag)
         query = text("SELECT * from lionsDoc where (clubNo = :clubno or clubNo = 999) and attrib not like :attrib order by clubNo desc")
         result = await db.execute(query, {"clubno": clubno, "attrib": "%XXX%"})
         rows = result.fetchall()
         result_data = [{"docNo": row[0], "docType": row[2], "docTitle": row[3]} for row in rows]
-        return {"docs": result_data}
+        return list_response(request, {"docs": result_data}, headers=etag_headers(etag))
     except Exception as e:
         print("error:", e)
-        return {"docs": []}
+        return list_response(request, {"docs": []})
 
 
 @phapp_router.get("/docviewer/{docno}")
@@ -128,116 +211,130 @@ async def phappdocviewer(docno: int, db: AsyncSession = Depends(get_db), current
 
 
 @phapp_router.get("/notice/{regionno}")
-async def phappnotice(regionno: int, db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
+async def phappnotice(regionno: int, request: Request, db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
     try:
+        etag = await table_versions.try_etag(db, "boardMessage", scope=f"notice:{regionno}:{response_format(request)}")
+        if etag_matches(request, etag):
+            return not_modified(etag)
         query = text("SELECT * from boardMessage where regionNo = :regionno and attrib not like :attrib")
         result = await db.execute(query, {"regionno": regionno, "attrib": "%XXX%"})
         rows = result.fetchall()
         result_data = [{"noticeNo": row[0], "writer": row[3], "noticeTitle": row[4]} for row in rows]
-        return {"docs": result_data}
+        return list_response(request, {"docs": result_data}, headers=etag_headers(etag))
     except Exception as e:
         print("error:", e)
-        return {"docs": []}
+        return list_response(request, {"docs": []})
+
+
+async def fetch_region_notices(db, regionno: int, memberno: int):
+    query = text("SELECT a.messageNo, a.messageTitle,b.readYN, b.attendPlan from boardMessage a left join noticeAndswer b on b.noticeType = 'REGION' and a.messageNo = b.noticeNo and b.memberNo = :memberno where a.regionNo = :regionno and a.attrib not like :attrib")
+    result = await db.execute(query, {"regionno": regionno,"memberno":memberno ,"attrib": "%XXX%"})
+    rows = result.fetchall()
+    return [{"noticeNo": row[0], "noticeTitle": row[1], "readYN": row[2], "attendPlan": row[3]} for row in rows]
 
 
 @phapp_router.get("/notice/{regionno}/{memberno}")
-async def phappnotice2(regionno: int, memberno:int ,db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
+async def phappnotice2(request: Request, regionno: int, memberno:int ,db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
     try:
-        query = text("SELECT a.messageNo, a.messageTitle,b.readYN, b.attendPlan from boardMessage a left join noticeAndswer b on b.noticeType = 'REGION' and a.messageNo = b.noticeNo and b.memberNo = :memberno where a.regionNo = :regionno and a.attrib not like :attrib")
-        result = await db.execute(query, {"regionno": regionno,"memberno":memberno ,"attrib": "%XXX%"})
-        rows = result.fetchall()
-        result_data = [{"noticeNo": row[0], "noticeTitle": row[1], "readYN": row[2], "attendPlan": row[3]} for row in rows]
-        return {"docs": result_data}
+        result_data = await fetch_region_notices(db, regionno, memberno)
+        return list_response(request, {"docs": result_data})
     except Exception as e:
         print("error:", e)
-        return {"docs": []}
+        return list_response(request, {"docs": []})
 
 
 @phapp_router.get("/clubnotice/{clubno}")
-async def phappcnotice(clubno: int, db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
+async def phappcnotice(request: Request, clubno: int, db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
     try:
         query = text("SELECT * from clubboardMessage where clubNo = :clubno and attrib not like :attrib")
         result = await db.execute(query, {"clubno": clubno, "attrib": "%XXX%"})
         rows = result.fetchall()
         result_data = [{"noticeNo": row[0], "writer": row[3], "noticeTitle": row[4]} for row in rows]
-        return {"docs": result_data}
+        return list_response(request, {"docs": result_data})
     except Exception as e:
         print("error:", e)
-        return {"docs": []}
+        return list_response(request, {"docs": []})
+
+
+async def fetch_circle_notices(db, memberno: int):
+    # 1. 사용자가 속한 써클 목록 조회
+    query1 = text("""
+                  SELECT a.circleNo, b.circleName
+                  FROM circleMember a
+                           LEFT JOIN lionsCircle b ON a.circleNo = b.circleNo
+                  WHERE a.memberNo = :memberno
+                    AND a.attrib NOT LIKE :attrib
+                  """)
+    result1 = await db.execute(query1, {"memberno": memberno, "attrib": "%XXX%"})
+    rows1 = result1.fetchall()
+
+    if not rows1:
+        return {"docs": [], "circlenames": []}
+
+    circle_nos = [row[0] for row in rows1]
+    circle_names = [row[1] for row in rows1]
+
+    # 써클 번호로 써클 이름을 찾기 위한 딕셔너리
+    circle_dict = {row[0]: row[1] for row in rows1}
+
+    # 2. 써클 공지사항 목록 및 읽음 여부 조회
+    # 🌟 c.* 대신 필요한 컬럼(messageNo, circleNo, writer, noticeTitle)을 명시적으로 지정
+    query2 = text("""
+                  SELECT c.messageNo,
+                         c.circleNo,
+                         c.writerNo,
+                         c.messageTitle,
+                         CASE WHEN r.noticeNo IS NOT NULL THEN 'Y' ELSE 'N' END AS readYN
+                  FROM circleboardMessage c
+                           LEFT JOIN noticeAndswer r
+                                     ON c.messageNo = r.noticeNo
+                                         AND r.memberNo = :memberno
+                                         AND r.noticeType = 'CIRCLE'
+                  WHERE c.circleNo IN :circlenos
+                    AND c.attrib NOT LIKE :attrib
+                  """)
+    query2 = query2.bindparams(bindparam('circlenos', expanding=True))
+    result2 = await db.execute(query2, {"circlenos": circle_nos, "attrib": "%XXX%", "memberno": memberno})
+    rows2 = result2.fetchall()
+
+    result_data = []
+    for row in rows2:
+        result_data.append({
+            "noticeNo": row[0],  # c.messageNo
+            "circleName": circle_dict.get(row[1], ""),  # c.circleNo (이제 무조건 매칭됨!)
+            "writer": row[2],  # c.writer
+            "noticeTitle": row[3],  # c.noticeTitle
+            "readYN": row[4]  # readYN (명시된 5번째 컬럼)
+        })
+
+    return {"docs": result_data, "circlenames": circle_names}
 
 
 @phapp_router.get("/circlenotice/{memberno}")
-async def phappcirnotice(memberno: int, db: AsyncSession = Depends(get_db),
+async def phappcirnotice(request: Request, memberno: int, db: AsyncSession = Depends(get_db),
                          current_user: str = Depends(get_current_mobile_user)):
     try:
-        # 1. 사용자가 속한 써클 목록 조회
-        query1 = text("""
-                      SELECT a.circleNo, b.circleName
-                      FROM circleMember a
-                               LEFT JOIN lionsCircle b ON a.circleNo = b.circleNo
-                      WHERE a.memberNo = :memberno
-                        AND a.attrib NOT LIKE :attrib
-                      """)
-        result1 = await db.execute(query1, {"memberno": memberno, "attrib": "%XXX%"})
-        rows1 = result1.fetchall()
-
-        if not rows1:
-            return {"docs": [], "circlenames": []}
-
-        circle_nos = [row[0] for row in rows1]
-        circle_names = [row[1] for row in rows1]
-
-        # 써클 번호로 써클 이름을 찾기 위한 딕셔너리
-        circle_dict = {row[0]: row[1] for row in rows1}
-
-        # 2. 써클 공지사항 목록 및 읽음 여부 조회
-        # 🌟 c.* 대신 필요한 컬럼(messageNo, circleNo, writer, noticeTitle)을 명시적으로 지정
-        query2 = text("""
-                      SELECT c.messageNo,
-                             c.circleNo,
-                             c.writerNo,
-                             c.messageTitle,
-                             CASE WHEN r.noticeNo IS NOT NULL THEN 'Y' ELSE 'N' END AS readYN
-                      FROM circleboardMessage c
-                               LEFT JOIN noticeAndswer r
-                                         ON c.messageNo = r.noticeNo
-                                             AND r.memberNo = :memberno
-                                             AND r.noticeType = 'CIRCLE'
-                      WHERE c.circleNo IN :circlenos
-                        AND c.attrib NOT LIKE :attrib
-                      """)
-        query2 = query2.bindparams(bindparam('circlenos', expanding=True))
-        result2 = await db.execute(query2, {"circlenos": circle_nos, "attrib": "%XXX%", "memberno": memberno})
-        rows2 = result2.fetchall()
-
-        result_data = []
-        for row in rows2:
-            result_data.append({
-                "noticeNo": row[0],  # c.messageNo
-                "circleName": circle_dict.get(row[1], ""),  # c.circleNo (이제 무조건 매칭됨!)
-                "writer": row[2],  # c.writer
-                "noticeTitle": row[3],  # c.noticeTitle
-                "readYN": row[4]  # readYN (명시된 5번째 컬럼)
-            })
-
-        return {"docs": result_data, "circlenames": circle_names}
-
+        return list_response(request, await fetch_circle_notices(db, memberno))
     except Exception as e:
         print("error:", e)
-        return {"docs": [], "circlenames": []}
+        return list_response(request, {"docs": [], "circlenames": []})
+
+
+async def fetch_club_notices(db, clubno: int, memberno: int):
+    query = text("SELECT a.messageNo, a.messageTitle,b.readYN, b.attendPlan from clubboardMessage a left join noticeAndswer b on b.noticeType = 'CLUB' and a.messageNo = b.noticeNo and b.memberNo = :memberno where a.clubNo = :clubno and a.attrib not like :attrib")
+    result = await db.execute(query, {"clubno": clubno,"memberno":memberno ,"attrib": "%XXX%"})
+    rows = result.fetchall()
+    return [{"noticeNo": row[0], "noticeTitle": row[1], "readYN": row[2], "attendPlan": row[3]} for row in rows]
 
 
 @phapp_router.get("/clubnotice/{clubno}/{memberno}")
-async def phappcnotice2(clubno: int,memberno:int ,db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
+async def phappcnotice2(request: Request, clubno: int,memberno:int ,db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
     try:
-        query = text("SELECT a.messageNo, a.messageTitle,b.readYN, b.attendPlan from clubboardMessage a left join noticeAndswer b on b.noticeType = 'CLUB' and a.messageNo = b.noticeNo and b.memberNo = :memberno where a.clubNo = :clubno and a.attrib not like :attrib")
-        result = await db.execute(query, {"clubno": clubno,"memberno":memberno ,"attrib": "%XXX%"})
-        rows = result.fetchall()
-        result_data = [{"noticeNo": row[0], "noticeTitle": row[1], "readYN": row[2], "attendPlan": row[3]} for row in rows]
-        return {"docs": result_data}
+        result_data = await fetch_club_notices(db, clubno, memberno)
+        return list_response(request, {"docs": result_data})
     except Exception as e:
         print("error:", e)
-        return {"docs": []}
+        return list_response(request, {"docs": []})
 
 
 @phapp_router.get("/clubnoticeViewer/{messageno}")
@@ -280,68 +377,91 @@ async def phappnoticev(messageno: int, db: AsyncSession = Depends(get_db), curre
 
 
 @phapp_router.get("/rmemberList/")
-async def phapprmemberlist_all(db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
+async def phapprmemberlist_all(request: Request, cursor: Optional[str] = None, limit: Optional[int] = None, db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
+    # cursor/limit 를 보내지 않는 구버전 앱에는 전체 목록을 그대로 반환
+    paged = cursor is not None or limit is not None
+    after = decode_cursor(cursor, 2)
     try:
-        query = text("SELECT lm.memberNo, lm.memberName, lm.memberPhone, lr.rankTitlekor, lc.clubName, lm.maskYN FROM lionsMember lm left join lionsRank lr on lm.rankNo = lr.rankNo left join lionsClub lc on lm.clubNo = lc.clubNo where lm.rankNo != :rankno order by lm.memberJoindate ")
-        result = await db.execute(query, {"rankno": 19})
+        params = {"rankno": 19, "nulldate": NULL_DATE}
+        where = "lm.rankNo != :rankno"
+        if after:
+            where += " and (COALESCE(lm.memberJoindate, :nulldate), lm.memberNo) > (:k0, :k1)"
+            params.update({"k0": after[0], "k1": after[1]})
+        size = clamp_limit(limit)
+        query = text("SELECT lm.memberNo, lm.memberName, lm.memberPhone, lr.rankTitlekor, lc.clubName, lm.maskYN, COALESCE(lm.memberJoindate, :nulldate) as joinKey FROM lionsMember lm left join lionsRank lr on lm.rankNo = lr.rankNo left join lionsClub lc on lm.clubNo = lc.clubNo "
+                     f"where {where} order by joinKey, lm.memberNo" + (" limit :limit" if paged else ""))
+        if paged:
+            params["limit"] = size + 1
+        result = await db.execute(query, params)
         rows = result.fetchall()
+        next_cursor = None
+        if paged:
+            rows, next_cursor = keyset_page(rows, size, lambda row: (row[6], row[0]))
         result_data = [{"memberNo": row[0], "memberName": row[1], "memberPhone": "비공개" if row[5] in ("Y","T") else row[2], "rankTitle": row[3], "clubName": row[4]} for row in rows]
-        return {"members": result_data}
+        return list_response(request, {"members": result_data, "nextCursor": next_cursor})
     except Exception as e:
         print("error:", e)
-        return {"members": []}
+        return {"members": [], "nextCursor": None}
 
 
 @phapp_router.get("/rnkmemberList/{regionno}")
-async def phapprnkmemberlist(regionno:int,db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
+async def phapprnkmemberlist(request: Request, regionno:int, cursor: Optional[str] = None, limit: Optional[int] = None, db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
+    paged = cursor is not None or limit is not None
+    after = decode_cursor(cursor, 4)
     try:
-        query = text("SELECT lm.memberNo, lm.memberName, lm.memberPhone, lr.rankTitlekor, lc.clubName, lm.maskYN FROM lionsMember lm left join lionsRank lr on lm.rankNo = lr.rankNo left join lionsClub lc on lm.clubNo = lc.clubNo where lm.rankNo != :rankno and lc.regionNo = :regionno order by lc.clubNo, lr.orderNo, lm.memberJoindate ")
-        result = await db.execute(query, {"rankno": 19, "regionno": regionno})
+        params = {"rankno": 19, "regionno": regionno, "nulldate": NULL_DATE, "nullorder": NULL_ORDER}
+        where = "lm.rankNo != :rankno and lc.regionNo = :regionno"
+        if after:
+            where += " and (lc.clubNo, COALESCE(lr.orderNo, :nullorder), COALESCE(lm.memberJoindate, :nulldate), lm.memberNo) > (:k0, :k1, :k2, :k3)"
+            params.update({"k0": after[0], "k1": after[1], "k2": after[2], "k3": after[3]})
+        size = clamp_limit(limit)
+        query = text("SELECT lm.memberNo, lm.memberName, lm.memberPhone, lr.rankTitlekor, lc.clubName, lm.maskYN, lc.clubNo, COALESCE(lr.orderNo, :nullorder) as orderKey, COALESCE(lm.memberJoindate, :nulldate) as joinKey FROM lionsMember lm left join lionsRank lr on lm.rankNo = lr.rankNo left join lionsClub lc on lm.clubNo = lc.clubNo "
+                     f"where {where} order by lc.clubNo, orderKey, joinKey, lm.memberNo" + (" limit :limit" if paged else ""))
+        if paged:
+            params["limit"] = size + 1
+        result = await db.execute(query, params)
         rows = result.fetchall()
+        next_cursor = None
+        if paged:
+            rows, next_cursor = keyset_page(rows, size, lambda row: (row[6], row[7], row[8], row[0]))
         result_data = [{"memberNo": row[0], "memberName": row[1], "memberPhone": "비공개" if row[5] in ("Y","T") else row[2], "rankTitle": row[3], "clubName": row[4]} for row in rows]
-        return {"members": result_data}
+        return list_response(request, {"members": result_data, "nextCursor": next_cursor})
     except Exception as e:
         print("error:", e)
-        return {"members": []}
+        return {"members": [], "nextCursor": None}
 
 
 @phapp_router.get("/searchmember/{keywd}")
-async def phappsearchmember(keywd: str, db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
+async def phappsearchmember(request: Request, keywd: str, db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
     try:
-        keywd = f"%{keywd}%"
-        query = text("SELECT lm.memberNo, lm.memberName, lm.memberPhone, lr.rankTitlekor, lc.clubName FROM lionsMember lm left join lionsRank lr on lm.rankNo = lr.rankNo left join lionsClub lc on lm.clubNo = lc.clubNo left join memberBusiness mb on lm.memberNo = mb.memberNo where lm.memberName like :keyword or lm.memberPhone like :keyword or lm.memberAddress like :keyword or lm.memberEmail like :keyword or lm.addMemo like :keyword or lm.officeAddress like :keyword or mb.bisTitle like :keyword or mb.bisType like :keyword or mb.bistypeTitle like :keyword or mb.bisMemo like :keyword order by lm.memberJoindate")
-        result = await db.execute(query, {"keyword": keywd})
-        rows = result.fetchall()
-        result_data = [{"memberNo": row[0], "memberName": row[1], "memberPhone": row[2], "rankTitle": row[3], "clubName": row[4]} for row in rows]
-        return {"members": result_data}
+        await member_index.ensure_loaded(db)
+        rows = member_index.search(keywd)
+        result_data = [{"memberNo": row["memberNo"], "memberName": row["memberName"], "memberPhone": row["memberPhone"], "rankTitle": row["rankTitlekor"], "clubName": row["clubName"]} for row in rows]
+        return list_response(request, {"members": result_data})
     except Exception as e:
         print("error:", e)
         return {"members": []}
 
 
 @phapp_router.get("/rsearchmember/{regionno}/{keywd}")
-async def phapprsearchmember(regionno:int, keywd: str, db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
+async def phapprsearchmember(request: Request, regionno:int, keywd: str, db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
     try:
-        keywd = f"%{keywd}%"
-        query = text("SELECT DISTINCT lm.memberNo, lm.memberName, lm.memberPhone, lr.rankTitlekor, lc.clubName, lm.maskYN FROM lionsMember lm left join lionsRank lr on lm.rankNo = lr.rankNo left join lionsClub lc on lm.clubNo = lc.clubNo left join memberBusiness mb on lm.memberNo = mb.memberNo where lc.regionNo = :regionno AND (lm.memberName like :keyword or lm.memberPhone like :keyword or lm.memberAddress like :keyword or lm.memberEmail like :keyword or lm.addMemo like :keyword or lm.officeAddress like :keyword or mb.bisTitle like :keyword or mb.bisType like :keyword or mb.bistypeTitle like :keyword or mb.bisMemo like :keyword) order by lm.memberJoindate")
-        result = await db.execute(query, {"keyword": keywd, "regionno":regionno})
-        rows = result.fetchall()
-        result_data = [{"memberNo": row[0], "memberName": row[1], "memberPhone": "비공개" if row[5] in ("Y","T") else row[2], "rankTitle": row[3], "clubName": row[4]} for row in rows]
-        return {"members": result_data}
+        await member_index.ensure_loaded(db)
+        rows = member_index.search(keywd, region_no=regionno)
+        result_data = [{"memberNo": row["memberNo"], "memberName": row["memberName"], "memberPhone": "비공개" if row["maskYN"] in ("Y","T") else row["memberPhone"], "rankTitle": row["rankTitlekor"], "clubName": row["clubName"]} for row in rows]
+        return list_response(request, {"members": result_data})
     except Exception as e:
         print("error:", e)
         return {"members": []}
 
 
 @phapp_router.get("/csearchmember/{clubno}/{keywd}")
-async def phappcsearchmember(clubno:int, keywd: str, db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
+async def phappcsearchmember(request: Request, clubno:int, keywd: str, db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
     try:
-        keywd = f"%{keywd}%"
-        query = text("SELECT DISTINCT lm.memberNo, lm.memberName, lm.memberPhone, lr.rankTitlekor, lc.clubName, lm.maskYN, lm.clubRank FROM lionsMember lm left join lionsRank lr on lm.rankNo = lr.rankNo left join lionsClub lc on lm.clubNo = lc.clubNo left join memberBusiness mb on lm.memberNo = mb.memberNo where lc.clubNo = :clubno AND (lm.memberName like :keyword or lm.memberPhone like :keyword or lm.memberAddress like :keyword or lm.memberEmail like :keyword or lm.addMemo like :keyword or lm.officeAddress like :keyword or mb.bisTitle like :keyword or mb.bisType like :keyword or mb.bistypeTitle like :keyword or mb.bisMemo like :keyword) order by lm.memberJoindate")
-        result = await db.execute(query, {"keyword": keywd, "clubno":clubno})
-        rows = result.fetchall()
-        result_data = [{"memberNo": row[0], "memberName": row[1], "memberPhone": "비공개" if row[5] in ("Y","T") else row[2], "rankTitle": row[3], "clubName": row[4], "clubRank":row[6]} for row in rows]
-        return {"members": result_data}
+        await member_index.ensure_loaded(db)
+        rows = member_index.search(keywd, club_no=clubno)
+        result_data = [{"memberNo": row["memberNo"], "memberName": row["memberName"], "memberPhone": "비공개" if row["maskYN"] in ("Y","T") else row["memberPhone"], "rankTitle": row["rankTitlekor"], "clubName": row["clubName"], "clubRank":row["clubRank"]} for row in rows]
+        return list_response(request, {"members": result_data})
     except Exception as e:
         print("error:", e)
         return {"members": []}
@@ -407,21 +527,18 @@ async def phappmemberdtl(memberno: int, db: AsyncSession = Depends(get_db),
         # DB 인덱스 에러 방지를 위해 딕셔너리로 매핑
         d = dict(row._mapping)
 
-        # 파일 존재 여부 확인 후 URL 생성 (도메인이 필요하다면 앞에 추가)
-        import os
-        mphoto_url = f"/static/img/members/mphoto_{memberno}.png" if os.path.exists(
-            f"./static/img/members/mphoto_{memberno}.png") else ""
-        ncard_url = f"/static/img/members/ncard_{memberno}.png" if os.path.exists(
-            f"./static/img/members/ncard_{memberno}.png") else ""
-        sphoto_url = f"/static/img/members/sphoto_{memberno}.png" if os.path.exists(
-            f"./static/img/members/sphoto_{memberno}.png") else ""
+        # 사진 목록에서 URL 생성 (파일시스템 조회 없음, 버전 쿼리 포함)
+        mphoto_url = photo_manifest.url("mphoto", memberno) or ""
+        mthumb_url = photo_manifest.variant_url("mphoto", memberno, 256) or ""
+        ncard_url = photo_manifest.url("ncard", memberno) or ""
+        sphoto_url = photo_manifest.url("sphoto", memberno) or ""
 
         mask = d.get("maskYN", "N")
 
         # 모바일 앱 호환성을 위해 키 이름(mPhotoBase64 등)은 그대로 유지하되, 값은 URL을 넣습니다.
         res = {
             "memberNo": d["memberNo"], "memberName": d["memberName"], "memberPhone": d["memberPhone"],
-            "mPhotoBase64": mphoto_url, "clubNo": d["clubNo"], "rankTitle": d["rankTitlekor"],
+            "mPhotoBase64": mphoto_url, "mPhotoThumb": mthumb_url, "clubNo": d["clubNo"], "rankTitle": d["rankTitlekor"],
             "memberMF": d["memberMF"], "memberAddress": d["memberAddress"], "memberEmail": d["memberEmail"],
             "memberJoindate": d["memberJoindate"], "addMemo": d["addMemo"], "memberBirth": d["memberBirth"],
             "clubName": d["clubName"], "nameCard": ncard_url, "officeAddress": d["officeAddress"],
@@ -433,25 +550,7 @@ async def phappmemberdtl(memberno: int, db: AsyncSession = Depends(get_db),
         }
 
         # 마스킹(비공개) 처리 로직
-        if mask == 'S':
-            res.update({"memberAddress": "비공개", "memberBirth": "비공개"})
-        elif mask == 'T':
-            res.update({
-                "memberAddress": "비공개", "memberEmail": "비공개", "memberJoindate": "비공개",
-                "memberBirth": "비공개", "spouseName": "비공개", "spousePhone": "비공개",
-                "spouseBirth": "비공개", "spousePhoto": ""
-            })
-        elif mask not in ('N', 'S', 'T'):  # 완전 비공개
-            res.update({
-                "memberPhone": "비공개", "memberAddress": "비공개", "memberEmail": "비공개",
-                "memberJoindate": "비공개", "addMemo": "비공개", "memberBirth": "비공개",
-                "nameCard": "", "officeAddress": "비공개", "spouseName": "비공개",
-                "spousePhone": "비공개", "spouseBirth": "비공개", "spousePhoto": "",
-                "bisTitle": "비공개", "bisRank": "비공개", "bisType": "비공개",
-                "bistypeTitle": "비공개", "offtel": "비공개", "offAddress": "비공개",
-                "offEmail": "비공개", "offPost": "비공개", "offWeb": "비공개",
-                "offSns": "비공개", "bisMemo": "비공개"
-            })
+        mask_member(res, mask)
 
         return {"memberdtl": [res]}
     except Exception as e:
@@ -520,21 +619,18 @@ async def phappmemberdtlext(memberno: int, db: AsyncSession = Depends(get_db),
         # DB 인덱스 에러 방지를 위해 딕셔너리로 매핑
         d = dict(row._mapping)
 
-        # 파일 존재 여부 확인 후 URL 생성 (도메인이 필요하다면 앞에 추가)
-        import os
-        mphoto_url = f"/static/img/members/mphoto_{memberno}.png" if os.path.exists(
-            f"./static/img/members/mphoto_{memberno}.png") else ""
-        ncard_url = f"/static/img/members/ncard_{memberno}.png" if os.path.exists(
-            f"./static/img/members/ncard_{memberno}.png") else ""
-        sphoto_url = f"/static/img/members/sphoto_{memberno}.png" if os.path.exists(
-            f"./static/img/members/sphoto_{memberno}.png") else ""
+        # 사진 목록에서 URL 생성 (파일시스템 조회 없음, 버전 쿼리 포함)
+        mphoto_url = photo_manifest.url("mphoto", memberno) or ""
+        mthumb_url = photo_manifest.variant_url("mphoto", memberno, 256) or ""
+        ncard_url = photo_manifest.url("ncard", memberno) or ""
+        sphoto_url = photo_manifest.url("sphoto", memberno) or ""
 
         mask = d.get("maskYN", "N")
 
         # 모바일 앱 호환성을 위해 키 이름(mPhotoBase64 등)은 그대로 유지하되, 값은 URL을 넣습니다.
         res = {
             "memberNo": d["memberNo"], "memberName": d["memberName"], "memberPhone": d["memberPhone"],
-            "mPhotoBase64": mphoto_url, "clubNo": d["clubNo"], "rankTitle": d["rankTitlekor"],
+            "mPhotoBase64": mphoto_url, "mPhotoThumb": mthumb_url, "clubNo": d["clubNo"], "rankTitle": d["rankTitlekor"],
             "memberMF": d["memberMF"], "memberAddress": d["memberAddress"], "memberEmail": d["memberEmail"],
             "memberJoindate": d["memberJoindate"], "addMemo": d["addMemo"], "memberBirth": d["memberBirth"],
             "clubName": d["clubName"], "nameCard": ncard_url, "officeAddress": d["officeAddress"],
@@ -546,25 +642,7 @@ async def phappmemberdtlext(memberno: int, db: AsyncSession = Depends(get_db),
         }
 
         # 마스킹(비공개) 처리 로직
-        if mask == 'S':
-            res.update({"memberAddress": "비공개", "memberBirth": "비공개"})
-        elif mask == 'T':
-            res.update({
-                "memberAddress": "비공개", "memberEmail": "비공개", "memberJoindate": "비공개",
-                "memberBirth": "비공개", "spouseName": "비공개", "spousePhone": "비공개",
-                "spouseBirth": "비공개", "spousePhoto": ""
-            })
-        elif mask not in ('N', 'S', 'T'):  # 완전 비공개
-            res.update({
-                "memberPhone": "비공개", "memberAddress": "비공개", "memberEmail": "비공개",
-                "memberJoindate": "비공개", "addMemo": "비공개", "memberBirth": "비공개",
-                "nameCard": "", "officeAddress": "비공개", "spouseName": "비공개",
-                "spousePhone": "비공개", "spouseBirth": "비공개", "spousePhoto": "",
-                "bisTitle": "비공개", "bisRank": "비공개", "bisType": "비공개",
-                "bistypeTitle": "비공개", "offtel": "비공개", "offAddress": "비공개",
-                "offEmail": "비공개", "offPost": "비공개", "offWeb": "비공개",
-                "offSns": "비공개", "bisMemo": "비공개"
-            })
+        mask_member(res, mask)
 
         return {"memberdtl": [res]}
     except Exception as e:
@@ -619,7 +697,10 @@ async def phappmaskyn(memberno:int, msk:str, db: AsyncSession = Depends(get_db),
     try:
         query = text("UPDATE lionsMember set maskYN = :msk where memberNo = :memberNo")
         await db.execute(query, {"memberNo": memberno , "msk": msk})
+        await table_versions.bump(db, "lionsMember")
+        await sync_log.record(db, "member", memberno)
         await db.commit()
+        await member_index.refresh_member(db, memberno)
         return {"status": "success"}
     except Exception as e:
         print("maskYN error:", e)
@@ -631,6 +712,8 @@ async def phappupdatefuncno(memberno:int, funcno:int, db: AsyncSession = Depends
     try:
         query = text("UPDATE lionsMember set funcNo = :func where memberNo = :memberNo")
         await db.execute(query, {"memberNo": memberno , "func": funcno})
+        await table_versions.bump(db, "lionsMember")
+        await sync_log.record(db, "member", memberno)
         await db.commit()
         return {"status": "success"}
     except Exception as e:
@@ -641,12 +724,8 @@ async def phappupdatefuncno(memberno:int, funcno:int, db: AsyncSession = Depends
 @phapp_router.post("/noticeRead/{memberno}/{noticeno}/{noticetype}")
 async def phappreadnot(memberno: int, noticeno: int, noticetype: str, db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
     try:
-        check_query = text("SELECT 1 FROM noticeAndswer WHERE memberNo = :memberNo AND noticeNo = :notno AND noticeType = :nottype LIMIT 1")
-        result = await db.execute(check_query, {"memberNo": memberno, "notno": noticeno, "nottype": noticetype})
-        exists = result.scalar() is not None
-        if not exists:
-            insert_query = text("INSERT INTO noticeAndswer (memberNo, noticeNo, noticeType, readYN) VALUES (:memberNo, :notno, :nottype, 'Y')")
-            await db.execute(insert_query, {"memberNo": memberno, "notno": noticeno, "nottype": noticetype})
+        # INSERT IGNORE 한 번으로 처리 (이미 읽은 공지면 0건)
+        if await notice_counters.mark_read(db, memberno, noticetype, noticeno):
             await db.commit()
             return {"status": "success"}
         else:
@@ -691,15 +770,19 @@ async def phappgetfuncno(memberno: int, db: AsyncSession = Depends(get_db),
         print("getfuncno error:", e)
 
 
+async def fetch_my_circles(db, memberno: int):
+    query = text(
+        "select cm.circleNo, lc.circleName  from circleMember cm left join lionsCircle lc on cm.circleNo = lc.circleNo where cm.memberNo = :memberno ")
+    result = await db.execute(query, {"memberno": memberno})
+    rows = result.fetchall()
+    return [dict(row._mapping) for row in rows]
+
+
 @phapp_router.get("/getmycircle/{memberno}")
 async def phappgetmycircle(memberno: int, db: AsyncSession = Depends(get_db),
                            current_user: str = Depends(get_current_mobile_user)):
     try:
-        query = text(
-            "select cm.circleNo, lc.circleName  from circleMember cm left join lionsCircle lc on cm.circleNo = lc.circleNo where cm.memberNo = :memberno ")
-        result = await db.execute(query, {"memberno": memberno})
-        rows = result.fetchall()
-        circles = [dict(row._mapping) for row in rows]
+        circles = await fetch_my_circles(db, memberno)
         return {"circles": circles}
     except Exception as e:
         print("getmycircle error:", e)
@@ -750,6 +833,7 @@ async def insert_circle_event(
             "eventPlace": req.eventPlace,
             "eventMemo": req.eventMemo
         })
+        await sync_log.record_last_insert(db, "circleevent")
         await db.commit()
         return {"status": "success", "message": "행사가 성공적으로 등록되었습니다."}
 
@@ -837,49 +921,15 @@ async def update_event_attendance(
         db: AsyncSession = Depends(get_db),
         current_user: str = Depends(get_current_mobile_user)
 ):
+    await attendance_keys.require(db, "circleEventMember")
     try:
-        check_query = text("""
-                           SELECT joinNo
-                           FROM circleEventMember
-                           WHERE eventNo = :eventNo
-                             AND memberNo = :memberNo
-                           """)
-        result = await db.execute(check_query, {"eventNo": req.eventNo, "memberNo": req.memberNo})
-        exists = result.scalar()
-
-        if exists:
-            update_query = text("""
-                                UPDATE circleEventMember
-                                SET responseType      = :responseType,
-                                    delayTime         = :delayTime,
-                                    joinMemo          = :joinMemo,
-                                    responseTimestamp = NOW(),
-                                    modDate           = NOW()
-                                WHERE eventNo = :eventNo
-                                  AND memberNo = :memberNo
-                                """)
-            await db.execute(update_query, {
-                "responseType": req.responseType,
-                "delayTime": req.delayTime,
-                "joinMemo": req.joinMemo,
-                "eventNo": req.eventNo,
-                "memberNo": req.memberNo
-            })
-        else:
-            insert_query = text("""
-                                INSERT INTO circleEventMember (eventNo, memberNo, responseType, delayTime, joinMemo,
-                                                               responseTimestamp, regDate, attrib)
-                                VALUES (:eventNo, :memberNo, :responseType, :delayTime, :joinMemo, NOW(), NOW(),
-                                        '1000010000')
-                                """)
-            await db.execute(insert_query, {
-                "eventNo": req.eventNo,
-                "memberNo": req.memberNo,
-                "responseType": req.responseType,
-                "delayTime": req.delayTime,
-                "joinMemo": req.joinMemo
-            })
-
+        await db.execute(CIRCLE_ATTEND_UPSERT, {
+            "eventNo": req.eventNo,
+            "memberNo": req.memberNo,
+            "responseType": req.responseType,
+            "delayTime": req.delayTime,
+            "joinMemo": req.joinMemo
+        })
         await db.commit()
         return {"status": "success", "message": "참석 정보가 저장되었습니다."}
 
@@ -889,6 +939,36 @@ async def update_event_attendance(
         raise HTTPException(status_code=500, detail="참석 정보 저장 중 오류 발생")
 
 
+# =========================================================
+# [써클 행사] 참석 정보 일괄 등록 API (총무가 행사 전체 참석을 한 번에 기록)
+# =========================================================
+@phapp_router.post("/circle/event/attend/bulk")
+async def save_circle_event_attendance_bulk(
+        payload: BulkAttendanceModel,
+        db: AsyncSession = Depends(get_db),
+        current_user: str = Depends(get_current_mobile_user)
+):
+    await require_event_staff(db, CIRCLE_EVENT_STAFF, payload.eventNo, current_user)
+    if not payload.attendances:
+        return {"status": "success", "count": 0}
+    await attendance_keys.require(db, "circleEventMember")
+    try:
+        # 하나의 트랜잭션에서 executemany 로 전체 반영 (실패 시 전체 롤백)
+        await db.execute(CIRCLE_ATTEND_UPSERT, [{
+            "eventNo": payload.eventNo,
+            "memberNo": item.memberNo,
+            "responseType": item.responseType,
+            "delayTime": item.delayTime,
+            "joinMemo": item.joinMemo
+        } for item in payload.attendances])
+        await db.commit()
+        return {"status": "success", "count": len(payload.attendances)}
+    except Exception as e:
+        await db.rollback()
+        print("save_circle_event_attendance_bulk error:", e)
+        raise HTTPException(status_code=500, detail="참석 정보 일괄 저장 중 오류 발생")
+
+
 # =========================================================
 # 3. 본인의 개별 참석 정보 조회 API (GET /phapp/circle/event/my-attend)
 # =========================================================
@@ -941,28 +1021,31 @@ async def get_circle_event_attendees(
     current_user: str = Depends(get_current_mobile_user)
 ):
     try:
-        # circleEventMember 테이블을 기준으로 가입한 사람들의 명단을 매핑하여 조회
+        # 회원명은 LEFT JOIN 대신 회원명 조회기(IN 조회 + LRU 캐시)로 채움
         query = text("""
-            SELECT cem.memberNo,
-                   COALESCE(m.memberName, '이름없음') as memberName,
-                   cem.responseType,
-                   cem.delayTime,
-                   cem.joinMemo
-            FROM circleEventMember cem
-                     LEFT JOIN lionsMember m ON cem.memberNo = m.memberNo
-            WHERE cem.eventNo = :eventNo
-              AND cem.attrib = '1000010000'
-            ORDER BY m.memberName ASC, cem.regDate DESC
-        """)
+                     SELECT cem.memberNo,
+                            cem.responseType,
+                            cem.delayTime,
+                            cem.joinMemo,
+                            cem.regDate
+                     FROM circleEventMember cem
+                     WHERE cem.eventNo = :eventNo
+                       AND cem.attrib = '1000010000'
+                     """)
 
         result = await db.execute(query, {"eventNo": eventNo})
         rows = result.mappings().all()
+        names = await member_names.resolve(db, [row["memberNo"] for row in rows])
+
+        # 기존 정렬(회원명 오름차순, 등록일 내림차순) 유지
+        rows = sorted(rows, key=lambda row: row["regDate"] or datetime.datetime.min, reverse=True)
+        rows = sorted(rows, key=lambda row: member_names.name_of(names, row["memberNo"]) or "")
 
         attendees_list = []
         for row in rows:
             attendees_list.append({
                 "memberNo": row["memberNo"],
-                "memberName": row["memberName"],
+                "memberName": member_names.name_of(names, row["memberNo"], "이름없음"),
                 "status": row["responseType"] if row["responseType"] is not None else "NONE",
                 "delayTime": row["delayTime"] or 0,
                 "joinMemo": row["joinMemo"] or ""
@@ -1073,6 +1156,7 @@ async def insert_club_event(
             "eventPlace": payload.eventPlace,
             "eventMemo": payload.eventMemo
         })
+        await sync_log.record_last_insert(db, "clubevent")
         await db.commit()
         return {"status": "success", "message": "클럽 행사가 성공적으로 등록되었습니다."}
     except Exception as e:
@@ -1133,52 +1217,15 @@ async def save_club_event_attendance(
         db: AsyncSession = Depends(get_db),
         current_user: str = Depends(get_current_mobile_user)
 ):
+    await attendance_keys.require(db, "clubEventMember")
     try:
-        # 기존 등록 여부 확인
-        check_query = text("""
-                           SELECT joinNo
-                           FROM clubEventMember
-                           WHERE eventNo = :eventNo
-                             AND memberNo = :memberNo
-                           """)
-        result = await db.execute(check_query, {"eventNo": payload.eventNo, "memberNo": payload.memberNo})
-        row = result.fetchone()
-
-        if row:
-            # 존재하면 UPDATE
-            update_query = text("""
-                                UPDATE clubEventMember
-                                SET responseType      = :responseType,
-                                    delayTime         = :delayTime,
-                                    joinMemo          = :joinMemo,
-                                    responseTimestamp = NOW(),
-                                    modDate           = NOW()
-                                WHERE eventNo = :eventNo
-                                  AND memberNo = :memberNo
-                                """)
-            await db.execute(update_query, {
-                "responseType": payload.responseType,
-                "delayTime": payload.delayTime,
-                "joinMemo": payload.joinMemo,
-                "eventNo": payload.eventNo,
-                "memberNo": payload.memberNo
-            })
-        else:
-            # 존재하지 않으면 INSERT
-            insert_query = text("""
-                                INSERT INTO clubEventMember (eventNo, memberNo, responseType, delayTime, joinMemo,
-                                                             responseTimestamp, regDate, attrib)
-                                VALUES (:eventNo, :memberNo, :responseType, :delayTime, :joinMemo, NOW(), NOW(),
-                                        '1000010000')
-                                """)
-            await db.execute(insert_query, {
-                "eventNo": payload.eventNo,
-                "memberNo": payload.memberNo,
-                "responseType": payload.responseType,
-                "delayTime": payload.delayTime,
-                "joinMemo": payload.joinMemo
-            })
-
+        await db.execute(CLUB_ATTEND_UPSERT, {
+            "eventNo": payload.eventNo,
+            "memberNo": payload.memberNo,
+            "responseType": payload.responseType,
+            "delayTime": payload.delayTime,
+            "joinMemo": payload.joinMemo
+        })
         await db.commit()
         return {"status": "success", "message": "참석 정보가 성공적으로 반영되었습니다."}
     except Exception as e:
@@ -1187,6 +1234,36 @@ async def save_club_event_attendance(
         raise HTTPException(status_code=500, detail="참석 정보 저장 중 오류 발생")
 
 
+# =========================================================
+# [클럽 행사] 참석 정보 일괄 등록 API (총무가 행사 전체 참석을 한 번에 기록)
+# =========================================================
+@phapp_router.post("/club/event/attend/bulk")
+async def save_club_event_attendance_bulk(
+        payload: BulkAttendanceModel,
+        db: AsyncSession = Depends(get_db),
+        current_user: str = Depends(get_current_mobile_user)
+):
+    await require_event_staff(db, CLUB_EVENT_STAFF, payload.eventNo, current_user)
+    if not payload.attendances:
+        return {"status": "success", "count": 0}
+    await attendance_keys.require(db, "clubEventMember")
+    try:
+        # 하나의 트랜잭션에서 executemany 로 전체 반영 (실패 시 전체 롤백)
+        await db.execute(CLUB_ATTEND_UPSERT, [{
+            "eventNo": payload.eventNo,
+            "memberNo": item.memberNo,
+            "responseType": item.responseType,
+            "delayTime": item.delayTime,
+            "joinMemo": item.joinMemo
+        } for item in payload.attendances])
+        await db.commit()
+        return {"status": "success", "count": len(payload.attendances)}
+    except Exception as e:
+        await db.rollback()
+        print("save_club_event_attendance_bulk error:", e)
+        raise HTTPException(status_code=500, detail="참석 정보 일괄 저장 중 오류 발생")
+
+
 # =========================================================
 # [클럽 행사] 5. 행사별 전체 참석자 명단 조회 API
 # =========================================================
@@ -1197,28 +1274,31 @@ async def get_club_event_attendees(
         current_user: str = Depends(get_current_mobile_user)
 ):
     try:
-        # clubEventMember 테이블을 기준으로 가입한 사람들의 명단을 확실하게 매핑하여 조회
+        # 회원명은 LEFT JOIN 대신 회원명 조회기(IN 조회 + LRU 캐시)로 채움
         query = text("""
                      SELECT cem.memberNo,
-                            COALESCE(m.memberName, '이름없음') as memberName,
                             cem.responseType,
                             cem.delayTime,
-                            cem.joinMemo
+                            cem.joinMemo,
+                            cem.regDate
                      FROM clubEventMember cem
-                              LEFT JOIN lionsMember m ON cem.memberNo = m.memberNo
                      WHERE cem.eventNo = :eventNo
                        AND cem.attrib = '1000010000'
-                     ORDER BY m.memberName ASC, cem.regDate DESC
                      """)
 
         result = await db.execute(query, {"eventNo": eventNo})
         rows = result.mappings().all()
+        names = await member_names.resolve(db, [row["memberNo"] for row in rows])
+
+        # 기존 정렬(회원명 오름차순, 등록일 내림차순) 유지
+        rows = sorted(rows, key=lambda row: row["regDate"] or datetime.datetime.min, reverse=True)
+        rows = sorted(rows, key=lambda row: member_names.name_of(names, row["memberNo"]) or "")
 
         attendees_list = []
         for row in rows:
             attendees_list.append({
                 "memberNo": row["memberNo"],
-                "memberName": row["memberName"],
+                "memberName": member_names.name_of(names, row["memberNo"], "이름없음"),
                 "status": row["responseType"] if row["responseType"] is not None else "NONE",
                 "delayTime": row["delayTime"] or 0,
                 "joinMemo": row["joinMemo"] or ""
@@ -1258,6 +1338,7 @@ async def delete_circle_event(
             WHERE eventNo = :eventNo
         """)
         await db.execute(delete_query, {"eventNo": eventNo})
+        await sync_log.record(db, "circleevent", eventNo)
         await db.commit()
 
         return {"status": "success", "message": "써클 행사가 성공적으로 삭제(제외)되었습니다."}
@@ -1297,6 +1378,7 @@ async def delete_club_event(
             WHERE eventNo = :eventNo
         """)
         await db.execute(delete_query, {"eventNo": eventNo})
+        await sync_log.record(db, "clubevent", eventNo)
         await db.commit()
         return {"status": "success", "message": "클럽 행사가 성공적으로 삭제(제외)되었습니다."}
 
@@ -1306,3 +1388,149 @@ async def delete_club_event(
         await db.rollback()
         print("delete_club_event error:", e)
         raise HTTPException(status_code=500, detail="클럽 행사 삭제 처리 중 오류 발생")
+
+
+# =========================================================
+# [동기화] 오프라인 주소록 증분 동기화 API
+# =========================================================
+@phapp_router.get("/sync")
+async def phapp_sync(
+    request: Request,
+    since: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_mobile_user)
+):
+    try:
+        # 요청한 회원이 볼 수 있는 지역/클럽/소속 써클 범위만 전달
+        scope = await sync_log.load_scope(db, int(current_user))
+        if not since:
+            # 토큰이 없으면 전체 스냅샷 (토큰을 먼저 읽어 두어 조회 중 변경분은 다음 동기화에 포함)
+            token_no = await sync_log.settled_max(db)
+            has_more = False
+            members = await sync_log.load_members(db, scope)
+            business = await sync_log.load_business(db, scope)
+            entities = {etype: await sync_log.load_entities(db, etype, scope) for etype in ENTITY_TABLES}
+        else:
+            since_no = sync_log.decode_token(since)
+            changed, token_no, has_more = await sync_log.changes_since(db, since_no)
+            members = await sync_log.load_members(db, scope, sorted(changed["member"])) if "member" in changed else []
+            # 회원의 공개 설정이 바뀌면 사업장 정보도 다시 전달 (완전 비공개로 바뀌면 삭제로 전달)
+            business_nos = changed.get("business", set()) | changed.get("member", set())
+            business = await sync_log.load_business(db, scope, sorted(business_nos)) if business_nos else []
+            entities = {etype: await sync_log.load_entities(db, etype, scope, sorted(changed[etype])) if etype in changed else []
+                        for etype in ENTITY_TABLES}
+
+        return list_response(request, {
+            "full": not since,
+            "token": sync_log.encode_token(token_no),
+            "hasMore": has_more,
+            "members": members,
+            "business": business,
+            "notices": {"region": entities["notice"], "club": entities["clubnotice"], "circle": entities["circlenotice"]},
+            "events": {"club": entities["clubevent"], "circle": entities["circleevent"]},
+        })
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        print("phapp_sync error:", e)
+        raise HTTPException(status_code=500, detail="동기화 처리 중 오류 발생")
+
+
+# =========================================================
+# [홈 화면] 로그인 직후 필요한 목록을 한 번에 조회하는 API
+# =========================================================
+BOOTSTRAP_SECTIONS = ("clubs", "members", "notices", "clubnotices", "circlenotices", "circles")
+
+
+def _bootstrap_section(name, fetch):
+    # 한 구역이 실패해도 나머지는 응답 (개별 API 와 같이 빈 값으로 대체)
+    async def run(db):
+        try:
+            return await fetch(db)
+        except Exception as e:
+            print(f"bootstrap {name} error:", e)
+            return None
+    return run
+
+
+@phapp_router.get("/bootstrap")
+async def phapp_bootstrap(
+    request: Request,
+    sections: Optional[str] = None,
+    current_user: str = Depends(get_current_mobile_user)
+):
+    wanted = [x.strip() for x in sections.split(",") if x.strip()] if sections else list(BOOTSTRAP_SECTIONS)
+    unknown = [x for x in wanted if x not in BOOTSTRAP_SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 항목입니다: {', '.join(unknown)}")
+
+    # 조회마다 별도 세션을 쓰되, get_db 와 같은 규칙으로 읽기 복제본/기본 DB 선택
+    factory = session_factory_for(request.method, request.url.path, request.headers.get("authorization"))
+    memberno = int(current_user)
+    async with factory() as db:
+        query = text("SELECT lm.clubNo, lc.regionNo, lc.clubName, lm.funcNo from lionsMember lm left join lionsClub lc on lc.clubNo = lm.clubNo where lm.memberNo = :memberno")
+        me = (await db.execute(query, {"memberno": memberno})).fetchone()
+    if me is None:
+        raise HTTPException(status_code=404, detail="회원 정보를 찾을 수 없습니다.")
+    clubno, regionno = me[0], me[1]
+
+    fetchers = {
+        "clubs": lambda db: fetch_clubs(db, regionno),
+        "members": lambda db: fetch_club_members(db, clubno),
+        "notices": lambda db: fetch_region_notices(db, regionno, memberno),
+        "clubnotices": lambda db: fetch_club_notices(db, clubno, memberno),
+        "circlenotices": lambda db: fetch_circle_notices(db, memberno),
+        "circles": lambda db: fetch_my_circles(db, memberno),
+    }
+    loaded = await PageLoader(factory).load(**{name: _bootstrap_section(name, fetchers[name]) for name in wanted})
+
+    empty = {"circlenotices": {"docs": [], "circlenames": []}}
+    result = {"memberno": memberno, "clubno": clubno, "regionno": regionno, "clubname": me[2], "funcno": me[3]}
+    for name in wanted:
+        result[name] = loaded[name] if loaded[name] is not None else empty.get(name, [])
+    return list_response(request, result)
+
+
+# =========================================================
+# [인증] 로그아웃 (현재 기기의 토큰 사용 중지)
+# =========================================================
+@phapp_router.post("/logout")
+async def phapp_logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+    current_user: str = Depends(get_current_mobile_user)
+):
+    try:
+        payload = decode_mobile_token(credentials.credentials)
+        await token_guard.revoke_token(db, credentials.credentials, current_user, payload.get("exp"))
+        return {"status": "success"}
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        await db.rollback()
+        print("phapp_logout error:", e)
+        raise HTTPException(status_code=500, detail="로그아웃 처리 중 오류 발생")
+
+
+# =========================================================
+# [배지] 안 읽은 공지 수 (지역/클럽/써클)
+# =========================================================
+@phapp_router.get("/unread")
+async def phapp_unread(db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_mobile_user)):
+    try:
+        memberno = int(current_user)
+        query = text("SELECT lm.clubNo, lc.regionNo from lionsMember lm left join lionsClub lc on lc.clubNo = lm.clubNo where lm.memberNo = :memberno")
+        me = (await db.execute(query, {"memberno": memberno})).fetchone()
+        if me is None:
+            raise HTTPException(status_code=404, detail="회원 정보를 찾을 수 없습니다.")
+        rows = await notice_counters.unread(db, memberno, me[0], me[1])
+        region = sum(row.unread for row in rows if row.scopeType == "REGION")
+        club = sum(row.unread for row in rows if row.scopeType == "CLUB")
+        circles = {str(row.scopeNo): row.unread for row in rows if row.scopeType == "CIRCLE"}
+        return {"region": region, "club": club, "circles": circles,
+                "total": region + club + sum(circles.values())}
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        print("phapp_unread error:", e)
+        raise HTTPException(status_code=500, detail="안 읽은 공지 수 조회 중 오류 발생")
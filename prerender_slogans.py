@@ -0,0 +1,29 @@
+# 전체 클럽/써클 슬로건 카드 미리 그리기 (배포/폰트 변경 후 실행)
+# 사용법: python prerender_slogans.py [동시 처리 수]
+import asyncio
+import sys
+from common.dbconn import async_session, engine
+from common.imageworker import image_worker
+from common.photomanifest import photo_manifest, PHOTO_DIR
+from funchub import prerender_all_slogans
+
+
+async def main(concurrency):
+    if concurrency:
+        # 웹 서버와 따로 실행하므로 작업 프로세스 수를 동시 처리 수에 맞춤
+        image_worker.workers = concurrency
+    # 웹 서버와 달리 기동 시 적재가 없으므로 먼저 사진 목록을 채움
+    # (비어 있으면 임원 사진 없이 그려 기존 카드를 덮어쓰고, 캐시 키도 서버 계산과 달라짐)
+    if not photo_manifest.scan():
+        print(f"회원 사진을 찾지 못했습니다({PHOTO_DIR}). 프로젝트 폴더에서 실행하세요.")
+        await engine.dispose()
+        return
+    try:
+        await prerender_all_slogans(async_session, concurrency)
+    finally:
+        image_worker.shutdown()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else None))
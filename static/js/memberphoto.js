@@ -0,0 +1,34 @@
+// 회원 카드 사진 (memberCards / mymemberCards 공통)
+// - 클럽 사진 스프라이트가 있으면 한 장의 이미지에서 회원별 칸을 잘라 표시
+// - 없으면 회원별 사진(srcset), 실패 시 jpg -> 기본 이미지 순으로 대체
+const CARD_PHOTO_SIZE = 80;
+
+function handleImageFallback(imgElement, imageFileName) {
+    imgElement.removeAttribute('srcset');
+    if (!imgElement.dataset.triedJpg) {
+        imgElement.dataset.triedJpg = 'true';
+        imgElement.src = `/static/img/members/${imageFileName}.jpg`;
+    } else {
+        imgElement.onerror = null;
+        imgElement.src = '/static/img/members/default.png';
+    }
+}
+
+function photoHtml(member, fileName, sprite) {
+    const imgStyle = `width: ${CARD_PHOTO_SIZE}px; height: ${CARD_PHOTO_SIZE}px; object-fit: cover; border-radius: 10px;`;
+    if (sprite) {
+        const slot = sprite.members[member.memberNo];
+        if (slot === undefined) {
+            // 사진이 없는 회원은 바로 기본 이미지
+            return `<img src="/static/img/members/default.png" alt="Member Image" style="${imgStyle}">`;
+        }
+        const x = (slot % sprite.columns) * CARD_PHOTO_SIZE;
+        const y = Math.floor(slot / sprite.columns) * CARD_PHOTO_SIZE;
+        return `<div role="img" aria-label="Member Image"
+                     style="${imgStyle} background: url('${sprite.url}') -${x}px -${y}px / ${sprite.columns * CARD_PHOTO_SIZE}px auto no-repeat;"></div>`;
+    }
+    return `<img src="${member.photoUrl}" srcset="${member.photoSrcset}" sizes="80px" loading="lazy"
+                 onerror="handleImageFallback(this, '${fileName}')"
+                 alt="Member Image"
+                 style="${imgStyle}">`;
+}